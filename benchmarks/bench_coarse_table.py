@@ -0,0 +1,51 @@
+"""
+Per-point timings of scalar hashing with and without the coarse table
+
+The table replaces the first levels of every hash with a lookup, so the
+saving per point is roughly constant and matters most at coarse precisions.
+
+Run with ``python benchmarks/bench_coarse_table.py``
+"""
+import random
+import timeit
+
+import geogrids
+
+
+PRECISIONS = (9, 15, 25, 35, 45, 55)
+TABLE_LEVELS = (4, 6, 7)
+POINTS = 10000
+
+
+def per_point(points, precision, repeat=5):
+    """
+    Best time per point in microseconds over a number of repeats
+    """
+    func = geogrids.gdgg.latitude_longitude_to_numeric_hash
+    timer = timeit.Timer(
+        lambda: [func(latitude, longitude, precision) for latitude, longitude in points])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(points) * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    points = [
+        (rng.uniform(-90, 90), rng.uniform(-180, 180)) for i in range(POINTS)
+    ]
+
+    geogrids.gdgg.disable_coarse_table()
+    baseline = {precision: per_point(points, precision) for precision in PRECISIONS}
+
+    print(f'{"levels":<8}{"table MB":>9}{"precision":>10}{"loop (us)":>11}{"table (us)":>12}{"speedup":>10}')
+    for levels in TABLE_LEVELS:
+        table = geogrids.gdgg.enable_coarse_table(levels)
+        for precision in PRECISIONS:
+            before = baseline[precision]
+            after = per_point(points, precision)
+            print(f'{levels:<8}{table.nbytes / 2 ** 20:>9.1f}{precision:>10}'
+                  f'{before:>11.2f}{after:>12.2f}{before / after:>9.1f}x')
+    geogrids.gdgg.disable_coarse_table()
+
+
+if __name__ == '__main__':
+    main()
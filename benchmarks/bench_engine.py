@@ -0,0 +1,156 @@
+"""
+Per-point timings of the integer hashing engine
+
+Compares the utility functions, which build the numeric hash directly in an
+integer, against a frozen copy of the original ``Location`` code, which
+stepped through ``compute_level`` one level at a time and rebuilt the hash
+from a list of levels. ``Location`` itself now runs on the same engine, so it
+can't be the baseline.
+
+Run with ``python benchmarks/bench_engine.py``
+"""
+import random
+import timeit
+
+import geogrids
+
+
+PRECISIONS = (25, 55)
+POINTS = 10000
+
+
+class OriginalLocation:
+    """
+    Frozen copy of the original ``Location`` stepping code, which kept its
+    levels in a list and hashed them afterwards, to time the engine against
+    """
+
+    def __init__(self, latitude, longitude):
+        self.levels = []
+        self._latitude = latitude
+        self._longitude = longitude
+        self._octant = None
+        self._x = None
+        self._y = None
+
+    @property
+    def x(self):
+        if self._x is None:
+            self._compute_octant()
+        return self._x
+
+    @property
+    def y(self):
+        if self._y is None:
+            self._compute_octant()
+        return self._y
+
+    @property
+    def octant(self):
+        if self._octant is None:
+            self._compute_octant()
+        return self._octant
+
+    def _compute_octant(self):
+        if self._latitude > 0:
+            if self._longitude < -90:
+                self._octant = 0
+            elif self._longitude < 0:
+                self._octant = 1
+            elif self._longitude < 90:
+                self._octant = 2
+            else:
+                self._octant = 3
+        else:
+            if self._longitude < -90:
+                self._octant = 4
+            elif self._longitude < 0:
+                self._octant = 5
+            elif self._longitude < 90:
+                self._octant = 6
+            else:
+                self._octant = 7
+
+        self._x = ((self._longitude + 180) % 90) / 90
+        self._y = abs(self._latitude) / 90
+        self._x *= (1 - self.y)
+        self.levels = []
+
+    def compute_level(self):
+        if self.y > 0.5:
+            self.levels.append(1)
+            self._x *= 2
+            self._y = (self._y - 0.5) * 2
+        elif self.y < 0.5 - self.x:
+            self.levels.append(2)
+            self._x *= 2
+            self._y *= 2
+        elif self.x >= 0.5:
+            self.levels.append(3)
+            self._x = (self._x - 0.5) * 2
+            self._y *= 2
+        else:
+            self.levels.append(0)
+            self._x = 1 - self._x * 2
+            self._y = 1 - self._y * 2
+
+    def location_to_readable_hash(self):
+        return str(self.octant) + ''.join([str(i) for i in self.levels])
+
+    def location_to_numeric_hash(self):
+        acc = self.octant
+        mult = 8
+        for level in self.levels:
+            acc += mult * level
+            mult *= 4
+        return acc
+
+
+def location_numeric_hash(latitude, longitude, precision):
+    location = OriginalLocation(latitude, longitude)
+    for current_precision in range(3, precision, 2):
+        location.compute_level()
+    return location.location_to_numeric_hash()
+
+
+def location_readable_hash(latitude, longitude, precision):
+    location = OriginalLocation(latitude, longitude)
+    for current_precision in range(3, precision, 2):
+        location.compute_level()
+    return location.location_to_readable_hash()
+
+
+def per_point(func, points, precision, repeat=5):
+    """
+    Best time per point in microseconds over a number of repeats
+    """
+    timer = timeit.Timer(
+        lambda: [func(latitude, longitude, precision) for latitude, longitude in points])
+    return min(timer.repeat(repeat=repeat, number=1)) / len(points) * 1e6
+
+
+def main():
+    rng = random.Random(0)
+    points = [
+        (rng.uniform(-90, 90), rng.uniform(-180, 180)) for i in range(POINTS)
+    ]
+
+    cases = [
+        ('numeric', location_numeric_hash,
+         geogrids.gdgg.latitude_longitude_to_numeric_hash),
+        ('readable', location_readable_hash,
+         geogrids.gdgg.latitude_longitude_to_readable_hash),
+    ]
+
+    print(f'{"hash":<10}{"precision":>10}{"original (us)":>16}{"engine (us)":>14}{"speedup":>10}')
+    for name, baseline, engine in cases:
+        for precision in PRECISIONS:
+            assert [baseline(*point, precision) for point in points[:100]] == \
+                [engine(*point, precision) for point in points[:100]]
+            before = per_point(baseline, points, precision)
+            after = per_point(engine, points, precision)
+            print(f'{name:<10}{precision:>10}{before:>16.2f}{after:>14.2f}{before / after:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
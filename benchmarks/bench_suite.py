@@ -0,0 +1,184 @@
+"""
+Throughput, latency and memory of every public hashing entry point
+
+Times the scalar utility functions at every precision in ``HASH_PRECISIONS``,
+and ``Encoder.hash_to_string`` / ``Encoder.string_to_hash`` for each bundled
+wordlist at every precision. For each case it records:
+
+* calls per second, the best of several runs over all the points
+* percentiles of the time of single calls, in nanoseconds (these include the
+  overhead of reading the clock around each call, about 50-100ns)
+* the peak memory allocated while making all the calls, from ``tracemalloc``
+
+Results are written as JSON so runs on different releases can be compared::
+
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --output after.json --compare before.json
+
+Run with ``python benchmarks/bench_suite.py --help`` for the options.
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import geogrids
+from geogrids.gdgg import HASH_PRECISIONS
+
+
+WORDLISTS = ('fucks', 'cheeses', 'goshdarnits', 'pokes', 'ducks')
+PERCENTILES = (50, 90, 99)
+
+
+def measure(func, arguments, repeat=5):
+    """
+    Throughput, latency percentiles and peak memory of calling func
+
+    Parameters
+    ----------
+    func : callable
+    arguments : list of tuple
+        Arguments for each call
+    repeat : int
+        Number of runs over all the arguments to take the best throughput of
+
+    Returns
+    -------
+    dict
+    """
+    timer = timeit.Timer(lambda: [func(*args) for args in arguments])
+    best = min(timer.repeat(repeat=repeat, number=1))
+
+    clock = time.perf_counter_ns
+    latencies = np.empty(len(arguments), dtype=np.int64)
+    for i, args in enumerate(arguments):
+        start = clock()
+        func(*args)
+        latencies[i] = clock() - start
+
+    tracemalloc.start()
+    try:
+        results = [func(*args) for args in arguments]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return {
+        'calls_per_second': len(arguments) / best,
+        'latency_ns': {
+            f'p{percentile}': float(np.percentile(latencies, percentile))
+            for percentile in PERCENTILES
+        },
+        'peak_bytes': peak,
+    }
+
+
+def cases(points, precisions, wordlists):
+    """
+    Name, precision, wordlist, function and arguments of every case
+    """
+    gdgg = geogrids.gdgg
+    for precision in precisions:
+        coordinates = [(latitude, longitude, precision) for latitude, longitude in points]
+        numeric_hashes = [
+            gdgg.latitude_longitude_to_numeric_hash(*args) for args in coordinates]
+
+        yield ('latitude_longitude_to_numeric_hash', precision, None,
+               gdgg.latitude_longitude_to_numeric_hash, coordinates)
+        yield ('latitude_longitude_to_readable_hash', precision, None,
+               gdgg.latitude_longitude_to_readable_hash, coordinates)
+        yield ('numeric_hash_to_area', precision, None, gdgg.numeric_hash_to_area,
+               [(numeric_hash, precision) for numeric_hash in numeric_hashes])
+
+        for wordlist in wordlists:
+            encoder = getattr(geogrids.encoders, wordlist)
+            yield ('Encoder.hash_to_string', precision, wordlist, encoder.hash_to_string,
+                   [(numeric_hash, precision) for numeric_hash in numeric_hashes])
+            yield ('Encoder.string_to_hash', precision, wordlist, encoder.string_to_hash,
+                   [(encoder.hash_to_string(numeric_hash, precision), )
+                    for numeric_hash in numeric_hashes])
+
+
+def environment():
+    """
+    Versions of everything that affects the timings
+    """
+    return {
+        'geogrids': geogrids.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def key(result):
+    return result['function'], result['precision'], result['wordlist']
+
+
+def compare(results, baseline):
+    """
+    Print the change in throughput and median latency against earlier results
+    """
+    before = {key(result): result for result in baseline['results']}
+
+    print(f'{"function":<38}{"precision":>10}{"wordlist":>13}'
+          f'{"throughput":>12}{"p50":>10}')
+    for result in results:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        speedup = result['calls_per_second'] / old['calls_per_second']
+        latency = result['latency_ns']['p50'] / old['latency_ns']['p50']
+        print(f'{result["function"]:<38}{result["precision"]:>10}'
+              f'{result["wordlist"] or "":>13}{speedup:>11.2f}x{latency:>9.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--output', default='bench_results.json',
+                        help='JSON file to write the results to')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--points', type=int, default=2000,
+                        help='number of random points per case')
+    parser.add_argument('--precisions', type=int, nargs='+', default=HASH_PRECISIONS)
+    parser.add_argument('--wordlists', nargs='+', default=WORDLISTS, choices=WORDLISTS)
+    parser.add_argument('--seed', type=int, default=0)
+    arguments = parser.parse_args()
+
+    rng = random.Random(arguments.seed)
+    points = [
+        (rng.uniform(-90, 90), rng.uniform(-180, 180)) for i in range(arguments.points)
+    ]
+
+    results = []
+    for function, precision, wordlist, func, calls in cases(
+            points, arguments.precisions, arguments.wordlists):
+        result = {'function': function, 'precision': precision, 'wordlist': wordlist}
+        result.update(measure(func, calls))
+        results.append(result)
+        print(f'{function:<38}{precision:>4}{wordlist or "":>13}'
+              f'{result["calls_per_second"]:>14,.0f}/s'
+              f'{result["latency_ns"]["p50"]:>10,.0f}ns p50'
+              f'{result["peak_bytes"]:>12,}B peak')
+
+    with open(arguments.output, 'w') as output:
+        json.dump({'environment': environment(), 'points': arguments.points,
+                   'seed': arguments.seed, 'results': results}, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == '__main__':
+    main()
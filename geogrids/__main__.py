@@ -0,0 +1,4 @@
+from .pipeline import main
+
+
+main()
@@ -0,0 +1,192 @@
+"""
+Counts, sums and means of values per cell at every precision
+
+Points are hashed once at the finest precision and grouped by numeric hash.
+Each coarser level is then built from the level below it by dropping the
+finest level of the hashes (see ``to_precision``) and adding up the groups,
+so nothing is hashed twice::
+
+    >>> from geogrids.aggregate import aggregate
+    >>> pyramid = aggregate(latitudes, longitudes, values, precision=25)
+    >>> cells = pyramid[13]
+    >>> cells.numeric_hashes, cells.counts, cells.means
+
+The levels are keyed by precision, from ``precision`` down to
+``min_precision`` through each of ``HASH_PRECISIONS`` in between.
+
+``aggregate_chunks`` takes the hashes (and values) a chunk at a time, so
+only the occupied cells are held in memory rather than every point.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .gdgg import (
+    HASH_PRECISIONS,
+    latitude_longitude_to_numeric_hash_array,
+    to_precision_array,
+)
+
+
+Cells = namedtuple('Cells', ['numeric_hashes', 'counts', 'sums', 'means'])
+
+
+def _group(numeric_hashes, counts, sums):
+    """
+    Add up the counts and sums of equal hashes
+    """
+    numeric_hashes, inverse = np.unique(numeric_hashes, return_inverse=True)
+    inverse = inverse.ravel()
+    size = len(numeric_hashes)
+
+    if counts is None:
+        counts = np.bincount(inverse, minlength=size)
+    else:
+        counts = np.bincount(inverse, weights=counts, minlength=size).astype(np.int64)
+    if sums is not None:
+        sums = np.bincount(inverse, weights=sums, minlength=size)
+        return Cells(numeric_hashes, counts, sums, sums / counts)
+    return Cells(numeric_hashes, counts, None, None)
+
+
+def _merge(groups):
+    """
+    Add up the counts and sums of a list of ``Cells`` at the same precision
+    """
+    if len(groups) == 1:
+        return groups[0]
+    sums = None
+    if groups[0].sums is not None:
+        sums = np.concatenate([cells.sums for cells in groups])
+    return _group(
+        np.concatenate([cells.numeric_hashes for cells in groups]),
+        np.concatenate([cells.counts for cells in groups]),
+        sums
+    )
+
+
+def _pyramid(cells, precision, min_precision):
+    """
+    Build the coarser levels up from the cells at the finest precision
+    """
+    pyramid = {precision: cells}
+
+    for coarser in reversed(HASH_PRECISIONS):
+        if not min_precision <= coarser < precision:
+            continue
+        cells = _group(
+            to_precision_array(cells.numeric_hashes, precision, coarser),
+            cells.counts, cells.sums)
+        pyramid[coarser] = cells
+        precision = coarser
+
+    return pyramid
+
+
+def _check_values(numeric_hashes, values):
+    numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64).ravel()
+    if values is not None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) != len(numeric_hashes):
+            raise ValueError('Hashes and values differ in length')
+    return numeric_hashes, values
+
+
+def aggregate_hashes(numeric_hashes, values=None, precision=25, min_precision=3):
+    """
+    Pyramid of aggregates of points already hashed
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+        Numeric hash of each point at ``precision``
+    values : array_like
+        Value of each point, or None to only count the points
+    precision : int
+    min_precision : int
+        Coarsest precision to aggregate to
+
+    Returns
+    -------
+    pyramid : dict
+        ``Cells`` for each precision, finest first. Each holds the sorted
+        ``numeric_hashes`` of the occupied cells, with the ``counts`` of
+        points and the ``sums`` and ``means`` of their values in each (None
+        without values).
+    """
+    numeric_hashes, values = _check_values(numeric_hashes, values)
+    return _pyramid(_group(numeric_hashes, None, values), precision, min_precision)
+
+
+def aggregate_chunks(chunks, precision=25, min_precision=3):
+    """
+    Pyramid of aggregates of points already hashed, a chunk at a time
+
+    Each chunk is grouped by cell on its own and the groups are merged, so
+    memory use depends on the number of occupied cells and the chunk size
+    rather than the number of points.
+
+    Parameters
+    ----------
+    chunks : iterable of tuple
+        Pairs of the numeric hashes of a chunk of points at ``precision`` and
+        their values (or None in every chunk to only count the points)
+    precision : int
+    min_precision : int
+        Coarsest precision to aggregate to
+
+    Returns
+    -------
+    pyramid : dict
+        As ``aggregate_hashes``, without sums if there are no chunks
+    """
+    merged = None
+    pending = []
+    pending_cells = 0
+
+    for numeric_hashes, values in chunks:
+        numeric_hashes, values = _check_values(numeric_hashes, values)
+        cells = _group(numeric_hashes, None, values)
+        if merged is None:
+            merged = cells
+            continue
+        pending.append(cells)
+        pending_cells += len(cells.numeric_hashes)
+
+        # merge once the groups waiting match the merged ones in size, so each
+        # cell is only sorted a few times over
+        if pending_cells >= len(merged.numeric_hashes):
+            merged = _merge([merged] + pending)
+            pending = []
+            pending_cells = 0
+
+    if merged is None:
+        return aggregate_hashes([], None, precision, min_precision)
+    if pending:
+        merged = _merge([merged] + pending)
+    return _pyramid(merged, precision, min_precision)
+
+
+def aggregate(latitudes, longitudes, values=None, precision=25, min_precision=3):
+    """
+    Pyramid of counts, sums and means of values per cell
+
+    Parameters
+    ----------
+    latitudes : array_like
+    longitudes : array_like
+    values : array_like
+        Value of each point, or None to only count the points
+    precision : int
+        Finest precision to aggregate at
+    min_precision : int
+        Coarsest precision to aggregate to
+
+    Returns
+    -------
+    pyramid : dict
+        ``Cells`` for each precision, finest first
+    """
+    numeric_hashes = latitude_longitude_to_numeric_hash_array(
+        latitudes, longitudes, precision)
+    return aggregate_hashes(numeric_hashes, values, precision, min_precision)
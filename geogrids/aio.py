@@ -0,0 +1,366 @@
+"""
+Batching of hashing requests for asyncio services
+
+Each request to a ``BatchingGeocoder`` is queued and awaits a future. Queued
+requests of the same kind are run together through the vectorised functions
+(and ``Encoder.encode_many`` / ``decode_many``) once ``max_batch`` of them
+have built up, or ``max_delay`` seconds after the first one, whichever comes
+first::
+
+    >>> from geogrids.aio import BatchingGeocoder
+    >>> geocoder = BatchingGeocoder(geogrids.encoders.cheeses)
+    >>> async def handle(request):
+    ...     numeric_hash, precision = await geocoder.string_to_hash(request.query['words'])
+    ...     return await geocoder.numeric_hash_to_latitude_longitude(numeric_hash, precision)
+
+Each request is checked on its own: one that won't fit the vectorised
+arrays (such as a hash over 64 bits, a negative hash or a precision over 63)
+is run through the scalar function instead, and any exception only goes to
+the request that caused it. Batches are run in the event loop unless an
+``executor`` is given, in which case they're handed to it and the loop is
+free while they run.
+"""
+import asyncio
+from collections import namedtuple
+from functools import partial
+import math
+import warnings
+
+import numpy as np
+
+from . import encoders
+from .encoders.encoder import DecodingError
+from .gdgg import (
+    latitude_longitude_to_numeric_hash,
+    latitude_longitude_to_numeric_hash_array,
+    numeric_hash_to_latitude_longitude,
+    numeric_hash_to_latitude_longitude_array,
+)
+from .gdgg.arrays import _level_count
+
+
+# result of a request which also raised a warning
+_Warned = namedtuple('_Warned', ['result', 'warning'])
+
+
+def _fits_precision(precision):
+    """
+    Whether a precision can be used by the vectorised functions
+    """
+    if not isinstance(precision, (int, np.integer)):
+        return False
+    try:
+        _level_count(precision)
+    except ValueError:
+        return False
+    return True
+
+
+def _fits_uint64(value):
+    """
+    Whether a value is an integer that fits in a uint64 array
+    """
+    return isinstance(value, (int, np.integer)) and 0 <= value < 1 << 64
+
+
+def _fits_float64(value):
+    """
+    Whether a value is a finite number that fits in a float64 array unchanged
+    """
+    if not isinstance(value, (int, float, np.integer, np.floating)):
+        return False
+    try:
+        converted = float(value)
+    except OverflowError:
+        return False
+    return math.isfinite(converted) and converted == value
+
+
+def _fits_hash(numeric_hash, precision):
+    return _fits_uint64(numeric_hash) and _fits_precision(precision)
+
+
+def _fits_coordinates(latitude, longitude, precision):
+    return _fits_float64(latitude) and _fits_float64(longitude) and \
+        _fits_precision(precision)
+
+
+def _call(func, args):
+    """
+    Run a scalar function, returning rather than raising any exception
+    """
+    try:
+        return func(*args)
+    except Exception as error:
+        return error
+
+
+def _run_batches(requests, fits, run_batch, scalar):
+    """
+    Run the requests that fit through ``run_batch`` a precision at a time, and
+    the rest through the scalar function one at a time
+
+    Parameters
+    ----------
+    requests : list of tuple
+        Arguments of each request, the precision last
+    fits : callable
+        Whether the arguments of a request can be batched
+    run_batch : callable
+        Takes a list of arguments and their precision, returning a list of
+        results
+    scalar : callable
+        Scalar function to run the other requests with
+
+    Returns
+    -------
+    list
+        Result or exception of each request
+    """
+    results = [None] * len(requests)
+    groups = {}
+    single = []
+    for index, args in enumerate(requests):
+        if fits(*args):
+            groups.setdefault(args[-1], []).append(index)
+        else:
+            single.append(index)
+
+    for precision, indexes in groups.items():
+        try:
+            batch = run_batch([requests[index] for index in indexes], precision)
+        except Exception:
+            # run them one at a time so only the request at fault fails
+            single.extend(indexes)
+            continue
+        for index, result in zip(indexes, batch):
+            results[index] = result
+
+    for index in single:
+        results[index] = _call(scalar, requests[index])
+    return results
+
+
+def _outcomes(run, requests):
+    """
+    Run a batch, giving every request the exception if it fails as a whole
+    """
+    try:
+        return run(requests)
+    except Exception as error:
+        return [error] * len(requests)
+
+
+class BatchingGeocoder:
+    """
+    Coalesces concurrent hashing requests into vectorised batches
+    """
+
+    def __init__(self, encoder: encoders.Encoder = None, max_batch: int = 1024,
+                 max_delay: float = 0.002, executor=None):
+        """
+
+        Parameters
+        ----------
+        encoder : Encoder
+            Encoder for ``hash_to_string`` and ``string_to_hash``, by default
+            the one for the default wordlist
+        max_batch : int
+            Run a batch as soon as this many requests of a kind are queued
+        max_delay : float
+            Longest time in seconds a request waits for others to join its
+            batch
+        executor : concurrent.futures.Executor
+            Run batches in this executor (usually a thread pool) rather than
+            in the event loop
+        """
+        self.encoder = encoders.fucks if encoder is None else encoder
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+
+        self._pending = {}
+        self._timers = {}
+        self._running = set()
+
+    async def hash_to_string(self, numeric_hash: int, precision: int):
+        """
+        Batched ``Encoder.hash_to_string``
+        """
+        return await self._request('hash_to_string', (numeric_hash, precision))
+
+    async def string_to_hash(self, encoded: str):
+        """
+        Batched ``Encoder.string_to_hash``
+        """
+        return await self._request('string_to_hash', (encoded, ))
+
+    async def latitude_longitude_to_numeric_hash(self, latitude, longitude, precision=25):
+        """
+        Batched ``latitude_longitude_to_numeric_hash``
+        """
+        return await self._request(
+            'latitude_longitude_to_numeric_hash', (latitude, longitude, precision))
+
+    async def numeric_hash_to_latitude_longitude(self, numeric_hash, precision=25):
+        """
+        Batched ``numeric_hash_to_latitude_longitude``
+        """
+        return await self._request(
+            'numeric_hash_to_latitude_longitude', (numeric_hash, precision))
+
+    async def flush(self):
+        """
+        Run every queued request now and wait for all batches to finish
+        """
+        for kind in list(self._pending):
+            self._flush(kind)
+        while self._running:
+            await asyncio.wait(list(self._running))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.flush()
+
+    async def _request(self, kind, args):
+        """
+        Queue a request and wait for its result, raising any warning here
+        """
+        result = await self._submit(kind, args)
+        if isinstance(result, _Warned):
+            warnings.warn(result.warning, stacklevel=3)
+            result = result.result
+        return result
+
+    def _submit(self, kind, args):
+        """
+        Queue a request, returning the future of its result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(kind, [])
+        pending.append((args, future))
+        if len(pending) >= self.max_batch:
+            self._flush(kind)
+        elif kind not in self._timers:
+            self._timers[kind] = loop.call_later(self.max_delay, self._flush, kind)
+
+        return future
+
+    def _flush(self, kind):
+        """
+        Run the queued requests of a kind as a batch
+        """
+        timer = self._timers.pop(kind, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(kind, [])
+        if not batch:
+            return
+
+        requests = [args for args, future in batch]
+        futures = [future for args, future in batch]
+        run = getattr(self, '_run_' + kind)
+
+        if self.executor is None:
+            self._resolve(futures, _outcomes(run, requests))
+            return
+
+        task = asyncio.get_running_loop().run_in_executor(
+            self.executor, _outcomes, run, requests)
+        self._running.add(task)
+        task.add_done_callback(partial(self._finished, futures))
+
+    def _finished(self, futures, task):
+        """
+        Resolve the futures of a batch run in the executor
+        """
+        self._running.discard(task)
+        if task.cancelled():
+            outcomes = [asyncio.CancelledError()] * len(futures)
+        elif task.exception() is not None:
+            outcomes = [task.exception()] * len(futures)
+        else:
+            outcomes = task.result()
+        self._resolve(futures, outcomes)
+
+    @staticmethod
+    def _resolve(futures, outcomes):
+        for future, outcome in zip(futures, outcomes):
+            if future.done():  # the caller gave up waiting
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _run_hash_to_string(self, requests):
+        return _run_batches(
+            requests,
+            _fits_hash,
+            lambda batch, precision: self.encoder.encode_many(
+                np.array([args[0] for args in batch], dtype=np.uint64), precision),
+            self.encoder.hash_to_string
+        )
+
+    def _run_string_to_hash(self, requests):
+        results = [None] * len(requests)
+        batch = [index for index, args in enumerate(requests) if isinstance(args[0], str)]
+        single = [index for index, args in enumerate(requests) if not isinstance(args[0], str)]
+
+        try:
+            numeric_hashes, precisions, errors = self.encoder.decode_many(
+                [requests[index][0] for index in batch])
+            decoded = list(zip(numeric_hashes.tolist(), precisions.tolist(), errors))
+        except Exception:
+            # decode them one at a time so only the request at fault fails
+            single.extend(batch)
+            decoded = []
+        for index, result in zip(batch, decoded):
+            if isinstance(result[2], OverflowError):
+                # too big for the batch, but fine for the scalar decoder
+                single.append(index)
+            else:
+                results[index] = result
+
+        for index in single:
+            results[index] = _call(self.encoder._decode, requests[index])
+
+        return [self._decoded(*result) if isinstance(result, tuple) else result
+                for result in results]
+
+    @staticmethod
+    def _decoded(numeric_hash, precision, error):
+        """
+        Result of a decoded string, as ``Encoder.string_to_hash`` would give it
+        """
+        if isinstance(error, DecodingError):
+            return error
+        if error is not None:
+            return _Warned((numeric_hash, precision), error)
+        return numeric_hash, precision
+
+    def _run_latitude_longitude_to_numeric_hash(self, requests):
+        return _run_batches(
+            requests,
+            _fits_coordinates,
+            lambda batch, precision: latitude_longitude_to_numeric_hash_array(
+                np.array([args[0] for args in batch], dtype=np.float64),
+                np.array([args[1] for args in batch], dtype=np.float64),
+                precision
+            ).tolist(),
+            latitude_longitude_to_numeric_hash
+        )
+
+    def _run_numeric_hash_to_latitude_longitude(self, requests):
+        return _run_batches(
+            requests,
+            _fits_hash,
+            lambda batch, precision: list(map(tuple, numeric_hash_to_latitude_longitude_array(
+                np.array([args[0] for args in batch], dtype=np.uint64), precision
+            ).tolist())),
+            numeric_hash_to_latitude_longitude
+        )
@@ -2,13 +2,32 @@
 Generic hash encoder which can be combined with words lists to econde or decode
 a geographic hash.
 """
+from itertools import islice
 import math
+from types import MappingProxyType
 import warnings
 
+import numpy as np
 
 from .wordlists import fucks
 
 
+def _chunks(iterable, chunk_size):
+    """
+    Split an iterable or array into lists (or array slices) of chunk_size
+    """
+    if isinstance(iterable, np.ndarray):
+        for start in range(0, len(iterable), chunk_size):
+            yield iterable[start:start + chunk_size]
+        return
+
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(iterator, chunk_size))
+
+
 class DecodingWarning(Warning):
     """
     Custom warning for when the Encoder failed to decode completely
@@ -29,6 +48,11 @@ class DecodingError(ValueError):
         self.message = f"Could not match '{word}' in wordlist"
         super().__init__(self.message)
 
+    def __reduce__(self):
+        # rebuild from the word and wordlist rather than the message so errors
+        # can be pickled back from worker processes
+        return type(self), (self.word, self.wordlist)
+
 
 class Encoder:
     """
@@ -58,10 +82,25 @@ class Encoder:
         self.wordlist = wordlist
         self.separator = separator
 
+        # reverse index of word to position, keeping the first position of any
+        # duplicated words as wordlist.index would
+        positions = {}
+        for position, word in enumerate(wordlist):
+            positions.setdefault(word, position)
+        self.positions = MappingProxyType(positions)
+
         self.precision_per_word = int(math.log2(len(wordlist)))
         self.precisions = list(
             range(self.precision_per_word, 60, self.precision_per_word))
 
+        self._words = np.array(wordlist, dtype=object)
+
+        # words can be picked out with shifts and masks for power of two lists
+        if len(wordlist) == 1 << self.precision_per_word:
+            self._word_mask = len(wordlist) - 1
+        else:
+            self._word_mask = None
+
 
     def hash_to_string(self, numeric_hash : int, precision : int):
         """
@@ -78,13 +117,23 @@ class Encoder:
         encoded : str
             The hash encoded to a string with the appropriate level of precision
         """
+        wordlist = self.wordlist
+        numeric_hash = int(numeric_hash)
         digits = []
 
-        while precision > 0:
-            word_index = numeric_hash % len(self.wordlist)
-            digits.append(self.wordlist[word_index])
-            numeric_hash = int(numeric_hash / len(self.wordlist))
-            precision -= self.precision_per_word
+        if self._word_mask is not None:
+            mask = self._word_mask
+            shift = self.precision_per_word
+            while precision > 0:
+                digits.append(wordlist[numeric_hash & mask])
+                numeric_hash >>= shift
+                precision -= shift
+        else:
+            base = len(wordlist)
+            while precision > 0:
+                numeric_hash, word_index = divmod(numeric_hash, base)
+                digits.append(wordlist[word_index])
+                precision -= self.precision_per_word
 
         return self.separator.join(digits)
 
@@ -101,6 +150,31 @@ class Encoder:
         numeric_hash : int
         precision : int
         """
+        numeric_hash, precision, error = self._decode(encoded)
+
+        if isinstance(error, DecodingError):
+            raise error
+        if error is not None:
+            warnings.warn(error, stacklevel=2)
+
+        return numeric_hash, precision
+
+    def _decode(self, encoded):
+        """
+        Decode a string, returning rather than raising any decoding problem
+
+        Parameters
+        ----------
+        encoded : str
+
+        Returns
+        -------
+        numeric_hash : int
+        precision : int
+        error : DecodingError or DecodingWarning or None
+            A DecodingError if the first word couldn't be decoded, or a
+            DecodingWarning if decoding stopped at a later word
+        """
         numeric_hash = 0
         precision = 0
         multiplier = 1
@@ -112,19 +186,131 @@ class Encoder:
 
         for word in words:
             try:
-                position = self.wordlist.index(word)
-            except ValueError:
+                position = self.positions[word]
+            except KeyError:
                 if precision > 0:
-                    warnings.warn(
-                        f'Could not find {word} in wordlist',
-                        DecodingWarning
-                    )
-                    return numeric_hash, precision
+                    error = DecodingWarning(f'Could not find {word} in wordlist')
+                    return numeric_hash, precision, error
                 else:
-                    raise DecodingError(word, self.wordlist)
+                    return 0, 0, DecodingError(word, self.wordlist)
 
             numeric_hash += position * multiplier
             multiplier *= len(self.wordlist)
             precision += self.precision_per_word
 
-        return numeric_hash, precision
+        return numeric_hash, precision, None
+
+    def encode_many(self, numeric_hashes, precision : int, chunk_size : int = 65536):
+        """
+        Convert many numeric hashes to encoded strings with the same precision
+
+        Hashes are converted in chunks of uint64 arrays, picking out the word
+        positions for every hash in the chunk at once.
+
+        Parameters
+        ----------
+        numeric_hashes : iterable of int or numpy.ndarray
+        precision : int
+        chunk_size : int
+            Number of hashes to convert at a time
+
+        Returns
+        -------
+        encoded : list of str
+            The hashes encoded to strings, in the same order
+        """
+        join = self.separator.join
+        word_count = len(range(0, precision, self.precision_per_word))
+        encoded = []
+
+        for chunk in _chunks(numeric_hashes, chunk_size):
+            try:
+                positions = self._word_positions(
+                    np.asarray(chunk, dtype=np.uint64), word_count)
+            except OverflowError:
+                encoded.extend(
+                    self.hash_to_string(numeric_hash, precision)
+                    for numeric_hash in chunk
+                )
+            else:
+                encoded.extend(map(join, self._words[positions].tolist()))
+
+        return encoded
+
+    def _word_positions(self, numeric_hashes, word_count):
+        """
+        Positions in the wordlist of each word for an array of numeric hashes
+
+        Parameters
+        ----------
+        numeric_hashes : numpy.ndarray
+            uint64 numeric hashes
+        word_count : int
+            Number of words for each hash
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (N, word_count)
+
+        Raises
+        ------
+        OverflowError
+            If the words don't fit in a 64 bit hash
+        """
+        if self._word_mask is not None:
+            if (word_count - 1) * self.precision_per_word >= 64:
+                raise OverflowError('Words do not fit in a 64 bit hash')
+            shifts = np.arange(word_count, dtype=np.uint64) * np.uint64(
+                self.precision_per_word)
+            return (numeric_hashes[:, None] >> shifts) & np.uint64(self._word_mask)
+
+        positions = np.empty((len(numeric_hashes), word_count), dtype=np.uint64)
+        base = np.uint64(len(self.wordlist))
+        for i in range(word_count):
+            numeric_hashes, positions[:, i] = np.divmod(numeric_hashes, base)
+        return positions
+
+    def decode_many(self, encoded_strings):
+        """
+        Convert many encoded strings back to numeric hashes and precisions
+
+        Rather than raising or warning, problems decoding each string are
+        returned alongside the results so a bad row doesn't stop the rest.
+
+        Parameters
+        ----------
+        encoded_strings : iterable of str
+
+        Returns
+        -------
+        numeric_hashes : numpy.ndarray
+            uint64 numeric hashes, zero where the string couldn't be decoded
+        precisions : numpy.ndarray
+            Precision of each numeric hash, zero where the string couldn't be
+            decoded
+        errors : list
+            None for each string that decoded cleanly, otherwise the
+            DecodingError, DecodingWarning (for a partial decoding) or
+            OverflowError (for a hash over 64 bits) for that string
+        """
+        numeric_hashes = []
+        precisions = []
+        errors = []
+        decode = self._decode
+
+        for encoded in encoded_strings:
+            numeric_hash, precision, error = decode(encoded)
+            if numeric_hash >> 64:
+                numeric_hash = precision = 0
+                error = OverflowError(f'{encoded} does not fit in a 64 bit hash')
+
+            numeric_hashes.append(numeric_hash)
+            precisions.append(precision)
+            errors.append(error)
+
+        return (
+            np.array(numeric_hashes, dtype=np.uint64),
+            np.array(precisions, dtype=np.int64),
+            errors
+        )
@@ -8,3 +8,44 @@ from .oqtm import (
     readable_hash_to_latitude_longitude,
     HASH_PRECISIONS
 )
+from .arrays import (
+    latitude_longitude_to_numeric_hash_array,
+    numeric_hash_to_area_array,
+    numeric_hash_to_latitude_longitude_array,
+    numeric_hash_to_readable_hash_array,
+)
+from .neighbors import (
+    edge_neighbors,
+    neighbors,
+    neighbors_array,
+)
+from .hierarchy import (
+    children,
+    children_array,
+    parent,
+    parent_array,
+    to_precision,
+    to_precision_array,
+)
+from .cover import cover
+from .ranges import (
+    cells_to_ranges,
+    numeric_hash_to_prefix_key,
+    numeric_hash_to_prefix_key_array,
+    prefix_key_to_numeric_hash,
+    prefix_key_to_numeric_hash_array,
+)
+from .cache import (
+    AreaCache,
+    area_cache,
+)
+from .coarse import (
+    CoarseTable,
+    disable_coarse_table,
+    enable_coarse_table,
+)
+from .export import (
+    cells_to_geoarrow,
+    cells_to_geojson,
+)
+from .cellset import CompressedCellSet
@@ -0,0 +1,121 @@
+"""
+Memoised cell areas
+
+``numeric_hash_to_area`` builds new ``Location`` objects (and computes their
+coordinates) on every call. ``AreaCache`` keeps the vertices of recently used
+cells as tuples of latitude and longitude instead, for callers which decode
+the same cells over and over::
+
+    >>> from geogrids.gdgg import area_cache
+    >>> area_cache.numeric_hash_to_area(12108871, 25)
+    >>> area_cache.cache_info()
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from .oqtm import Location, _hash_to_levels, _readable_to_hash
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'maxsize', 'currsize', 'evictions'])
+
+
+def _area_vertices(numeric_hash, precision):
+    """
+    Vertices of a cell as in ``numeric_hash_to_area``, as tuples
+    """
+    return tuple(
+        (location.latitude, location.longitude)
+        for location in Location.levels_to_triangle(
+            numeric_hash & 7,
+            _hash_to_levels(numeric_hash, precision),
+            normalise_poles=True
+        )
+    )
+
+
+class AreaCache:
+    """
+    Least recently used cache of cell vertices, keyed by hash and precision
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+
+        Parameters
+        ----------
+        maxsize : int
+            Most cells to keep, or None for no limit
+        """
+        self._vertices = lru_cache(maxsize)(_area_vertices)
+
+    def numeric_hash_to_area(self, numeric_hash, precision=25):
+        """
+        Cached version of ``numeric_hash_to_area``
+
+        Parameters
+        ----------
+        numeric_hash : int
+        precision : int
+
+        Returns
+        -------
+        vertices : tuple of tuple of float
+            Latitude and longitude of each vertex (usually 3, at the poles 4)
+        """
+        # hashes with the same levels share an entry
+        shift = 3 + 2 * len(range(3, precision, 2))
+        return self._vertices(int(numeric_hash) & ((1 << shift) - 1), shift)
+
+    def readable_hash_to_area(self, readable_hash):
+        """
+        Cached version of ``readable_hash_to_area``
+
+        Parameters
+        ----------
+        readable_hash : str
+
+        Returns
+        -------
+        vertices : tuple of tuple of float
+            Latitude and longitude of each vertex (usually 3, at the poles 4)
+        """
+        return self._vertices(*_readable_to_hash(readable_hash))
+
+    def cache_info(self):
+        """
+        Statistics of the cache
+
+        Returns
+        -------
+        CacheInfo
+            Hits, misses, maximum and current size as for
+            ``functools.lru_cache``, plus the number of cells evicted to make
+            room for others
+        """
+        info = self._vertices.cache_info()
+        return CacheInfo(
+            info.hits, info.misses, info.maxsize, info.currsize,
+            # every miss adds a cell, and the statistics reset when cleared
+            info.misses - info.currsize
+        )
+
+    def cache_clear(self):
+        """
+        Empty the cache and reset its statistics
+        """
+        self._vertices.cache_clear()
+
+    def resize(self, maxsize):
+        """
+        Change the size of the cache, emptying it
+
+        Parameters
+        ----------
+        maxsize : int
+            Most cells to keep, or None for no limit
+        """
+        self._vertices = lru_cache(maxsize)(_area_vertices)
+
+
+area_cache = AreaCache()
@@ -0,0 +1,274 @@
+"""
+Compressed sets of cells
+
+Nearby cells share their coarse levels, so as prefix keys (see ranges.py)
+a set of clustered cells sorts into runs of keys with small gaps between
+them. ``CompressedCellSet`` keeps the sorted keys in blocks: the first key of
+each block goes in a skip index and the rest are stored as the differences
+from the key before, each as a varint of 7 bits per byte. Membership checks
+look up the block in the skip index and only decode that block::
+
+    >>> cells = geogrids.gdgg.CompressedCellSet(numeric_hashes, precision=25)
+    >>> 12108871 in cells
+    True
+    >>> cells.nbytes, len(cells)
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from .arrays import _level_count
+from .ranges import numeric_hash_to_prefix_key, numeric_hash_to_prefix_key_array, \
+    prefix_key_to_numeric_hash_array
+
+
+def _encode_varints(values):
+    """
+    Varint bytes of an array of uint64, least significant 7 bits first
+    """
+    lengths = np.ones(len(values), dtype=np.int64)
+    remaining = values >> np.uint64(7)
+    while remaining.any():
+        lengths += remaining > 0
+        remaining >>= np.uint64(7)
+
+    owners = np.repeat(np.arange(len(values)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    positions = np.arange(len(owners)) - starts[owners]
+
+    data = (values[owners] >> (7 * positions).astype(np.uint64)) & np.uint64(0x7f)
+    data |= np.where(positions < lengths[owners] - 1, 0x80, 0).astype(np.uint64)
+    return data.astype(np.uint8), lengths
+
+
+def _decode_varints(data):
+    """
+    Array of uint64 from varint bytes
+    """
+    data = np.frombuffer(data, dtype=np.uint8)
+    if not len(data):
+        return np.empty(0, dtype=np.uint64)
+
+    ends = np.flatnonzero(data < 0x80)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    owners = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    positions = np.arange(len(data)) - starts[owners]
+
+    parts = (data & 0x7f).astype(np.uint64) << (7 * positions).astype(np.uint64)
+    return np.bitwise_or.reduceat(parts, starts)
+
+
+class CompressedCellSet:
+    """
+    Set of cells at one precision, stored as compressed blocks of prefix keys
+    """
+
+    def __init__(self, numeric_hashes=(), precision: int = 25, block_size: int = 32):
+        """
+
+        Parameters
+        ----------
+        numeric_hashes : array_like
+            Numeric hashes of the cells, in any order and with repeats
+        precision : int
+        block_size : int
+            Number of keys per block. Smaller blocks make membership checks
+            quicker, larger blocks make the skip index smaller.
+        """
+        _level_count(precision)
+        if block_size < 1:
+            raise ValueError(f'Block size must be at least 1, not {block_size}')
+        self.precision = precision
+        self.block_size = block_size
+        self._store(np.unique(numeric_hash_to_prefix_key_array(
+            np.asarray(numeric_hashes, dtype=np.uint64).ravel(), precision)))
+
+    @classmethod
+    def _from_keys(cls, keys, precision, block_size):
+        cells = cls.__new__(cls)
+        cells.precision = precision
+        cells.block_size = block_size
+        cells._store(keys)
+        return cells
+
+    def _store(self, keys):
+        """
+        Compress sorted unique prefix keys into blocks
+        """
+        size = self.block_size
+        self._length = len(keys)
+
+        firsts = np.arange(0, len(keys), size)
+        following = np.ones(len(keys), dtype=bool)
+        following[firsts] = False
+        deltas = np.diff(keys)[following[1:]] if len(keys) else keys
+
+        data, lengths = _encode_varints(deltas)
+        byte_offsets = np.concatenate([[0], np.cumsum(lengths)])
+
+        self._data = data.tobytes()
+        # python ints for the scalar lookups
+        self._firsts = keys[firsts].tolist()
+        self._offsets = byte_offsets[np.append(firsts - np.arange(len(firsts)), len(deltas))].tolist()
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the blocks and the skip index (as 8 bytes a number)
+        """
+        return len(self._data) + 8 * (len(self._firsts) + len(self._offsets))
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, numeric_hash):
+        key = numeric_hash_to_prefix_key(int(numeric_hash), self.precision)
+        block = bisect_right(self._firsts, key) - 1
+        if block < 0:
+            return False
+
+        value = self._firsts[block]
+        data = self._data
+        delta = shift = 0
+        for position in range(self._offsets[block], self._offsets[block + 1]):
+            if value >= key:
+                break
+            byte = data[position]
+            delta |= (byte & 0x7f) << shift
+            if byte & 0x80:
+                shift += 7
+            else:
+                value += delta
+                delta = shift = 0
+        return value == key
+
+    def _block_keys(self, block):
+        """
+        Prefix keys of one block
+        """
+        deltas = _decode_varints(self._data[self._offsets[block]:self._offsets[block + 1]])
+        keys = np.empty(len(deltas) + 1, dtype=np.uint64)
+        keys[0] = self._firsts[block]
+        np.cumsum(deltas, out=keys[1:])
+        keys[1:] += keys[0]
+        return keys
+
+    def keys(self):
+        """
+        Sorted prefix keys of all the cells
+
+        Returns
+        -------
+        keys : numpy.ndarray
+            uint64 array
+        """
+        deltas = _decode_varints(self._data)
+        blocks = len(self._firsts)
+        starts = np.arange(blocks) * self.block_size
+
+        steps = np.empty(self._length, dtype=np.uint64)
+        following = np.ones(self._length, dtype=bool)
+        following[starts] = False
+        steps[following] = deltas
+        steps[starts] = self._firsts
+
+        # add up the steps, starting again at the first key of each block
+        # (the uint64 sums wrap around but the differences come out right)
+        totals = np.cumsum(steps)
+        before = totals[starts] - steps[starts]
+        return totals - np.repeat(before, np.diff(np.append(starts, self._length)))
+
+    def numeric_hashes(self):
+        """
+        Numeric hashes of all the cells, in prefix key order
+
+        Returns
+        -------
+        numeric_hashes : numpy.ndarray
+            uint64 array
+        """
+        return prefix_key_to_numeric_hash_array(self.keys(), self.precision)
+
+    def __iter__(self):
+        for block in range(len(self._firsts)):
+            yield from prefix_key_to_numeric_hash_array(
+                self._block_keys(block), self.precision).tolist()
+
+    def contains_array(self, numeric_hashes):
+        """
+        Vectorised membership check
+
+        Parameters
+        ----------
+        numeric_hashes : array_like
+
+        Returns
+        -------
+        found : numpy.ndarray
+            Boolean array, true for each hash in the set
+        """
+        keys = numeric_hash_to_prefix_key_array(numeric_hashes, self.precision)
+        return np.isin(keys, self.keys())
+
+    def _check(self, other):
+        if not isinstance(other, CompressedCellSet):
+            raise TypeError(f'Cannot combine cells with {type(other).__name__}')
+        if other.precision != self.precision:
+            raise ValueError(
+                f'Cannot combine cells at precisions {self.precision} and {other.precision}')
+
+    def union(self, other):
+        """
+        Cells in either set
+
+        Parameters
+        ----------
+        other : CompressedCellSet
+            At the same precision
+
+        Returns
+        -------
+        CompressedCellSet
+        """
+        self._check(other)
+        return self._from_keys(
+            np.union1d(self.keys(), other.keys()), self.precision, self.block_size)
+
+    def intersection(self, other):
+        """
+        Cells in both sets
+
+        Parameters
+        ----------
+        other : CompressedCellSet
+            At the same precision
+
+        Returns
+        -------
+        CompressedCellSet
+        """
+        self._check(other)
+        return self._from_keys(
+            np.intersect1d(self.keys(), other.keys(), assume_unique=True),
+            self.precision, self.block_size)
+
+    def __or__(self, other):
+        if not isinstance(other, CompressedCellSet):
+            return NotImplemented
+        return self.union(other)
+
+    def __and__(self, other):
+        if not isinstance(other, CompressedCellSet):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompressedCellSet):
+            return NotImplemented
+        return self.precision == other.precision and \
+            np.array_equal(self.keys(), other.keys())
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'<CompressedCellSet of {self._length} cells at precision {self.precision}>'
@@ -0,0 +1,201 @@
+"""
+Lookup table for the first levels of a hash
+
+The coarse levels of a hash only depend on which of a fixed set of triangles
+the point falls in, so they can be looked up from a grid over the octant
+rather than worked out one level at a time. Once the table is enabled the
+scalar hashing functions take the first levels (and the remainder x, y) from
+it, and only subdivide the levels below::
+
+    >>> geogrids.gdgg.enable_coarse_table(levels=6)
+
+The results are exactly the same as without the table. Each step of the
+subdivision doubles x and y and adds 0, 1 or -1, which only rounds the first
+time 1 or -1 is added - after that the remainders are multiples of 2 ** -53
+and every step is exact. So each triangle keeps the multiplier and offset of
+the steps up to and including that first rounding, and of the steps after it,
+and applies them in two operations. Grid squares touching the sloping edge of
+any triangle (where the comparison rounds) and points right on the edge of a
+square fall back to subdividing every level.
+"""
+from array import array
+
+import numpy as np
+
+from . import oqtm
+
+
+# marks grid squares which don't fit in a single triangle
+_EMPTY = 0xFFFF
+
+# fraction of a grid square around its edges left to the subdivision, far
+# wider than the rounding of the first level that adds 1 or -1
+_MARGIN = 2.0 ** -32
+
+# change to x and y for each level digit, as (multiplier, offset)
+_STEPS = {
+    0: ((-2, 1), (-2, 1)),
+    1: ((2, 0), (2, -1)),
+    2: ((2, 0), (2, 0)),
+    3: ((2, -1), (2, 0)),
+}
+
+
+def _path_steps(digits):
+    """
+    Combine the steps of a sequence of level digits for one coordinate
+
+    Parameters
+    ----------
+    digits : list of tuple of int
+        (multiplier, offset) for each level
+
+    Returns
+    -------
+    inner : tuple of float
+        Multiplier and offset up to the first non-zero offset
+    outer : tuple of float
+        Multiplier and offset of the steps after it
+    """
+    inner_scale, inner_offset = 1, 0
+    outer_scale, outer_offset = 1, 0
+    rounded = False
+
+    for scale, offset in digits:
+        if rounded:
+            outer_scale, outer_offset = scale * outer_scale, scale * outer_offset + offset
+        else:
+            inner_scale, inner_offset = scale * inner_scale, offset
+            rounded = offset != 0
+
+    return (float(inner_scale), float(inner_offset)), (float(outer_scale), float(outer_offset))
+
+
+class CoarseTable:
+    """
+    Grid over an octant giving the first levels of the hash of each square
+    """
+
+    def __init__(self, levels: int = 6, grid_bits: int = 4):
+        """
+
+        Parameters
+        ----------
+        levels : int
+            Number of levels in the table, at most 7
+        grid_bits : int
+            Number of grid squares along the side of the smallest triangles,
+            as a power of two. A fraction of about 3 / 2 ** grid_bits of the
+            squares touch a sloping edge and aren't used. The grid has
+            ``4 ** (levels + grid_bits)`` squares of 2 bytes each, so 2MB with
+            the defaults.
+        """
+        if not 0 < levels <= 7:
+            raise ValueError('The table holds between 1 and 7 levels')
+
+        self.levels = levels
+        self.start = 3 + 2 * levels
+        size = 1 << levels + grid_bits
+        self._size = size
+        self._scale = float(size)
+
+        # sums of the column and row of each grid square, in units of a square
+        rows, columns = np.divmod(np.arange(size * size), size)
+        sums = rows + columns
+        spacing = 1 << grid_bits
+        touching = (sums + 2) // spacing * spacing >= sums
+        inside = ~touching & (sums < size)
+
+        # levels of the middle of each square
+        x = (columns + 0.5) / size
+        y = (rows + 0.5) / size
+        paths = np.zeros(size * size, dtype=np.uint16)
+        for level in range(levels):
+            top = y > 0.5
+            left = ~top & (y < 0.5 - x)
+            right = ~top & ~left & (x >= 0.5)
+            x, y = (
+                np.where(top | left, x * 2, np.where(right, (x - 0.5) * 2, 1 - x * 2)),
+                np.where(top, (y - 0.5) * 2, np.where(left | right, y * 2, 1 - y * 2))
+            )
+            digits = np.where(top, 1, np.where(left, 2, np.where(right, 3, 0)))
+            paths |= (digits << 2 * level).astype(np.uint16)
+
+        self._cells = array('H', np.where(inside, paths, _EMPTY).astype(np.uint16).tobytes())
+
+        self._paths = []
+        for path in range(1 << 2 * levels):
+            digits = [(path >> 2 * level) & 3 for level in range(levels)]
+            (bx, cx), (ax, dx) = _path_steps([_STEPS[digit][0] for digit in digits])
+            (by, cy), (ay, dy) = _path_steps([_STEPS[digit][1] for digit in digits])
+            self._paths.append((path << 3, bx, cx, ax, dx, by, cy, ay, dy))
+
+    @property
+    def nbytes(self):
+        """
+        Bytes used by the grid
+        """
+        return self._cells.itemsize * len(self._cells)
+
+    def lookup(self, x, y):
+        """
+        First levels and remainder of a point in an octant
+
+        Parameters
+        ----------
+        x : float
+        y : float
+
+        Returns
+        -------
+        levels : int
+            Levels packed as in the numeric hash, without the octant
+        x : float
+        y : float
+            The remainder coordinates in the deepest level of the table
+
+        Or None where the point needs to be subdivided level by level
+        """
+        if not (0 <= x < 1 and 0 <= y < 1):
+            return None
+
+        x_scaled = x * self._scale
+        y_scaled = y * self._scale
+        column = int(x_scaled)
+        row = int(y_scaled)
+        if not (_MARGIN < x_scaled - column < 1 - _MARGIN
+                and _MARGIN < y_scaled - row < 1 - _MARGIN):
+            return None
+
+        path = self._cells[row * self._size + column]
+        if path == _EMPTY:
+            return None
+
+        levels, bx, cx, ax, dx, by, cy, ay, dy = self._paths[path]
+        return levels, ax * (bx * x + cx) + dx, ay * (by * y + cy) + dy
+
+
+def enable_coarse_table(levels=6, grid_bits=4):
+    """
+    Build a lookup table and use it for the first levels of scalar hashes
+
+    Parameters
+    ----------
+    levels : int
+    grid_bits : int
+        See ``CoarseTable``
+
+    Returns
+    -------
+    CoarseTable
+    """
+    table = CoarseTable(levels, grid_bits)
+    oqtm._coarse_table = table
+    return table
+
+
+def disable_coarse_table():
+    """
+    Go back to subdividing every level of scalar hashes
+    """
+    oqtm._coarse_table = None
@@ -0,0 +1,373 @@
+"""
+Covering regions with OQTM cells
+
+A region is covered by walking down from the eight octants, testing each cell
+against the region and only splitting the cells that cross its boundary. Cells
+entirely inside the region are kept at whatever precision they were found, so
+the result mixes coarse cells in the interior with fine cells along the
+boundary.
+
+Regions are planar in longitude / latitude (as in GeoJSON), and need to be
+split beforehand if they cross the antimeridian. The cells are only straight
+sided triangles in the local frame of their octant, so the tests are made
+there: the region is moved into the frame of each octant, with its edges
+broken up finely enough to follow the curves they become.
+"""
+from collections.abc import Mapping
+import math
+
+import numpy as np
+
+from .arrays import _level_count
+from .hierarchy import children_array
+
+
+# outcome of testing a cell against a region
+_OUTSIDE, _PARTIAL, _INSIDE = range(3)
+
+# most cell edge / region edge pairs tested at once
+_CHUNK = 1 << 20
+
+# cells tested against the same region edges
+_BAND = 64
+
+# longitude offsets for octants (modulo 4), as in Location._compute_lat_lng
+_OCTANT_OFFSETS = (-180.0, -90.0, 0.0, 90.0)
+
+
+def _rings(geometry):
+    """
+    Rings of a geometry as closed arrays of longitude, latitude
+
+    Parameters
+    ----------
+    geometry : object
+        Anything with a ``__geo_interface__``, a GeoJSON mapping or
+        ``(west, south, east, north)`` bounds
+
+    Returns
+    -------
+    rings : list of numpy.ndarray
+    """
+    if hasattr(geometry, '__geo_interface__'):
+        geometry = geometry.__geo_interface__
+
+    if not isinstance(geometry, Mapping):
+        west, south, east, north = geometry
+        geometry = {
+            'type': 'Polygon',
+            'coordinates': [[
+                (west, south), (east, south), (east, north), (west, north)
+            ]]
+        }
+
+    kind = geometry['type']
+    if kind == 'Feature':
+        return _rings(geometry['geometry'])
+    if kind == 'Polygon':
+        polygons = [geometry['coordinates']]
+    elif kind == 'MultiPolygon':
+        polygons = geometry['coordinates']
+    else:
+        raise ValueError(f'Cannot cover a {kind} geometry')
+
+    rings = []
+    for polygon in polygons:
+        for ring in polygon:
+            ring = np.asarray(ring, dtype=np.float64)[:, :2]
+            if len(ring) and not np.array_equal(ring[0], ring[-1]):
+                ring = np.concatenate([ring, ring[:1]])
+            if len(ring) > 3:
+                rings.append(ring)
+
+    return rings
+
+
+def _octant_edges(rings, octant, tolerance):
+    """
+    Edges of rings in the local frame of an octant
+
+    Straight edges in longitude / latitude are curves in the local frame (x
+    being scaled by 1 - y), so they are broken into pieces which stray less
+    than ``tolerance`` from the curve.
+
+    Parameters
+    ----------
+    rings : list of numpy.ndarray
+    octant : int
+    tolerance : float
+
+    Returns
+    -------
+    starts : numpy.ndarray
+    ends : numpy.ndarray
+        Arrays of shape (M, 2) with the ends of each edge
+    curved : numpy.ndarray
+        Boolean array of shape (M, ), true for the pieces of curves (only
+        lines of constant latitude or longitude stay straight)
+    """
+    offset = _OCTANT_OFFSETS[octant & 3]
+    sign = -1 if octant > 3 else 1
+
+    starts = []
+    ends = []
+    curved = []
+    for ring in rings:
+        x = (ring[:, 0] - offset) / 90
+        y = sign * ring[:, 1] / 90
+        dx = np.diff(x)
+        dy = np.diff(y)
+
+        # the curve strays at most a quarter of dx * dy from the straight edge
+        pieces = np.maximum(1, np.ceil(
+            np.sqrt(np.abs(dx * dy) / (4 * tolerance)))).astype(np.intp)
+        index = np.repeat(np.arange(len(pieces)), pieces)
+        steps = np.arange(len(index)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+        steps = steps / pieces[index]
+        x = np.append(x[index] + dx[index] * steps, x[-1])
+        y = np.append(y[index] + dy[index] * steps, y[-1])
+
+        points = np.stack([x * (1 - y), y], axis=-1)
+        starts.append(points[:-1])
+        ends.append(points[1:])
+        curved.append(np.repeat(dx * dy != 0, pieces))
+
+    return np.concatenate(starts), np.concatenate(ends), np.concatenate(curved)
+
+
+def _cell_corners(numeric_hashes, precision):
+    """
+    Corners of cells in the local frame of their octants
+
+    Parameters
+    ----------
+    numeric_hashes : numpy.ndarray
+    precision : int
+
+    Returns
+    -------
+    corners : numpy.ndarray
+        Array of shape (N, 3, 2) with the V0, Vx and Vy corners of each cell
+    """
+    x = np.zeros(len(numeric_hashes))
+    y = np.zeros(len(numeric_hashes))
+    size = np.ones(len(numeric_hashes))
+
+    for level in range(_level_count(precision)):
+        digits = (numeric_hashes >> np.uint64(3 + 2 * level)) & np.uint64(3)
+        size = size / 2
+        x += np.where((digits == 0) | (digits == 3), size, 0)
+        y += np.where((digits == 0) | (digits == 1), size, 0)
+        # the centre child is inverted
+        size = np.where(digits == 0, -size, size)
+
+    return np.stack([
+        np.stack([x, y], axis=-1),
+        np.stack([x + size, y], axis=-1),
+        np.stack([x, y + size], axis=-1),
+    ], axis=1)
+
+
+def _orientation(a, b, points):
+    """
+    Cross product of b - a and points - a, broadcasting over leading axes
+    """
+    return (
+        (b[..., 0] - a[..., 0]) * (points[..., 1] - a[..., 1])
+        - (b[..., 1] - a[..., 1]) * (points[..., 0] - a[..., 0])
+    )
+
+
+def _distances(points, a, b):
+    """
+    Distances from points to the segments a to b, broadcasting over leading axes
+    """
+    direction = b - a
+    length = (direction ** 2).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((points - a) * direction).sum(axis=-1) / length
+    t = np.clip(np.nan_to_num(t), 0, 1)
+    return np.hypot(*np.moveaxis(points - a - t[..., None] * direction, -1, 0))
+
+
+def _classify(corners, starts, ends, curved, tolerance):
+    """
+    Test cells against a region
+
+    Cells only touching the boundary of the region (along an edge or at a
+    vertex) are inside or outside rather than partial, so cells sharing an
+    edge with a bounding box aren't split all the way down. That doesn't
+    hold for curved edges, which are only followed to within the tolerance:
+    any cell that close to one is partial.
+
+    Parameters
+    ----------
+    corners : numpy.ndarray
+        Cell corners of shape (N, 3, 2)
+    starts, ends : numpy.ndarray
+        Edges of the region's rings, each of shape (M, 2)
+    curved : numpy.ndarray
+        Boolean array of shape (M, ) of the edges approximating curves
+    tolerance : float
+
+    Returns
+    -------
+    outcomes : numpy.ndarray
+        ``_OUTSIDE``, ``_PARTIAL`` or ``_INSIDE`` for each cell
+    """
+    a = corners[:, :, None]
+    b = np.roll(corners, -1, axis=1)[:, :, None]
+
+    # edges of the cells properly crossing edges of the region
+    d1 = _orientation(starts, ends, a)
+    d2 = _orientation(starts, ends, b)
+    d3 = _orientation(a, b, starts)
+    d4 = _orientation(a, b, ends)
+    crossing = ((d1 * d2 < 0) & (d3 * d4 < 0)).any(axis=(1, 2))
+
+    # ends or middles of the region's edges strictly inside the cells, as an
+    # edge can also run between two points on the boundary of a cell
+    sides = np.concatenate([d3, _orientation(a, b, (starts + ends) / 2)], axis=-1)
+    contains = ((sides > 0).all(axis=1) | (sides < 0).all(axis=1)).any(axis=1)
+
+    # cells close enough to a curved edge that the true curve may cross them
+    if curved.any():
+        curved_starts = starts[curved]
+        curved_ends = ends[curved]
+        close = np.minimum(
+            np.minimum(_distances(a, curved_starts, curved_ends),
+                       _distances(curved_starts, a, b)),
+            _distances(curved_ends, a, b)
+        ) <= tolerance
+        contains |= close.any(axis=(1, 2))
+
+    # otherwise the cell is inside the region if its centre is
+    centres = corners.mean(axis=1)
+    x = centres[:, None, 0]
+    y = centres[:, None, 1]
+    straddles = (starts[:, 1] > y) != (ends[:, 1] > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        at = starts[:, 0] + (ends[:, 0] - starts[:, 0]) * \
+            (y - starts[:, 1]) / (ends[:, 1] - starts[:, 1])
+    inside = np.count_nonzero(straddles & (x < at), axis=1) % 2 == 1
+
+    return np.where(
+        crossing | contains, _PARTIAL, np.where(inside, _INSIDE, _OUTSIDE))
+
+
+def _classify_hashes(numeric_hashes, precision, edges, tolerance):
+    """
+    ``_classify`` for the cells of each octant
+
+    The cells are taken in bands of similar y, each only tested against the
+    region edges overlapping the band (which are all the ray from the centre
+    of a cell can cross).
+
+    Parameters
+    ----------
+    numeric_hashes : numpy.ndarray
+    precision : int
+    edges : list of tuple of numpy.ndarray
+        Region edges in the frame of each octant, from ``_octant_edges``
+    tolerance : float
+        Tolerance the curved edges were broken up to
+
+    Returns
+    -------
+    outcomes : numpy.ndarray
+    """
+    outcomes = np.empty(len(numeric_hashes), dtype=np.intp)
+    octants = numeric_hashes & np.uint64(7)
+
+    for octant, (starts, ends, curved) in enumerate(edges):
+        index = np.flatnonzero(octants == octant)
+        corners = _cell_corners(numeric_hashes[index], precision)
+        order = np.argsort(corners[:, :, 1].min(axis=1))
+        bottoms = np.minimum(starts[:, 1], ends[:, 1])
+        tops = np.maximum(starts[:, 1], ends[:, 1])
+
+        for i in range(0, len(order), _BAND):
+            band = order[i:i + _BAND]
+            y = corners[band, :, 1]
+            near = (bottoms <= y.max() + tolerance) & (tops >= y.min() - tolerance)
+            band_starts = starts[near]
+            band_ends = ends[near]
+            band_curved = curved[near]
+
+            # bounding memory use where there are still a lot of edges
+            step = max(1, _CHUNK // (3 * max(1, len(band_starts))))
+            for j in range(0, len(band), step):
+                chunk = band[j:j + step]
+                outcomes[index[chunk]] = _classify(
+                    corners[chunk], band_starts, band_ends, band_curved, tolerance)
+
+    return outcomes
+
+
+def cover(geometry, max_precision=25, max_cells=None):
+    """
+    Cells covering a region, at mixed precisions
+
+    Starting from the octants, cells crossing the boundary of the region are
+    split into their children a level at a time, down to ``max_precision``.
+    Cells entirely inside the region are kept as they are.
+
+    Parameters
+    ----------
+    geometry : object
+        A Polygon or MultiPolygon as anything with a ``__geo_interface__``, a
+        GeoJSON mapping (optionally a Feature) or ``(west, south, east,
+        north)`` bounds
+    max_precision : int
+        Finest precision of the cells
+    max_cells : int
+        Stop splitting cells before the cover would have more than this many
+        (the octants the region touches are always returned). Unlimited by
+        default.
+
+    Returns
+    -------
+    cells : list of tuple of int
+        ``(numeric_hash, precision)`` for each cell, in order of precision
+        then hash. Every location in a cell has a hash starting with the
+        cell's readable hash, so each can be used as a prefix (or range)
+        query.
+    """
+    levels = _level_count(max_precision)
+    rings = _rings(geometry)
+    if not rings:
+        return []
+
+    # a small fraction of the finest cells
+    tolerance = math.ldexp(1, -levels - 4)
+    edges = [_octant_edges(rings, octant, tolerance) for octant in range(8)]
+
+    precision = 3
+    frontier = np.arange(8, dtype=np.uint64)
+    outcomes = _classify_hashes(frontier, precision, edges, tolerance)
+    found = [(precision, frontier[outcomes == _INSIDE])]
+    frontier = frontier[outcomes == _PARTIAL]
+    count = len(found[0][1]) + len(frontier)
+
+    while len(frontier) and precision + 2 <= max_precision:
+        candidates = children_array(frontier, precision).ravel()
+        outcomes = _classify_hashes(candidates, precision + 2, edges, tolerance)
+
+        inside = candidates[outcomes == _INSIDE]
+        partial = candidates[outcomes == _PARTIAL]
+        total = count - len(frontier) + len(inside) + len(partial)
+        if max_cells is not None and total > max_cells:
+            break
+
+        precision += 2
+        found.append((precision, inside))
+        frontier = partial
+        count = total
+
+    found.append((precision, frontier))
+
+    return [
+        (numeric_hash, cell_precision)
+        for cell_precision, numeric_hashes in found
+        for numeric_hash in sorted(numeric_hashes.tolist())
+    ]
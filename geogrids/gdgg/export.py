@@ -0,0 +1,173 @@
+"""
+Bulk export of cell geometries
+
+Both exports work out the vertices of a batch of cells at a time with
+``numeric_hash_to_area_array`` rather than building ``Location`` objects for
+each cell. ``cells_to_geojson`` writes a GeoJSON FeatureCollection to a text
+stream as it goes, so it never holds more than one batch::
+
+    >>> with open('cells.geojson', 'w') as stream:
+    ...     geogrids.gdgg.cells_to_geojson(numeric_hashes, 25, stream)
+
+``cells_to_geoarrow`` returns the coordinate and offset buffers of the
+GeoArrow polygon layout, ready to be wrapped in Arrow arrays.
+
+Rings are closed and counter-clockwise, as recommended by RFC 7946. Cells
+touching a pole are squares as in ``numeric_hash_to_area``.
+"""
+import io
+
+import numpy as np
+
+from .arrays import _batches, numeric_hash_to_area_array, numeric_hash_to_readable_hash_array
+
+
+_FEATURE = (
+    '{"type": "Feature", "id": %d, '
+    '"properties": {"numeric_hash": %d, "readable_hash": "%s"}, '
+    '"geometry": {"type": "Polygon", "coordinates": [[%s]]}}'
+)
+
+
+def _rings(numeric_hashes, precision):
+    """
+    Closed counter-clockwise rings of a batch of cells
+
+    Parameters
+    ----------
+    numeric_hashes : numpy.ndarray
+    precision : int
+
+    Returns
+    -------
+    triangles : numpy.ndarray
+        Indexes of the cells which are triangles
+    triangle_rings : numpy.ndarray
+        Array of shape (N, 4, 2) of their longitudes and latitudes
+    squares : numpy.ndarray
+        Indexes of the cells touching a pole
+    square_rings : numpy.ndarray
+        Array of shape (N, 5, 2) of their longitudes and latitudes
+    """
+    vertices, poles = numeric_hash_to_area_array(numeric_hashes, precision)
+    vertices = vertices[:, :, ::-1]  # longitude, latitude
+
+    triangles = np.flatnonzero(~poles)
+    squares = np.flatnonzero(poles)
+
+    corners = vertices[squares]
+    middle = np.stack([corners[:, 0, 0], corners[:, 2, 0]], axis=1)
+    square_vertices = np.empty((len(squares), 4, 2))
+    square_vertices[:, 0] = corners[:, 0]
+    square_vertices[:, 1:3, 0] = middle
+    square_vertices[:, 1:3, 1] = corners[:, 1, 1:2]
+    square_vertices[:, 3] = corners[:, 2]
+
+    return (
+        triangles, _closed(vertices[triangles]),
+        squares, _closed(square_vertices)
+    )
+
+
+def _closed(vertices):
+    """
+    Turn unclosed rings counter-clockwise and repeat their first vertex
+    """
+    x, y = vertices[:, :, 0], vertices[:, :, 1]
+    twice_area = (x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y).sum(axis=1)
+    clockwise = twice_area < 0
+    vertices[clockwise, 1:] = vertices[clockwise, :0:-1]
+
+    return np.concatenate([vertices, vertices[:, :1]], axis=1)
+
+
+def cells_to_geojson(numeric_hashes, precision=25, stream=None, batch_size=65536):
+    """
+    Write cells as a GeoJSON FeatureCollection of polygons
+
+    Each feature has the numeric hash as its ``id`` and the numeric and
+    readable hashes as properties.
+
+    Parameters
+    ----------
+    numeric_hashes : iterable of int
+        Array or any iterable (including generators) of numeric hashes
+    precision : int
+    stream : io.TextIOBase
+        Text stream to write to. If None the GeoJSON is returned as a string.
+    batch_size : int
+        Number of cells to work out at a time
+
+    Returns
+    -------
+    str or None
+        The GeoJSON when no stream is given
+    """
+    output = io.StringIO() if stream is None else stream
+
+    output.write('{"type": "FeatureCollection", "features": [')
+    separator = '\n'
+    for batch in _batches(numeric_hashes, batch_size):
+        readable_hashes = numeric_hash_to_readable_hash_array(batch, precision)
+        triangles, triangle_rings, squares, square_rings = _rings(batch, precision)
+
+        features = [None] * len(batch)
+        for indexes, rings, vertex_count in (
+                (triangles, triangle_rings, 4), (squares, square_rings, 5)):
+            coordinates = ','.join(['[%r,%r]'] * vertex_count)
+            for index, numeric_hash, readable_hash, ring in zip(
+                    indexes.tolist(), batch[indexes].tolist(),
+                    readable_hashes[indexes].tolist(),
+                    rings.reshape(len(indexes), 2 * vertex_count).tolist()):
+                features[index] = _FEATURE % (
+                    numeric_hash, numeric_hash, readable_hash,
+                    coordinates % tuple(ring))
+
+        output.write(separator)
+        output.write(',\n'.join(features))
+        separator = ',\n'
+    output.write('\n]}\n')
+
+    if stream is None:
+        return output.getvalue()
+
+
+def cells_to_geoarrow(numeric_hashes, precision=25):
+    """
+    Cells as the buffers of a GeoArrow polygon array
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+
+    Returns
+    -------
+    coordinates : numpy.ndarray
+        Interleaved longitude, latitude of every vertex of every ring, as
+        float64. ``coordinates.reshape(-1, 2)`` gives the pairs.
+    ring_offsets : numpy.ndarray
+        Index of the first vertex of each ring in the pairs of coordinates,
+        plus the total number of vertices
+    geometry_offsets : numpy.ndarray
+        Index of the first ring of each polygon, plus the total number of
+        rings. Every polygon has a single ring.
+    """
+    numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64).ravel()
+    triangles, triangle_rings, squares, square_rings = _rings(numeric_hashes, precision)
+
+    counts = np.full(len(numeric_hashes), 4, dtype=np.int64)
+    counts[squares] = 5
+    ring_offsets = np.zeros(len(numeric_hashes) + 1, dtype=np.int64)
+    np.cumsum(counts, out=ring_offsets[1:])
+
+    pairs = np.empty((ring_offsets[-1], 2))
+    for indexes, rings in ((triangles, triangle_rings), (squares, square_rings)):
+        positions = ring_offsets[indexes, np.newaxis] + np.arange(rings.shape[1])
+        pairs[positions] = rings
+
+    # Arrow lists use 32 bit offsets unless they'd overflow
+    offset_type = np.int32 if ring_offsets[-1] < 2 ** 31 else np.int64
+    geometry_offsets = np.arange(len(numeric_hashes) + 1, dtype=offset_type)
+
+    return pairs.ravel(), ring_offsets.astype(offset_type), geometry_offsets
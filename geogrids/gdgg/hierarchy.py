@@ -0,0 +1,151 @@
+"""
+Moving numeric hashes between precisions
+
+The levels of a numeric hash are packed coarsest first above the octant, so
+the hash of a cell at a coarser precision is just its lower bits, and the
+hashes of its children add one more level on top. None of these functions
+decode the hashes to coordinates.
+"""
+import numpy as np
+
+from .arrays import _level_count
+
+
+def _coarser(precision, to_precision):
+    """
+    Levels at to_precision, checking it's no finer than precision
+    """
+    if to_precision is None:
+        to_precision = precision - 2
+    levels = _level_count(to_precision)
+    if to_precision < 3 or levels > _level_count(precision):
+        raise ValueError(
+            f'Precision {to_precision} is not coarser than {precision}')
+    return levels
+
+
+def parent(numeric_hash, precision=25, to_precision=None):
+    """
+    Hash of the cell containing a cell at a coarser precision
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+    to_precision : int
+        Precision of the parent, defaults to one level up (``precision - 2``)
+
+    Returns
+    -------
+    numeric_hash : int
+    """
+    levels = _coarser(precision, to_precision)
+    return numeric_hash & ((1 << 3 + 2 * levels) - 1)
+
+
+def children(numeric_hash, precision=25):
+    """
+    Hashes of the four cells one level finer than a cell
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    numeric_hashes : list of int
+        Hashes of the children at ``precision + 2``, with the central
+        (inverted) child first followed by the top, bottom left and bottom
+        right children
+    """
+    # checking the children still fit in 64 bits
+    shift = 3 + 2 * (_level_count(precision + 2) - 1)
+    numeric_hash &= (1 << shift) - 1
+    return [numeric_hash | digit << shift for digit in range(4)]
+
+
+def to_precision(numeric_hash, precision, to_precision):
+    """
+    Convert a hash to another precision
+
+    Going to a coarser precision gives the parent cell. Going to a finer
+    precision fills the new levels with the central child each time, giving a
+    cell inside the original one, so converting back gives the original hash.
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+    to_precision : int
+
+    Returns
+    -------
+    numeric_hash : int
+    """
+    levels = min(_level_count(precision), _level_count(to_precision))
+    return numeric_hash & ((1 << 3 + 2 * levels) - 1)
+
+
+def parent_array(numeric_hashes, precision=25, to_precision=None):
+    """
+    Vectorised version of ``parent``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+    to_precision : int
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+        uint64 array of parent hashes
+    """
+    _level_count(precision)
+    levels = _coarser(precision, to_precision)
+    return np.asarray(numeric_hashes, dtype=np.uint64) & \
+        np.uint64((1 << 3 + 2 * levels) - 1)
+
+
+def children_array(numeric_hashes, precision=25):
+    """
+    Vectorised version of ``children``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+        uint64 array of shape (N, 4) of the children of each hash, in the same
+        order as ``children``
+    """
+    # checking the children still fit in 64 bits
+    shift = 3 + 2 * (_level_count(precision + 2) - 1)
+    numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64).ravel() & \
+        np.uint64((1 << shift) - 1)
+    digits = np.arange(4, dtype=np.uint64) << np.uint64(shift)
+    return numeric_hashes[:, None] | digits
+
+
+def to_precision_array(numeric_hashes, precision, to_precision):
+    """
+    Vectorised version of ``to_precision``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+    to_precision : int
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+        uint64 array of hashes at the new precision
+    """
+    levels = min(_level_count(precision), _level_count(to_precision))
+    return np.asarray(numeric_hashes, dtype=np.uint64) & \
+        np.uint64((1 << 3 + 2 * levels) - 1)
@@ -0,0 +1,307 @@
+"""
+Neighbours of OQTM cells worked out from their numeric hashes
+
+Every cell is a triangle with the same local frame as its octant: a vertex at
+the origin ``V0``, one along x ``Vx`` and one along y ``Vy``, joined by the
+left edge ``L`` (x = 0, from V0 to Vy), the bottom edge ``B`` (y = 0, from V0
+to Vx) and the hypotenuse ``H`` (x + y = 1, from Vy to Vx).
+
+Each edge of a triangle is split between two of its corner children, which
+share the edge's name and direction, while the centre child (level 0) borders
+one corner child across each of its edges with the direction reversed. So
+stepping across an edge only has to find the deepest level where the cell
+isn't on that edge of its parent, swap it for the child on the other side, and
+mirror the levels below it along the edge. Cells on the edge of an octant step
+over the seam into the next octant instead: west and east across the
+meridians (where one octant's L meets the other's H) or north and south across
+the equator.
+
+Cells sharing only a vertex are found by stepping around each vertex from one
+of its edges to the other.
+"""
+import numpy as np
+
+from .arrays import _level_count
+
+
+# edges and vertices of a triangle in its local frame
+_L, _B, _H = range(3)
+_V0, _VX, _VY = range(3)
+
+# ends of each edge, in the direction of the edge
+_EDGE_VERTICES = ((_V0, _VY), (_V0, _VX), (_VY, _VX))
+
+# the two edges meeting at each vertex, in the order they are stepped across
+# when walking around the vertex
+_VERTEX_EDGES = ((_L, _B), (_B, _H), (_H, _L))
+
+# children along the first and second half of each edge
+_HALVES = ((2, 1), (2, 3), (1, 3))
+
+# child bordering the centre child across each edge
+_INTERNAL = (3, 1, 2)
+
+# edge reached on the neighbouring octant across each edge, and whether the
+# direction is reversed
+_SEAM_EDGES = ((_H, True), (_B, False), (_L, True))
+
+# neighbouring octant across each edge of each octant
+_SEAM_OCTANTS = (
+    tuple((octant & 4) | ((octant - 1) & 3) for octant in range(8)),
+    tuple(octant ^ 4 for octant in range(8)),
+    tuple((octant & 4) | ((octant + 1) & 3) for octant in range(8)),
+)
+
+# level digits moved to the neighbouring octant across each edge
+_SEAM_DIGITS = tuple(
+    tuple(
+        _HALVES[_SEAM_EDGES[edge][0]][
+            _HALVES[edge].index(digit) ^ _SEAM_EDGES[edge][1]]
+        if digit in _HALVES[edge] else 0
+        for digit in range(4)
+    )
+    for edge in range(3)
+)
+
+
+def _cross(numeric_hash, depth, edge):
+    """
+    Step across an edge of a cell to its neighbour
+
+    Parameters
+    ----------
+    numeric_hash : int
+    depth : int
+        Number of levels in the hash
+    edge : int
+        Edge of the cell to step across
+
+    Returns
+    -------
+    numeric_hash : int
+        Hash of the neighbouring cell
+    edge : int
+        The same edge in the neighbouring cell's frame
+    reversed : bool
+        Whether the edge runs in the opposite direction in the neighbour
+    """
+    halves = _HALVES[edge]
+
+    for level in reversed(range(depth)):
+        shift = 3 + 2 * level
+        if (numeric_hash >> shift) & 3 not in halves:
+            # swap between the centre and the child across the edge, then
+            # mirror the deeper levels along the edge
+            flip = _INTERNAL[edge] << shift
+            swap = halves[0] ^ halves[1]
+            for shift in range(shift + 2, 3 + 2 * depth, 2):
+                flip |= swap << shift
+            return numeric_hash ^ flip, edge, True
+
+    # on the edge of the octant
+    new_edge, reverse = _SEAM_EDGES[edge]
+    digits = _SEAM_DIGITS[edge]
+    neighbour = _SEAM_OCTANTS[edge][numeric_hash & 7]
+    for shift in range(3, 3 + 2 * depth, 2):
+        neighbour |= digits[(numeric_hash >> shift) & 3] << shift
+
+    return neighbour, new_edge, reverse
+
+
+def _step(vertex, edge, new_edge, reverse):
+    """
+    Follow a vertex across an edge, returning it and the next edge to cross
+    """
+    index = _EDGE_VERTICES[edge].index(vertex)
+    vertex = _EDGE_VERTICES[new_edge][index ^ reverse]
+    first, second = _VERTEX_EDGES[vertex]
+    return vertex, second if first == new_edge else first
+
+
+def _vertex_ring(numeric_hash, depth, vertex):
+    """
+    Cells around a vertex of a cell, starting and ending with the cells across
+    the edges meeting at the vertex
+    """
+    ring = []
+    cell = numeric_hash
+    edge = _VERTEX_EDGES[vertex][0]
+
+    # six triangles meet at most vertices, four at the corners of the octants
+    for _ in range(6):
+        cell, new_edge, reverse = _cross(cell, depth, edge)
+        if cell == numeric_hash:
+            break
+        ring.append(cell)
+        vertex, edge = _step(vertex, edge, new_edge, reverse)
+
+    return ring
+
+
+def edge_neighbors(numeric_hash, precision=25):
+    """
+    Numeric hashes of the three cells sharing an edge with a cell
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    neighbors : list of int
+        Hashes of the cells across the left (x = 0), bottom (y = 0) and
+        hypotenuse edges of the cell, at the same precision
+    """
+    depth = len(range(3, precision, 2))
+    numeric_hash &= (1 << 3 + 2 * depth) - 1
+
+    return [_cross(numeric_hash, depth, edge)[0] for edge in (_L, _B, _H)]
+
+
+def neighbors(numeric_hash, precision=25):
+    """
+    Numeric hashes of the cells sharing an edge or a vertex with a cell
+
+    Works from the octant and levels of the hash, without decoding it to
+    coordinates.
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    neighbors : list of int
+        Hashes of the three cells sharing an edge (as for
+        ``edge_neighbors``) followed by the cells sharing only a vertex,
+        walking around V0, Vx then Vy. Most cells have nine of these, but
+        only seven where a vertex sits on the corner of an octant (where four
+        triangles meet rather than six).
+    """
+    depth = len(range(3, precision, 2))
+    numeric_hash &= (1 << 3 + 2 * depth) - 1
+
+    found = [_cross(numeric_hash, depth, edge)[0] for edge in (_L, _B, _H)]
+    for vertex in (_V0, _VX, _VY):
+        for cell in _vertex_ring(numeric_hash, depth, vertex)[1:-1]:
+            if cell not in found:
+                found.append(cell)
+
+    return found
+
+
+# array versions of the tables
+_EDGE_VERTICES_ARRAY = np.array(_EDGE_VERTICES)
+_EDGE_VERTEX_INDEX_ARRAY = np.array([
+    [ends.index(vertex) if vertex in ends else 0 for vertex in range(3)]
+    for ends in _EDGE_VERTICES
+])
+_OTHER_EDGE_ARRAY = np.array([
+    [second if edge == first else first for edge in range(3)]
+    for first, second in _VERTEX_EDGES
+])
+_HALVES_ARRAY = np.array(_HALVES, dtype=np.uint64)
+_SWAPS_ARRAY = _HALVES_ARRAY[:, 0] ^ _HALVES_ARRAY[:, 1]
+_INTERNAL_ARRAY = np.array(_INTERNAL, dtype=np.uint64)
+_SEAM_EDGES_ARRAY = np.array([edge for edge, _ in _SEAM_EDGES])
+_SEAM_REVERSE_ARRAY = np.array([reverse for _, reverse in _SEAM_EDGES])
+_SEAM_OCTANTS_ARRAY = np.array(_SEAM_OCTANTS, dtype=np.uint64)
+_SEAM_DIGITS_ARRAY = np.array(_SEAM_DIGITS, dtype=np.uint64)
+
+
+def _cross_array(numeric_hashes, depth, edges):
+    """
+    Vectorised version of ``_cross``, with an edge to cross for each hash
+    """
+    shifts = (3 + 2 * np.arange(depth)).astype(np.uint64)
+    digits = (numeric_hashes[:, None] >> shifts) & np.uint64(3)
+
+    halves = _HALVES_ARRAY[edges]
+    inside = (digits != halves[:, :1]) & (digits != halves[:, 1:])
+    internal = inside.any(axis=1)
+
+    # deepest level that isn't on the edge
+    if depth:
+        deepest = depth - 1 - np.argmax(inside[:, ::-1], axis=1)
+    else:
+        deepest = np.zeros(len(numeric_hashes), dtype=np.intp)
+    levels = np.arange(depth)
+    flips = np.where(
+        levels == deepest[:, None],
+        _INTERNAL_ARRAY[edges][:, None],
+        np.where(levels > deepest[:, None], _SWAPS_ARRAY[edges][:, None], 0)
+    ).astype(np.uint64)
+    crossed = numeric_hashes ^ np.bitwise_or.reduce(
+        flips << shifts, axis=1, dtype=np.uint64)
+
+    seam_digits = _SEAM_DIGITS_ARRAY[edges[:, None], digits.astype(np.intp)]
+    seamed = _SEAM_OCTANTS_ARRAY[edges, (numeric_hashes & np.uint64(7)).astype(np.intp)]
+    seamed |= np.bitwise_or.reduce(seam_digits << shifts, axis=1, dtype=np.uint64)
+
+    return (
+        np.where(internal, crossed, seamed),
+        np.where(internal, edges, _SEAM_EDGES_ARRAY[edges]),
+        np.where(internal, True, _SEAM_REVERSE_ARRAY[edges])
+    )
+
+
+def neighbors_array(numeric_hashes, precision=25):
+    """
+    Vectorised version of ``neighbors``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+
+    Returns
+    -------
+    edges : numpy.ndarray
+        uint64 array of shape (N, 3) with the cells across the left, bottom
+        and hypotenuse edges of each cell
+    vertices : numpy.ndarray
+        uint64 array of shape (N, 9) with the cells sharing only a vertex,
+        three for each of V0, Vx and Vy in the order ``neighbors`` walks them.
+        Where a vertex is on the corner of an octant only its first slot is
+        used, the rest are zero.
+    mask : numpy.ndarray
+        Boolean array of shape (N, 9) which is true for the used slots of
+        ``vertices``
+    """
+    depth = _level_count(precision)
+    numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64).ravel()
+    numeric_hashes = numeric_hashes & np.uint64((1 << 3 + 2 * depth) - 1)
+    count = len(numeric_hashes)
+
+    edges = np.empty((count, 3), dtype=np.uint64)
+    for edge in (_L, _B, _H):
+        edges[:, edge] = _cross_array(
+            numeric_hashes, depth, np.full(count, edge))[0]
+
+    vertices = np.zeros((count, 9), dtype=np.uint64)
+    mask = np.zeros((count, 9), dtype=bool)
+
+    for vertex in (_V0, _VX, _VY):
+        first, last = _VERTEX_EDGES[vertex]
+        cells = numeric_hashes
+        crossing = np.full(count, first)
+        at = np.full(count, vertex)
+        active = np.ones(count, dtype=bool)
+
+        # the first step reaches the cell across the first edge, then there
+        # are up to three cells before the one across the last edge
+        for step in range(4):
+            cells, new_edges, reverse = _cross_array(cells, depth, crossing)
+            index = _EDGE_VERTEX_INDEX_ARRAY[crossing, at]
+            at = _EDGE_VERTICES_ARRAY[new_edges, index ^ reverse]
+            crossing = _OTHER_EDGE_ARRAY[at, new_edges]
+
+            if step:
+                active &= cells != edges[:, last]
+                slot = 3 * vertex + step - 1
+                vertices[:, slot] = np.where(active, cells, 0)
+                mask[:, slot] = active
+
+    return edges, vertices, mask
@@ -4,10 +4,399 @@ Simplistic Octohedral Quaternary Triangle Mesh
 Translated from the GeoGrids library on NPM written by Iván Sánchez Ortega
 """
 import math
+from collections.abc import Sequence
 
 
 HASH_PRECISIONS = list(range(3, 60, 2))
 
+# longitude offsets for octants (modulo 4) when back-computing lat-lng
+_OCTANT_OFFSETS = (-180.0, -90.0, 0.0, 90.0)
+
+# optional lookup table for the first levels of a hash, see coarse.py
+_coarse_table = None
+
+# fixed point x, y: 60 fractional bits keep the exact remainder for every
+# level up to precision 59, and doubling never overflows a signed 64-bit int
+_FIXED_BITS = 60
+_FIXED_ONE = 1 << _FIXED_BITS
+_FIXED_HALF = _FIXED_ONE >> 1
+
+# readable digits for every byte of packed levels, least significant first
+_BYTE_DIGITS = tuple(
+    ''.join(str((byte >> shift) & 3) for shift in range(0, 8, 2))
+    for byte in range(256)
+)
+
+
+# integer hashing engine
+#
+# Numeric hashes pack the octant into the lowest three bits with each level
+# as two bits above it, coarsest first. These functions build and read that
+# integer directly rather than going through the levels of a Location.
+
+
+def _lat_lng_to_octant(latitude, longitude):
+    """
+    Given latitude and longitude compute octant and first x, y
+
+    Parameters
+    ----------
+    latitude : float
+    longitude : float
+
+    Returns
+    -------
+    octant : int
+    x : float
+    y : float
+    """
+    if latitude > 0:
+        if longitude < -90:
+            octant = 0
+        elif longitude < 0:
+            octant = 1
+        elif longitude < 90:
+            octant = 2
+        else:
+            octant = 3
+    else:
+        if longitude < -90:
+            octant = 4
+        elif longitude < 0:
+            octant = 5
+        elif longitude < 90:
+            octant = 6
+        else:
+            octant = 7
+
+    y = abs(latitude) / 90
+    x = ((longitude + 180) % 90) / 90
+    x *= (1 - y)
+
+    return octant, x, y
+
+
+def _subdivide(acc, x, y, precision, start=3):
+    """
+    Compute the levels for remainder x, y into the numeric hash accumulator
+
+    Parameters
+    ----------
+    acc : int
+        Numeric hash computed so far
+    x : float
+    y : float
+    precision : int
+    start : int
+        Bit position of the first level to compute
+
+    Returns
+    -------
+    acc : int
+        Numeric hash with the levels up to ``precision``
+    x : float
+    y : float
+        The remainder coordinates in the deepest level
+    """
+    for shift in range(start, precision, 2):
+        if y > 0.5:
+            acc |= 1 << shift
+            x *= 2
+            y = (y - 0.5) * 2
+        elif y < 0.5 - x:
+            acc |= 2 << shift
+            x *= 2
+            y *= 2
+        elif x >= 0.5:
+            acc |= 3 << shift
+            x = (x - 0.5) * 2
+            y *= 2
+        else:
+            # inverse triangle, level 0 so nothing to add
+            x = 1 - x * 2
+            y = 1 - y * 2
+
+    return acc, x, y
+
+
+def _to_fixed(value):
+    """
+    Quantize a coordinate in [0, 1] to a fixed point integer
+
+    Multiplying by a power of two is exact, so this only drops the bits
+    below 2 ** -60 (rounding towards zero).
+    """
+    return int(value * _FIXED_ONE)
+
+
+def _subdivide_fixed(acc, x, y, precision, start=3):
+    """
+    Fixed point version of ``_subdivide``
+
+    With x and y as integer multiples of 2 ** -60 every step is exact, so the
+    levels are the same on any platform.
+
+    Parameters
+    ----------
+    acc : int
+        Numeric hash computed so far
+    x : int
+    y : int
+        Fixed point remainder coordinates, see ``_to_fixed``
+    precision : int
+    start : int
+        Bit position of the first level to compute
+
+    Returns
+    -------
+    acc : int
+        Numeric hash with the levels up to ``precision``
+    x : int
+    y : int
+        The fixed point remainder coordinates in the deepest level
+    """
+    half = _FIXED_HALF
+    for shift in range(start, precision, 2):
+        if y > half:
+            acc |= 1 << shift
+            x <<= 1
+            y = (y - half) << 1
+        elif y < half - x:
+            acc |= 2 << shift
+            x <<= 1
+            y <<= 1
+        elif x >= half:
+            acc |= 3 << shift
+            x = (x - half) << 1
+            y <<= 1
+        else:
+            # inverse triangle, level 0 so nothing to add
+            x = _FIXED_ONE - (x << 1)
+            y = _FIXED_ONE - (y << 1)
+
+    return acc, x, y
+
+
+def _lat_lng_to_hash(latitude, longitude, precision, fixed_point=False):
+    """
+    Given latitude, longitude and precision compute the numeric hash
+
+    Parameters
+    ----------
+    latitude : float
+    longitude : float
+    precision : int
+    fixed_point : bool
+        Subdivide fixed point x, y rather than floats
+
+    Returns
+    -------
+    numeric_hash : int
+    x : float or int
+    y : float or int
+        The remainder coordinates in the deepest level, fixed point integers
+        with ``fixed_point``
+    """
+    octant, x, y = _lat_lng_to_octant(latitude, longitude)
+
+    if fixed_point:
+        return _subdivide_fixed(octant, _to_fixed(x), _to_fixed(y), precision)
+
+    table = _coarse_table
+    if table is not None and precision > table.start - 2:
+        found = table.lookup(x, y)
+        if found is not None:
+            levels, x, y = found
+            return _subdivide(octant | levels, x, y, precision, start=table.start)
+
+    return _subdivide(octant, x, y, precision)
+
+
+def _hash_to_lat_lng(numeric_hash, precision, x=0.3, y=0.3):
+    """
+    Given a numeric hash and remainder x, y compute its lat-lng
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+    x : float
+    y : float
+
+    Returns
+    -------
+    latitude : float
+    longitude : float
+    """
+    for shift in reversed(range(3, precision, 2)):
+        level = (numeric_hash >> shift) & 3
+        if level == 1:
+            x /= 2
+            y = y/2 + 0.5
+        elif level == 2:
+            x /= 2
+            y /= 2
+        elif level == 3:
+            x = x/2 + 0.5
+            y /= 2
+        else:
+            x = (1 - x) / 2
+            y = (1 - y) / 2
+
+    x /= 1 - y
+    x *= 90
+    y *= 90
+
+    octant = numeric_hash & 7
+    x += _OCTANT_OFFSETS[octant & 3]
+    if octant > 3:
+        y = -y
+
+    return y, x
+
+
+def _hash_to_readable(numeric_hash, precision):
+    """
+    Given a numeric hash return its human-readable hash
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    readable_hash : str
+    """
+    count = len(range(3, precision, 2))
+    levels = (numeric_hash >> 3) & ((1 << 2 * count) - 1)
+    digits = ''.join(
+        map(_BYTE_DIGITS.__getitem__, levels.to_bytes((count + 3) // 4, 'little'))
+    )
+    return str(numeric_hash & 7) + digits[:count]
+
+
+def _readable_to_hash(readable_hash):
+    """
+    Given a human-readable hash return its numeric hash and precision
+
+    Parameters
+    ----------
+    readable_hash : str
+
+    Returns
+    -------
+    numeric_hash : int
+    precision : int
+    """
+    octant = int(readable_hash[0])
+    levels = readable_hash[:0:-1]
+    numeric_hash = int(levels, 4) << 3 | octant if levels else octant
+
+    return numeric_hash, 3 + 2 * len(levels)
+
+
+class Levels(Sequence):
+    """Read-only view of the levels packed in a numeric hash
+
+    Levels are decoded from the packed integer as they are accessed rather than
+    being stored as a list.
+    """
+
+    __slots__ = ('_packed', '_depth')
+
+    def __init__(self, packed: int=0, depth: int=0):
+        """
+
+        Parameters
+        ----------
+        packed : int
+            Levels packed as two bits each, coarsest level in the lowest bits
+            (i.e. a numeric hash without the octant)
+        depth : int
+            Number of levels
+        """
+        self._packed = packed
+        self._depth = depth
+
+    def __len__(self):
+        return self._depth
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._depth))]
+        if index < 0:
+            index += self._depth
+        if not 0 <= index < self._depth:
+            raise IndexError('level index out of range')
+        return (self._packed >> (2 * index)) & 3
+
+    def __iter__(self):
+        packed = self._packed
+        for i in range(self._depth):
+            yield packed & 3
+            packed >>= 2
+
+    def __reversed__(self):
+        for shift in reversed(range(0, 2 * self._depth, 2)):
+            yield (self._packed >> shift) & 3
+
+    def __eq__(self, other):
+        if isinstance(other, Levels):
+            return (self._packed, self._depth) == (other._packed, other._depth)
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _hash_to_levels(numeric_hash, precision):
+    """
+    View of the levels in a numeric hash up to a precision
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    Levels
+    """
+    depth = len(range(3, precision, 2))
+    return Levels((numeric_hash >> 3) & ((1 << 2 * depth) - 1), depth)
+
+
+def _levels_to_hash(octant, levels):
+    """
+    Pack an octant and levels into a numeric hash
+
+    Parameters
+    ----------
+    octant : int
+    levels : sequence of int
+
+    Returns
+    -------
+    numeric_hash : int
+    depth : int
+        Number of levels
+    """
+    if isinstance(levels, Levels):
+        return octant | levels._packed << 3, levels._depth
+
+    numeric_hash = octant
+    shift = 3
+    for level in levels:
+        numeric_hash |= level << shift
+        shift += 2
+
+    return numeric_hash, (shift - 3) // 2
+
 
 class Location():
     """Representation of an XY location at levels
@@ -16,6 +405,9 @@ class Location():
     latitude and longitude or an x , y coordinate with an octant on
     creation to automatically generate the other values.
 
+    The octant and levels are stored packed together as the numeric hash,
+    along with the number of levels.
+
     Attributes
     ----------
     latitude : float
@@ -24,8 +416,9 @@ class Location():
         Longitudw coordinate of the location. Decimal degrees [-180, 180]
     octant : int
         [0, 8]
-    levels : list of int
-        ID in each level. [0, 3]
+    levels : Levels
+        Read-only sequence of the ID in each level. [0, 3]. Assigning a list of
+        int replaces the levels.
     x : float
         The remainder x-coordinate (longitude) in the deepest computed level
         (0, 1). Both x and y will be clamped to 0<x<1, 0<y<1, 0<(x+y)<1.
@@ -34,7 +427,10 @@ class Location():
         (0, 1). Both x and y will be clamped to 0<x<1, 0<y<1, 0<(x+y)<1.
     """
 
-    def __init__(self, latitude: float=None, longitude: float=None, octant: int=None, x: float=None, y: float=None):
+    __slots__ = ('_latitude', '_longitude', '_x', '_y', '_hash', '_depth', '_fixed')
+
+    def __init__(self, latitude: float=None, longitude: float=None, octant: int=None, x: float=None, y: float=None,
+                 fixed_point: bool=False):
         """
 
         Parameters
@@ -51,66 +447,63 @@ class Location():
         y : float
             The remainder y-coordinate (latitude) in the deepest computed level
             (0, 1)
+        fixed_point : bool
+            Keep x and y as fixed point integers (multiples of 2 ** -60) and
+            compute the levels with integer arithmetic, so they are exact and
+            the same on every platform
         """
         if (latitude is None or longitude is None) and any((octant is None, x is None, y is None)):
             raise ValueError('Either latitude and longitude or octant, x and y  are required')
 
-        self.levels = []
-
         self._latitude = latitude
         self._longitude = longitude
-        self._octant = octant
-        self._x = x
-        self._y = y
+        self._hash = octant  # None until the octant is known
+        self._depth = 0
+        self._fixed = fixed_point
+        self._x = x if x is None or not fixed_point else _to_fixed(x)
+        self._y = y if y is None or not fixed_point else _to_fixed(y)
 
     @property
     def x(self):
         if self._x is None:
             self._compute_octant()
-        return self._x
+        return self._x / _FIXED_ONE if self._fixed else self._x
 
     @property
     def y(self):
         if self._y is None:
             self._compute_octant()
-        return self._y
+        return self._y / _FIXED_ONE if self._fixed else self._y
+
+    @property
+    def fixed_point(self):
+        return self._fixed
 
     @property
     def octant(self):
-        if self._octant is None:
+        if self._hash is None:
             self._compute_octant()
-        return self._octant
+        return self._hash & 7
+
+    @property
+    def levels(self):
+        if self._hash is None:
+            return Levels()
+        return Levels(self._hash >> 3, self._depth)
+
+    @levels.setter
+    def levels(self, levels):
+        self._hash, self._depth = _levels_to_hash(self.octant, levels)
 
     def _compute_octant(self):
         """
         Given latitude and longitude compute octant and first x, y
         """
-                    
-        if self._latitude > 0:
-            if self._longitude < -90:
-                self._octant = 0
-            elif self._longitude < 0:
-                self._octant = 1
-            elif self._longitude < 90:
-                self._octant = 2
-            else:
-                self._octant = 3
-            
-        else:
-            if self._longitude < -90:
-                self._octant = 4
-            elif self._longitude < 0:
-                self._octant = 5
-            elif self._longitude < 90:
-                self._octant = 6
-            else:
-                self._octant = 7
-
-        # Compute remainder x,y mapping them to [0,1]
-        self._x = ((self._longitude + 180) % 90) / 90
-        self._y = abs(self._latitude) / 90
-        self._x *= (1 - self.y)
-        self.levels = []
+        self._hash, self._x, self._y = _lat_lng_to_octant(
+            self._latitude, self._longitude)
+        self._depth = 0
+        if self._fixed:
+            self._x, self._y = _to_fixed(self._x), _to_fixed(self._y)
 
     @property
     def latitude(self):
@@ -128,75 +521,21 @@ class Location():
         """
         Given a location with `octant`, `x`, `y` compute its lat-lng.
         """
-        x = self._x
-        y = self._y
-
-        for level in reversed(self.levels):
-            if level == 1:
-                x /= 2
-                y = y/2 + 0.5
-            elif level == 2:
-                x /= 2
-                y /= 2
-            elif level == 3:
-                x = x/2 + 0.5
-                y /= 2
-            elif level == 0:
-                x = (1 - x) / 2
-                y = (1 - y) / 2
-            
-            # console.log(level, x,y)
-        
-        x /= 1 - y
-        x *= 90
-        y *= 90
-        
-        if self._octant == 0:
-            x -= 180
-        elif self._octant == 1:
-            x -= 90
-        elif self._octant == 2:
-            x += 0
-        elif self._octant == 3:
-            x += 90
-        elif self._octant == 4:
-            x -= 180
-            y = -y
-        elif self._octant == 5:
-            x -= 90
-            y = -y
-        elif self._octant == 6:
-            x += 0
-            y = -y
-        elif self._octant == 7:
-            x += 90
-            y = -y
-
-        self._latitude = y
-        self._longitude = x
+        self._latitude, self._longitude = _hash_to_lat_lng(
+            self._hash, 3 + 2 * self._depth, self.x, self.y)
 
     def compute_level(self):
         """
         Given `octant`, `x`, `y`, `max` and `levels`, compute the next level
         """
-        if self.y > 0.5:  # use properties to guarantee first values populated
-            self.levels.append(1)
-            self._x *= 2
-            self._y = (self._y - 0.5) * 2
-        elif self.y < 0.5 - self.x:
-            self.levels.append(2)
-            self._x *= 2
-            self._y *= 2
-        elif self.x >= 0.5:
-            self.levels.append(3)
-            self._x = (self._x - 0.5) * 2
-            self._y *= 2
-        else:
-            # And this is an inverse triangle
-            self.levels.append(0)
-    #         self._x = 2*x + 2*y - 1
-            self._x = 1 - self._x * 2
-            self._y = 1 - self._y * 2
+        if self._hash is None or self._x is None:
+            self._compute_octant()
+
+        shift = 3 + 2 * self._depth
+        subdivide = _subdivide_fixed if self._fixed else _subdivide
+        self._hash, self._x, self._y = subdivide(
+            self._hash, self._x, self._y, shift + 2, start=shift)
+        self._depth += 1
 
     def location_to_readable_hash(self):
         """
@@ -207,8 +546,9 @@ class Location():
         readable_hash : str
             human-readable hash
         """
-        return str(self.octant) + ''.join([str(i) for i in self.levels])
-    
+        return _hash_to_readable(
+            self.location_to_numeric_hash(), 3 + 2 * self._depth)
+
     def location_to_numeric_hash(self):
         """
         Given a self, return its numeric hash
@@ -218,14 +558,9 @@ class Location():
         numeric_hash : int
             Numeric hash
         """
-        acc = self.octant
-        mult = 8
-        
-        for level in self.levels:
-            acc += mult * level
-            mult *= 4
-        
-        return acc
+        if self._hash is None:
+            self._compute_octant()
+        return self._hash
 
     @classmethod
     def readable_hash_to_location(cls, readable_hash):
@@ -241,11 +576,7 @@ class Location():
         -------
         Location
         """
-        octant = int(readable_hash[0])
-        levels = [int(i) for i in readable_hash[1:]]
-        precision = 3 + 2 * len(levels)
-
-        return cls.levels_to_location(octant, levels)
+        return cls.numeric_hash_to_location(*_readable_to_hash(readable_hash))
 
     @classmethod
     def levels_to_location(cls, octant, levels, x=None, y=None):
@@ -267,14 +598,14 @@ class Location():
             x = 0.3
         if y is None:
             y = 0.3
-        
+
         location = cls(
             octant=octant,
             x=x,
             y=y
         )
         location.levels = levels
-        
+
         return location
 
     @classmethod
@@ -295,20 +626,12 @@ class Location():
         """
         if precision is None:
             precision = 25
-        octant = numeric_hash % 8
-        numeric_hash = numeric_hash // 8
-        i = 3
-        levels = []
-
-        while i < precision:
-            levels.append(numeric_hash % 4)
-            numeric_hash = numeric_hash // 4
-            i += 2
 
-        return cls.levels_to_location(octant, levels)
+        return cls.levels_to_location(
+            numeric_hash & 7, _hash_to_levels(numeric_hash, precision))
 
     @classmethod
-    def lat_lng_to_precise_location(cls, latitude, longitude, precision):
+    def lat_lng_to_precise_location(cls, latitude, longitude, precision, fixed_point=False):
         """
         Get location with computed octant and levels.
 
@@ -322,16 +645,24 @@ class Location():
         longitude : float
             Longitude
         precision : int
+        fixed_point : bool
+            Compute the levels with fixed point x, y, see ``Location``
 
         Returns
         -------
         Location
             location with the computed octant and levels
         """
-        location = cls(latitude=latitude, longitude=longitude)
+        numeric_hash, x, y = _lat_lng_to_hash(latitude, longitude, precision, fixed_point)
 
-        for current_precision in range(3, precision, 2):
-            location.compute_level()
+        location = cls(
+            latitude=latitude,
+            longitude=longitude,
+            octant=numeric_hash & 7,
+            fixed_point=fixed_point
+        )
+        location._x, location._y = x, y
+        location.levels = _hash_to_levels(numeric_hash, precision)
 
         return location
 
@@ -363,6 +694,7 @@ class Location():
 
         location1 = cls(octant=octant, x=ALMOST_ZERO, y=ALMOST_ZERO)
         location1.levels = levels
+        levels = location1.levels  # share the packed levels with the others
         # don't need to explicitly call compute latitude and longitude as it's
         # lazily processed as required
 
@@ -421,10 +753,10 @@ class Location():
         return f'<Location [{self.location_to_readable_hash()}]>'
 
 
-# utility functinos
+# utility functions
 
 
-def latitude_longitude_to_readable_hash(latitude, longitude, precision=25):
+def latitude_longitude_to_readable_hash(latitude, longitude, precision=25, fixed_point=False):
     """
     Utility function to get a readable hash from latitude and longitude
 
@@ -433,18 +765,20 @@ def latitude_longitude_to_readable_hash(latitude, longitude, precision=25):
     latitude : float
     longitude : float
     precision : int
+    fixed_point : bool
+        Compute the levels with fixed point integers rather than floats, so
+        they are exact and the same on every platform
 
     Returns
     -------
     readable_hash : str
         The readable hash of the supplied coordinates
     """
-    location = Location.lat_lng_to_precise_location(
-        latitude, longitude, precision)
-    return location.location_to_readable_hash()
+    numeric_hash, _, _ = _lat_lng_to_hash(latitude, longitude, precision, fixed_point)
+    return _hash_to_readable(numeric_hash, precision)
 
 
-def latitude_longitude_to_numeric_hash(latitude, longitude, precision=25):
+def latitude_longitude_to_numeric_hash(latitude, longitude, precision=25, fixed_point=False):
     """
     Utility function to get a numeric hash from latitude and longitude
 
@@ -453,15 +787,17 @@ def latitude_longitude_to_numeric_hash(latitude, longitude, precision=25):
     latitude : float
     longitude : float
     precision : int
+    fixed_point : bool
+        Compute the levels with fixed point integers rather than floats, so
+        they are exact and the same on every platform
 
     Returns
     -------
     numeric_hash : int
         Numeric hash of the supplied coordinates
     """
-    location = Location.lat_lng_to_precise_location(
-        latitude, longitude, precision)
-    return location.location_to_numeric_hash()
+    numeric_hash, _, _ = _lat_lng_to_hash(latitude, longitude, precision, fixed_point)
+    return numeric_hash
 
 
 def numeric_hash_to_latitude_longitude(numeric_hash, precision=25):
@@ -478,10 +814,7 @@ def numeric_hash_to_latitude_longitude(numeric_hash, precision=25):
     latitude : float
     longitude : float
     """
-    location = Location.numeric_hash_to_location(
-        numeric_hash, precision
-    )
-    return location.latitude, location.longitude
+    return _hash_to_lat_lng(numeric_hash, precision)
 
 
 def readable_hash_to_latitude_longitude(readable_hash):
@@ -497,8 +830,7 @@ def readable_hash_to_latitude_longitude(readable_hash):
     latitude : float
     longitude : float
     """
-    location = Location.readable_hash_to_location(readable_hash)
-    return location.latitude, location.longitude
+    return _hash_to_lat_lng(*_readable_to_hash(readable_hash))
 
 
 def numeric_hash_to_area(numeric_hash, precision=25):
@@ -518,10 +850,9 @@ def numeric_hash_to_area(numeric_hash, precision=25):
         The collection of Locations (usually 3, at the poles 4) that defines the
         areal region around the numeric hash
     """
-    location = Location.numeric_hash_to_location(numeric_hash, precision)
     return Location.levels_to_triangle(
-        location.octant,
-        location.levels,
+        numeric_hash & 7,
+        _hash_to_levels(numeric_hash, precision),
         normalise_poles=True
     )
 
@@ -542,9 +873,4 @@ def readable_hash_to_area(readable_hash):
         The collection of Locations (usually 3, at the poles 4) that defines the
         areal region around the numeric hash
     """
-    location = Location.readable_hash_to_location(readable_hash)
-    return Location.levels_to_triangle(
-        location.octant,
-        location.levels,
-        normalise_poles=True
-    )
+    return numeric_hash_to_area(*_readable_to_hash(readable_hash))
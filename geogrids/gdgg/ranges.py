@@ -0,0 +1,147 @@
+"""
+Prefix ordered keys for range scans
+
+Numeric hashes keep the octant in the lowest bits with the levels above it,
+coarsest first, so the hashes inside a cell are spread all over the number
+line. Prefix keys hold the same bits the other way around - the octant in the
+highest bits then each level below the last, like the digits of the readable
+hash - so every key inside a cell falls in one contiguous range. Keys have the
+same number of bits as the numeric hashes at the same precision.
+"""
+import numpy as np
+
+from .arrays import _level_count
+from .oqtm import _hash_to_readable
+
+
+def numeric_hash_to_prefix_key(numeric_hash, precision=25):
+    """
+    Convert a numeric hash to a prefix ordered key
+
+    Parameters
+    ----------
+    numeric_hash : int
+    precision : int
+
+    Returns
+    -------
+    key : int
+    """
+    readable_hash = _hash_to_readable(numeric_hash, precision)
+    levels = len(readable_hash) - 1
+    key = int(readable_hash[0]) << 2 * levels
+    return key | int(readable_hash[1:], 4) if levels else key
+
+
+def prefix_key_to_numeric_hash(key, precision=25):
+    """
+    Convert a prefix ordered key back to a numeric hash
+
+    Parameters
+    ----------
+    key : int
+    precision : int
+
+    Returns
+    -------
+    numeric_hash : int
+    """
+    levels = len(range(3, precision, 2))
+    numeric_hash = (key >> 2 * levels) & 7
+    for level in range(levels):
+        digit = (key >> 2 * (levels - 1 - level)) & 3
+        numeric_hash |= digit << 3 + 2 * level
+    return numeric_hash
+
+
+def numeric_hash_to_prefix_key_array(numeric_hashes, precision=25):
+    """
+    Vectorised version of ``numeric_hash_to_prefix_key``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like
+    precision : int
+
+    Returns
+    -------
+    keys : numpy.ndarray
+        uint64 array of prefix keys
+    """
+    levels = _level_count(precision)
+    numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64)
+
+    keys = (numeric_hashes & np.uint64(7)) << np.uint64(2 * levels)
+    for level in range(levels):
+        digits = (numeric_hashes >> np.uint64(3 + 2 * level)) & np.uint64(3)
+        keys |= digits << np.uint64(2 * (levels - 1 - level))
+    return keys
+
+
+def prefix_key_to_numeric_hash_array(keys, precision=25):
+    """
+    Vectorised version of ``prefix_key_to_numeric_hash``
+
+    Parameters
+    ----------
+    keys : array_like
+    precision : int
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+        uint64 array of numeric hashes
+    """
+    levels = _level_count(precision)
+    keys = np.asarray(keys, dtype=np.uint64)
+
+    numeric_hashes = (keys >> np.uint64(2 * levels)) & np.uint64(7)
+    for level in range(levels):
+        digits = (keys >> np.uint64(2 * (levels - 1 - level))) & np.uint64(3)
+        numeric_hashes |= digits << np.uint64(3 + 2 * level)
+    return numeric_hashes
+
+
+def cells_to_ranges(cells, precision=25):
+    """
+    Ranges of prefix keys covering a set of cells
+
+    Parameters
+    ----------
+    cells : iterable of tuple of int
+        ``(numeric_hash, precision)`` for each cell, as returned by ``cover``
+    precision : int
+        Precision of the keys, no coarser than any of the cells
+
+    Returns
+    -------
+    ranges : list of tuple of int
+        Sorted ``(lo, hi)`` ranges of keys, including ``lo`` and excluding
+        ``hi``, with overlapping and adjacent ranges merged
+    """
+    levels = _level_count(precision)
+    numeric_hashes, precisions = np.array(
+        list(cells), dtype=np.uint64).reshape(-1, 2).T
+    if not len(numeric_hashes):
+        return []
+
+    cell_levels = (precisions.astype(np.int64) - 2) // 2
+    if cell_levels.max() > levels:
+        raise ValueError(
+            f'Cells finer than precision {precision} have no range of keys')
+
+    # dropping any levels finer than the cell's leaves the smallest key inside
+    # it, with the cell taking up the following 4 ** (missing levels) keys
+    numeric_hashes &= (np.uint64(1) << (3 + 2 * cell_levels).astype(np.uint64)) - np.uint64(1)
+    lo = numeric_hash_to_prefix_key_array(numeric_hashes, precision)
+    hi = lo + (np.uint64(1) << (2 * (levels - cell_levels)).astype(np.uint64))
+
+    order = np.argsort(lo, kind='stable')
+    lo = lo[order]
+    hi = np.maximum.accumulate(hi[order])
+
+    # a new range starts wherever there's a gap after everything before it
+    starts = np.flatnonzero(np.append(True, lo[1:] > hi[:-1]))
+    ends = np.append(starts[1:], len(lo)) - 1
+
+    return list(zip(lo[starts].tolist(), hi[ends].tolist()))
@@ -0,0 +1,351 @@
+"""
+In-memory spatial index of items bucketed by OQTM cell
+
+Items are kept in slots of NumPy arrays of coordinates, with a dict from each
+numeric hash to the slots of the items in that cell. Queries start from the
+cell of the query point and step outwards a ring of neighbouring cells at a
+time, stopping once the next ring is too far away to hold any more results::
+
+    >>> from geogrids.index import OQTMIndex
+    >>> index = OQTMIndex(precision=25)
+    >>> index.load(names, latitudes, longitudes)
+    >>> index.nearest(-35.6498, 150.2935, k=5)
+    >>> index.radius(-35.6498, 150.2935, 10000)
+
+Distances are great circle distances in metres on a sphere.
+"""
+import sys
+
+import numpy as np
+
+from .gdgg import (
+    latitude_longitude_to_numeric_hash,
+    latitude_longitude_to_numeric_hash_array,
+    neighbors_array,
+    numeric_hash_to_area_array,
+)
+
+
+EARTH_RADIUS = 6371008.8
+
+
+def _distances(latitude, longitude, latitudes, longitudes):
+    """
+    Haversine distances in metres from a point to arrays of points
+    """
+    latitude, longitude = np.radians(latitude), np.radians(longitude)
+    latitudes, longitudes = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((latitudes - latitude) / 2) ** 2 + \
+        np.cos(latitude) * np.cos(latitudes) * np.sin((longitudes - longitude) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+class OQTMIndex:
+    """
+    Spatial index of items bucketed by their numeric hash
+
+    Items can be any hashable value, each with one location.
+    """
+
+    def __init__(self, precision: int = 25):
+        """
+
+        Parameters
+        ----------
+        precision : int
+            Precision of the cells items are bucketed by. Finer cells make
+            short range queries faster, coarser cells long range ones.
+        """
+        self.precision = precision
+
+        self._items = []
+        self._latitudes = np.empty(0)
+        self._longitudes = np.empty(0)
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._free = []
+
+        self._slots = {}
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, item):
+        return item in self._slots
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def _reserve(self, count):
+        """
+        Grow the slot arrays to fit at least count more items
+        """
+        size = len(self._items)
+        if size + count <= len(self._latitudes):
+            return
+
+        capacity = max(size + count, 2 * len(self._latitudes), 16)
+        for name in ('_latitudes', '_longitudes', '_hashes'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+
+    def _store(self, item, latitude, longitude, numeric_hash):
+        """
+        Put an item in a free slot and its bucket
+        """
+        if self._free:
+            slot = self._free.pop()
+            self._items[slot] = item
+        else:
+            slot = len(self._items)
+            self._items.append(item)
+
+        self._latitudes[slot] = latitude
+        self._longitudes[slot] = longitude
+        self._hashes[slot] = numeric_hash
+        self._slots[item] = slot
+        self._buckets.setdefault(numeric_hash, []).append(slot)
+
+    def insert(self, item, latitude: float, longitude: float):
+        """
+        Add an item, or move it if it's already in the index
+
+        Parameters
+        ----------
+        item : hashable
+        latitude : float
+        longitude : float
+        """
+        if item in self._slots:
+            self.delete(item)
+        self._reserve(1)
+        self._store(
+            item, latitude, longitude,
+            latitude_longitude_to_numeric_hash(latitude, longitude, self.precision))
+
+    def load(self, items, latitudes, longitudes):
+        """
+        Add many items at once, hashing them together
+
+        Parameters
+        ----------
+        items : iterable of hashable
+        latitudes : array_like
+        longitudes : array_like
+        """
+        items = list(items)
+        latitudes = np.asarray(latitudes, dtype=np.float64).ravel()
+        longitudes = np.asarray(longitudes, dtype=np.float64).ravel()
+        if not len(items) == len(latitudes) == len(longitudes):
+            raise ValueError('Items, latitudes and longitudes differ in length')
+
+        numeric_hashes = latitude_longitude_to_numeric_hash_array(
+            latitudes, longitudes, self.precision)
+
+        for item in items:
+            if item in self._slots:
+                self.delete(item)
+        self._reserve(len(items))
+        for item, latitude, longitude, numeric_hash in zip(
+                items, latitudes.tolist(), longitudes.tolist(),
+                numeric_hashes.tolist()):
+            if item in self._slots:  # repeated within the items
+                self.delete(item)
+            self._store(item, latitude, longitude, numeric_hash)
+
+    def delete(self, item):
+        """
+        Remove an item
+
+        Parameters
+        ----------
+        item : hashable
+
+        Raises
+        ------
+        KeyError
+            If the item isn't in the index
+        """
+        slot = self._slots.pop(item)
+        numeric_hash = int(self._hashes[slot])
+        bucket = self._buckets[numeric_hash]
+        bucket.remove(slot)
+        if not bucket:
+            del self._buckets[numeric_hash]
+
+        self._items[slot] = None
+        self._free.append(slot)
+
+    def location(self, item):
+        """
+        Latitude and longitude of an item
+
+        Parameters
+        ----------
+        item : hashable
+
+        Returns
+        -------
+        latitude : float
+        longitude : float
+        """
+        slot = self._slots[item]
+        return float(self._latitudes[slot]), float(self._longitudes[slot])
+
+    def _rings(self, latitude, longitude):
+        """
+        Rings of cells around a point, from its own cell outwards
+
+        Once the rings have covered more cells than there are occupied
+        cells, the rest of the occupied cells are given as one last ring as
+        it's quicker to check them all than to keep going.
+
+        Yields
+        ------
+        cells : list of int
+            Numeric hashes of the cells in the ring
+        distance : float
+            No location in the ring is closer to the point than this
+        """
+        cell = latitude_longitude_to_numeric_hash(latitude, longitude, self.precision)
+        ring = np.array([cell], dtype=np.uint64)
+        visited = {cell}
+        yield [cell], 0.0
+
+        while True:
+            edges, vertices, mask = neighbors_array(ring, self.precision)
+            found = set(np.concatenate([edges.ravel(), vertices[mask]]).tolist())
+            found -= visited
+            if not found:
+                return
+            if len(visited) + len(found) > len(self._buckets):
+                yield [cell for cell in self._buckets if cell not in visited], 0.0
+                return
+            visited |= found
+            ring = np.fromiter(found, dtype=np.uint64, count=len(found))
+
+            # every location in a cell is within its longest edge of each of
+            # its vertices
+            triangles, _ = numeric_hash_to_area_array(ring, self.precision)
+            corners = _distances(
+                latitude, longitude, triangles[:, :, 0], triangles[:, :, 1])
+            sides = _distances(
+                triangles[:, :, 0], triangles[:, :, 1],
+                np.roll(triangles[:, :, 0], 1, axis=1),
+                np.roll(triangles[:, :, 1], 1, axis=1))
+            distance = (corners.min(axis=1) - sides.max(axis=1)).min()
+
+            yield ring.tolist(), max(float(distance), 0.0)
+
+    def _gather(self, cells):
+        """
+        Slots of the items in cells
+        """
+        buckets = self._buckets
+        slots = [slot for cell in cells for slot in buckets.get(cell, ())]
+        return np.array(slots, dtype=np.intp)
+
+    def radius(self, latitude: float, longitude: float, distance: float):
+        """
+        Items within a distance of a point
+
+        Parameters
+        ----------
+        latitude : float
+        longitude : float
+        distance : float
+            In metres
+
+        Returns
+        -------
+        found : list of tuple
+            ``(item, distance)`` for each item, nearest first
+        """
+        slots = []
+        for cells, closest in self._rings(latitude, longitude):
+            if closest > distance:
+                break
+            slots.append(self._gather(cells))
+
+        slots = np.concatenate(slots)
+        distances = _distances(
+            latitude, longitude, self._latitudes[slots], self._longitudes[slots])
+        keep = distances <= distance
+        slots, distances = slots[keep], distances[keep]
+        order = np.argsort(distances, kind='stable')
+
+        items = self._items
+        return [
+            (items[slot], found)
+            for slot, found in zip(slots[order].tolist(), distances[order].tolist())
+        ]
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1):
+        """
+        The k items closest to a point
+
+        Parameters
+        ----------
+        latitude : float
+        longitude : float
+        k : int
+
+        Returns
+        -------
+        found : list of tuple
+            ``(item, distance)`` for up to k items, nearest first, with the
+            distances in metres
+        """
+        if k < 0:
+            raise ValueError(f'Cannot find {k} nearest items')
+        if k == 0:
+            return []
+
+        slots = np.empty(0, dtype=np.intp)
+        distances = np.empty(0)
+
+        for cells, closest in self._rings(latitude, longitude):
+            if len(slots) >= k and distances[k - 1] <= closest:
+                break
+            found = self._gather(cells)
+            if not len(found):
+                continue
+            slots = np.concatenate([slots, found])
+            distances = np.concatenate([distances, _distances(
+                latitude, longitude,
+                self._latitudes[found], self._longitudes[found])])
+            order = np.argsort(distances, kind='stable')[:k]
+            slots, distances = slots[order], distances[order]
+
+        items = self._items
+        return [
+            (items[slot], found)
+            for slot, found in zip(slots.tolist(), distances.tolist())
+        ]
+
+    def memory_usage(self):
+        """
+        Approximate bytes used by the index, not counting the items themselves
+
+        Returns
+        -------
+        usage : dict
+            Bytes used by the ``coordinates`` (and hashes) arrays, the
+            ``slots`` of each item and the ``buckets`` of each cell, plus the
+            ``total``
+        """
+        coordinates = self._latitudes.nbytes + self._longitudes.nbytes + \
+            self._hashes.nbytes
+        slots = sys.getsizeof(self._slots) + sys.getsizeof(self._items) + \
+            sys.getsizeof(self._free)
+        buckets = sys.getsizeof(self._buckets) + sum(
+            sys.getsizeof(bucket) for bucket in self._buckets.values())
+
+        return {
+            'coordinates': coordinates,
+            'slots': slots,
+            'buckets': buckets,
+            'total': coordinates + slots + buckets,
+        }
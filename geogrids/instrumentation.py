@@ -0,0 +1,164 @@
+"""
+Opt-in call counts and timings of the hashing stages
+
+While enabled, each stage below is wrapped to count its calls and add up the
+time spent in it with ``time.perf_counter_ns``. Disabling puts the original
+functions back, so there's no cost at all when it's off::
+
+    >>> from geogrids import instrumentation
+    >>> with instrumentation.instrumented():
+    ...     geogrids.gdgg.latitude_longitude_to_numeric_hash(-35.6498, 150.2935)
+    >>> instrumentation.snapshot()['_subdivide']['calls']
+    1
+
+The stages are the ``Location`` methods, the functions of the integer hashing
+engine behind the utility functions, and the ``Encoder`` methods. Times are
+inclusive, so a stage calling another (``string_to_hash`` calls
+``_decode``, ``_compute_octant`` calls ``_lat_lng_to_octant``) counts that
+time too. Counts are kept in plain dicts, so with several threads hashing at
+once they are approximate.
+"""
+from contextlib import contextmanager
+from functools import wraps
+import time
+
+from .encoders import Encoder
+from .gdgg import oqtm
+from .gdgg.oqtm import Location
+
+
+# (owner, attribute) of every instrumented stage, keyed by the name it's
+# reported under
+STAGES = {
+    'Location._compute_octant': (Location, '_compute_octant'),
+    'Location.compute_level': (Location, 'compute_level'),
+    'Location._compute_lat_lng': (Location, '_compute_lat_lng'),
+    'Location.levels_to_triangle': (Location, 'levels_to_triangle'),
+    '_lat_lng_to_octant': (oqtm, '_lat_lng_to_octant'),
+    '_subdivide': (oqtm, '_subdivide'),
+    '_subdivide_fixed': (oqtm, '_subdivide_fixed'),
+    '_hash_to_lat_lng': (oqtm, '_hash_to_lat_lng'),
+    'Encoder.hash_to_string': (Encoder, 'hash_to_string'),
+    'Encoder.string_to_hash': (Encoder, 'string_to_hash'),
+    'Encoder._decode': (Encoder, '_decode'),
+    'Encoder.encode_many': (Encoder, 'encode_many'),
+    'Encoder.decode_many': (Encoder, 'decode_many'),
+}
+
+# calls and nanoseconds of each stage
+_stats = {name: [0, 0] for name in STAGES}
+
+# original functions while enabled
+_originals = {}
+
+_depth = 0
+
+
+def _timed(func, counter):
+    """
+    Wrap a function to add its calls and time to a counter
+    """
+    clock = time.perf_counter_ns
+
+    @wraps(func)
+    def timed(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            counter[1] += clock() - start
+            counter[0] += 1
+
+    return timed
+
+
+def enable():
+    """
+    Start counting calls and timing the stages
+
+    Does nothing if it's already enabled.
+    """
+    if _originals:
+        return
+
+    for name, (owner, attribute) in STAGES.items():
+        original = owner.__dict__[attribute]
+        if isinstance(original, classmethod):
+            wrapped = classmethod(_timed(original.__func__, _stats[name]))
+        else:
+            wrapped = _timed(original, _stats[name])
+        _originals[name] = original
+        setattr(owner, attribute, wrapped)
+
+
+def disable():
+    """
+    Put back the original stages, keeping the counts so far
+    """
+    for name, original in _originals.items():
+        owner, attribute = STAGES[name]
+        setattr(owner, attribute, original)
+    _originals.clear()
+
+
+def is_enabled():
+    """
+    Whether the stages are being counted and timed
+    """
+    return bool(_originals)
+
+
+def reset():
+    """
+    Set every count and time back to zero
+    """
+    for counter in _stats.values():
+        counter[0] = counter[1] = 0
+
+
+def snapshot():
+    """
+    Counts and times so far of every stage
+
+    Returns
+    -------
+    stats : dict
+        For each stage, a dict of the number of ``calls``, the ``total_ns``
+        spent in them and the ``mean_ns`` per call (0 if never called)
+    """
+    stats = {}
+    for name, (calls, total) in _stats.items():
+        stats[name] = {
+            'calls': calls,
+            'total_ns': total,
+            'mean_ns': total / calls if calls else 0.0,
+        }
+    return stats
+
+
+@contextmanager
+def instrumented(reset_stats=True):
+    """
+    Count and time the stages within a block
+
+    Blocks can be nested, only the outermost one enables and disables the
+    instrumentation.
+
+    Parameters
+    ----------
+    reset_stats : bool
+        Zero the counts on entering the (outermost) block
+    """
+    global _depth
+
+    if _depth == 0:
+        if reset_stats:
+            reset()
+        enable()
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        if _depth == 0:
+            disable()
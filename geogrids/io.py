@@ -0,0 +1,243 @@
+"""
+Binary files of numeric hashes
+
+A hash file is a 32 byte header followed by the numeric hashes as little
+endian uint64, 8 bytes per hash whatever the precision. The header holds:
+
+=======  ======  ===============================================
+offset   bytes   contents
+=======  ======  ===============================================
+0        8       ``b'OQTMHASH'``
+8        2       format version, currently 1
+10       2       precision of the hashes
+12       4       reserved, zero
+16       8       number of hashes
+24       8       reserved, zero
+=======  ======  ===============================================
+
+The hashes are opened with ``numpy.memmap``, so only the parts used are read
+from disk::
+
+    >>> from geogrids import io
+    >>> io.write_hashes('points.oqtm', numeric_hashes, precision=25)
+    >>> with io.HashFile('points.oqtm') as hashes:
+    ...     hashes[1000:1010]
+    ...     for coordinates in hashes.latitude_longitude():
+    ...         ...
+"""
+import os
+import struct
+
+import numpy as np
+
+from .aggregate import aggregate_chunks
+from .gdgg import numeric_hash_to_latitude_longitude_array
+from .gdgg.arrays import _batches, _level_count
+
+
+MAGIC = b'OQTMHASH'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIQ8x')
+_DTYPE = np.dtype('<u8')
+
+
+def _header(precision, count):
+    return _HEADER.pack(MAGIC, VERSION, precision, 0, count)
+
+
+def write_hashes(path, numeric_hashes, precision=25, chunk_size=1 << 20):
+    """
+    Write numeric hashes to a new hash file
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+    numeric_hashes : iterable of int
+        Array or any iterable (including generators) of numeric hashes
+    precision : int
+    chunk_size : int
+        Number of hashes to write at a time
+
+    Returns
+    -------
+    count : int
+        Number of hashes written
+    """
+    _level_count(precision)
+
+    with open(path, 'wb') as output:
+        output.write(_header(precision, 0))
+
+        count = 0
+        for chunk in _batches(numeric_hashes, chunk_size):
+            output.write(chunk.astype(_DTYPE, copy=False).tobytes())
+            count += len(chunk)
+
+        output.seek(0)
+        output.write(_header(precision, count))
+
+    return count
+
+
+def create_hashes(path, count, precision=25):
+    """
+    Create a hash file of zeros to fill in place
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+    count : int
+        Number of hashes
+    precision : int
+
+    Returns
+    -------
+    HashFile
+        Opened for reading and writing
+    """
+    _level_count(precision)
+
+    with open(path, 'wb') as output:
+        output.write(_header(precision, count))
+        output.truncate(_HEADER.size + count * _DTYPE.itemsize)
+
+    return HashFile(path, mode='r+')
+
+
+class HashFile:
+    """
+    Memory mapped hash file
+
+    Indexing, slicing and ``len`` work on the hashes as on a NumPy array.
+    """
+
+    def __init__(self, path, mode: str = 'r'):
+        """
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+        mode : str
+            ``'r'`` to read, ``'r+'`` to also change the hashes in place, or
+            ``'c'`` to change them in memory only (see ``numpy.memmap``)
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a hash file of a version that can be read
+        """
+        with open(path, 'rb') as source:
+            header = source.read(_HEADER.size)
+        if len(header) < _HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{os.fspath(path)} is not a hash file')
+
+        _, self.version, self.precision, _, count = _HEADER.unpack(header)
+        if self.version != VERSION:
+            raise ValueError(
+                f'{os.fspath(path)} is a version {self.version} hash file, '
+                f'only version {VERSION} can be read')
+
+        expected = _HEADER.size + count * _DTYPE.itemsize
+        if os.path.getsize(path) < expected:
+            raise ValueError(f'{os.fspath(path)} is shorter than its header says')
+
+        self.path = path
+        if count:
+            self.hashes = np.memmap(
+                path, dtype=_DTYPE, mode=mode, offset=_HEADER.size, shape=(count, ))
+        else:
+            # empty files can't be mapped
+            self.hashes = np.empty(0, dtype=_DTYPE)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getitem__(self, index):
+        return self.hashes[index]
+
+    def __setitem__(self, index, value):
+        self.hashes[index] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def flush(self):
+        """
+        Write any changes to the hashes to disk
+        """
+        if isinstance(self.hashes, np.memmap):
+            self.hashes.flush()
+
+    def close(self):
+        """
+        Flush any changes and drop the mapping
+        """
+        self.flush()
+        self.hashes = np.empty(0, dtype=_DTYPE)
+
+    def chunks(self, chunk_size=1 << 20):
+        """
+        Consecutive slices of the hashes
+
+        Parameters
+        ----------
+        chunk_size : int
+
+        Yields
+        ------
+        numeric_hashes : numpy.ndarray
+            View of up to chunk_size hashes
+        """
+        for start in range(0, len(self.hashes), chunk_size):
+            yield self.hashes[start:start + chunk_size]
+
+    def latitude_longitude(self, chunk_size=1 << 20):
+        """
+        Decode the hashes a chunk at a time
+
+        Parameters
+        ----------
+        chunk_size : int
+
+        Yields
+        ------
+        coordinates : numpy.ndarray
+            (N, 2) array of the latitude and longitude of each hash in the
+            chunk, as ``numeric_hash_to_latitude_longitude_array``
+        """
+        for chunk in self.chunks(chunk_size):
+            yield numeric_hash_to_latitude_longitude_array(chunk, self.precision)
+
+    def aggregate(self, values=None, min_precision=3, chunk_size=1 << 20):
+        """
+        Pyramid of counts (and sums and means of values) per cell
+
+        The hashes are aggregated a chunk at a time, so only the occupied
+        cells are held in memory rather than every hash.
+
+        Parameters
+        ----------
+        values : array_like
+            Value for each hash (such as another memory mapped array), or
+            None to only count them
+        min_precision : int
+        chunk_size : int
+
+        Returns
+        -------
+        pyramid : dict
+            As ``geogrids.aggregate.aggregate_hashes``
+        """
+        if values is not None and len(values) != len(self.hashes):
+            raise ValueError('Hashes and values differ in length')
+
+        def chunks():
+            for start, chunk in zip(range(0, len(self.hashes), chunk_size),
+                                    self.chunks(chunk_size)):
+                yield chunk, None if values is None else values[start:start + chunk_size]
+
+        return aggregate_chunks(chunks(), self.precision, min_precision)
@@ -0,0 +1,486 @@
+"""
+Hashing across several processes
+
+Inputs are split into chunks which are hashed by the vectorised functions in a
+``ProcessPoolExecutor``. Chunks of numbers are handed to the workers, and their
+results handed back, through ``multiprocessing.shared_memory`` blocks rather
+than pickled lists. Only strings (which can't be shared as fixed width arrays)
+go through pickling. Results are always returned in the order of the inputs::
+
+    >>> from geogrids import parallel
+    >>> hashes = parallel.latitude_longitude_to_numeric_hash(
+    ...     latitudes, longitudes, precision=25, chunk_size=100000)
+
+Starting a pool of processes costs far more than hashing a few thousand
+points, so pass an existing ``executor`` when making many calls.
+"""
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from .encoders import Encoder
+from .gdgg import (
+    latitude_longitude_to_numeric_hash_array,
+    numeric_hash_to_latitude_longitude_array,
+)
+
+
+# reference to an array in a shared memory block, cheap to pickle
+_SharedArray = namedtuple('_SharedArray', ['name', 'shape', 'dtype'])
+
+
+def _create(shape, dtype):
+    """
+    Create a shared memory block holding an array
+
+    Parameters
+    ----------
+    shape : tuple of int
+    dtype : numpy.dtype
+
+    Returns
+    -------
+    block : multiprocessing.shared_memory.SharedMemory
+    spec : _SharedArray
+    """
+    dtype = np.dtype(dtype)
+    size = int(np.prod(shape)) * dtype.itemsize
+    # zero sized blocks aren't allowed
+    block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    return block, _SharedArray(block.name, tuple(shape), dtype.str)
+
+
+def _view(block, spec):
+    """
+    View a shared memory block as the array it holds
+    """
+    return np.ndarray(spec.shape, dtype=spec.dtype, buffer=block.buf)
+
+
+def _release(blocks, unlink=False):
+    """
+    Close (and optionally unlink) shared memory blocks
+    """
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _run_task(task, inputs, outputs, args):
+    """
+    Run a task in a worker on inputs held in shared memory
+
+    Parameters
+    ----------
+    task : callable
+        Function returning an array or a tuple, the first ``len(outputs)``
+        values of which are arrays to write to the outputs
+    inputs : list
+        Arguments for the task, either ``_SharedArray`` or picklable values
+    outputs : list of _SharedArray
+    args : tuple
+        Further arguments for the task
+
+    Returns
+    -------
+    tuple
+        Any values returned by the task after those written to the outputs
+    """
+    blocks = []
+    values = value = results = None
+    try:
+        values = []
+        for value in inputs:
+            if isinstance(value, _SharedArray):
+                blocks.append(shared_memory.SharedMemory(name=value.name))
+                value = _view(blocks[-1], value)
+            values.append(value)
+
+        results = task(*values, *args)
+        if not isinstance(results, tuple):
+            results = (results,)
+
+        for spec, result in zip(outputs, results):
+            blocks.append(shared_memory.SharedMemory(name=spec.name))
+            _view(blocks[-1], spec)[...] = result
+
+        return results[len(outputs):]
+    finally:
+        # views have to be dropped before their blocks can be closed
+        values = value = results = None
+        _release(blocks)
+
+
+def _submit(pool, task, inputs, outputs, args):
+    """
+    Copy a chunk of inputs to shared memory and submit it to the pool
+
+    Parameters
+    ----------
+    pool : concurrent.futures.Executor
+    task : callable
+    inputs : tuple
+        Arguments for the task, with the arrays among them to be shared. The
+        first input sets the number of rows in the outputs.
+    outputs : tuple of (numpy.dtype, tuple)
+        Type and shape (after the rows) of each array returned by the task
+    args : tuple
+
+    Returns
+    -------
+    future : concurrent.futures.Future
+    blocks : list of multiprocessing.shared_memory.SharedMemory
+    output_specs : list of _SharedArray
+    """
+    rows = len(inputs[0])
+    blocks = []
+    shared_inputs = []
+    output_specs = []
+
+    try:
+        for value in inputs:
+            if isinstance(value, np.ndarray):
+                block, spec = _create(value.shape, value.dtype)
+                blocks.append(block)
+                _view(block, spec)[...] = value
+                value = spec
+            shared_inputs.append(value)
+
+        for dtype, shape in outputs:
+            block, spec = _create((rows,) + tuple(shape), dtype)
+            blocks.append(block)
+            output_specs.append(spec)
+
+        future = pool.submit(_run_task, task, shared_inputs, output_specs, args)
+    except BaseException:
+        _release(blocks, unlink=True)
+        raise
+
+    return future, blocks, output_specs
+
+
+def _collect(future, blocks, output_specs):
+    """
+    Wait for a submitted chunk, copying its outputs out of shared memory
+
+    Returns
+    -------
+    arrays : list of numpy.ndarray
+    extras : tuple
+        Values the task returned besides the output arrays
+    """
+    try:
+        extras = future.result()
+        arrays = [
+            np.array(_view(block, spec))
+            for block, spec in zip(blocks[-len(output_specs):], output_specs)
+        ] if output_specs else []
+    finally:
+        _release(blocks, unlink=True)
+
+    return arrays, extras
+
+
+def map_chunks(task, chunks, outputs=(), args=(), max_workers=None, executor=None):
+    """
+    Run a task on chunks of inputs in worker processes
+
+    Each chunk's arrays are copied to shared memory for the workers, which
+    write the task's array results straight to shared memory allocated for
+    them. At most two chunks per worker are in flight at once so iterators of
+    chunks are consumed as the workers get through them.
+
+    Parameters
+    ----------
+    task : callable
+        Picklable function called as ``task(*chunk, *args)`` in the workers.
+        It returns an array or a tuple, starting with an array for each of the
+        outputs.
+    chunks : iterable of tuple
+        Arguments for each call of the task. The first argument sets the number
+        of rows in the outputs.
+    outputs : tuple of (numpy.dtype, tuple)
+        Type and shape (after the rows) of each array returned by the task
+    args : tuple
+        Further arguments for every call of the task
+    max_workers : int
+        Number of processes, defaults to the number of CPUs
+    executor : concurrent.futures.Executor
+        Existing pool to use rather than starting one for this call
+
+    Yields
+    ------
+    arrays : list of numpy.ndarray
+        The output arrays for each chunk, in the same order as the chunks
+    extras : tuple
+        Any other values returned by the task for the chunk
+    """
+    if executor is None:
+        context = ProcessPoolExecutor(max_workers)
+    else:
+        context = nullcontext(executor)
+    max_pending = 2 * (max_workers or os.cpu_count() or 1)
+    pending = deque()
+
+    with context as pool:
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    yield _collect(*pending.popleft())
+                pending.append(_submit(pool, task, chunk, outputs, args))
+
+            while pending:
+                yield _collect(*pending.popleft())
+        finally:
+            for future, blocks, _ in pending:
+                future.cancel()
+                try:
+                    future.exception()
+                except BaseException:
+                    pass
+                _release(blocks, unlink=True)
+
+
+def _array_chunks(*iterables, chunk_size, dtype):
+    """
+    Split arrays or iterables into chunks of arrays of chunk_size rows
+
+    Arrays are sliced, while other iterables are zipped together and read a
+    chunk at a time.
+    """
+    if all(isinstance(values, np.ndarray) for values in iterables):
+        for start in range(0, len(iterables[0]), chunk_size):
+            yield tuple(values[start:start + chunk_size] for values in iterables)
+        return
+
+    rows = zip(*iterables)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield tuple(np.array(values, dtype=dtype) for values in zip(*chunk))
+        chunk = list(islice(rows, chunk_size))
+
+
+def _concatenate(arrays, shape, dtype):
+    """
+    Join the output arrays of each chunk
+    """
+    if not arrays:
+        return np.empty((0,) + shape, dtype=dtype)
+    return np.concatenate(arrays)
+
+
+def latitude_longitude_to_numeric_hash(latitudes, longitudes, precision=25,
+                                       chunk_size=65536, max_workers=None,
+                                       executor=None):
+    """
+    Parallel version of ``latitude_longitude_to_numeric_hash_array``
+
+    Parameters
+    ----------
+    latitudes : array_like or iterable of float
+    longitudes : array_like or iterable of float
+    precision : int
+    chunk_size : int
+        Number of coordinates hashed per task
+    max_workers : int
+    executor : concurrent.futures.Executor
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+        uint64 array of numeric hashes, with the broadcast shape of array
+        inputs or one dimensional for iterators
+    """
+    shape = None
+    if isinstance(latitudes, (np.ndarray, list, tuple)) and \
+            isinstance(longitudes, (np.ndarray, list, tuple)):
+        latitudes, longitudes = np.broadcast_arrays(
+            np.asarray(latitudes, dtype=np.float64),
+            np.asarray(longitudes, dtype=np.float64)
+        )
+        shape = latitudes.shape
+        latitudes = latitudes.ravel()
+        longitudes = longitudes.ravel()
+
+    results = map_chunks(
+        latitude_longitude_to_numeric_hash_array,
+        _array_chunks(latitudes, longitudes, chunk_size=chunk_size,
+                      dtype=np.float64),
+        outputs=[(np.uint64, ())],
+        args=(precision,),
+        max_workers=max_workers,
+        executor=executor,
+    )
+    numeric_hashes = _concatenate(
+        [arrays[0] for arrays, _ in results], (), np.uint64)
+
+    return numeric_hashes if shape is None else numeric_hashes.reshape(shape)
+
+
+def numeric_hash_to_latitude_longitude(numeric_hashes, precision=25,
+                                       chunk_size=65536, max_workers=None,
+                                       executor=None):
+    """
+    Parallel version of ``numeric_hash_to_latitude_longitude_array``
+
+    Parameters
+    ----------
+    numeric_hashes : array_like or iterable of int
+    precision : int
+    chunk_size : int
+        Number of hashes decoded per task
+    max_workers : int
+    executor : concurrent.futures.Executor
+
+    Returns
+    -------
+    coordinates : numpy.ndarray
+        Array of shape (N, 2) with the latitude and longitude of each hash
+    """
+    if isinstance(numeric_hashes, (np.ndarray, list, tuple)):
+        numeric_hashes = np.asarray(numeric_hashes, dtype=np.uint64).ravel()
+
+    results = map_chunks(
+        numeric_hash_to_latitude_longitude_array,
+        _array_chunks(numeric_hashes, chunk_size=chunk_size, dtype=np.uint64),
+        outputs=[(np.float64, (2,))],
+        args=(precision,),
+        max_workers=max_workers,
+        executor=executor,
+    )
+    return _concatenate([arrays[0] for arrays, _ in results], (2,), np.float64)
+
+
+def _encoder_key(encoder):
+    """
+    Picklable arguments to rebuild an encoder in a worker
+    """
+    return type(encoder), tuple(encoder.wordlist), encoder.separator
+
+
+@lru_cache(maxsize=16)
+def _encoder(cls, wordlist, separator):
+    """
+    Build an encoder once per worker rather than once per chunk
+    """
+    return cls(list(wordlist), separator)
+
+
+def _encode_chunk(numeric_hashes, precision, encoder_key):
+    return (_encoder(*encoder_key).encode_many(
+        numeric_hashes, precision, chunk_size=max(len(numeric_hashes), 1)),)
+
+
+def _decode_chunk(encoded_strings, encoder_key):
+    return _encoder(*encoder_key).decode_many(encoded_strings)
+
+
+def _hash_chunks(numeric_hashes, chunk_size):
+    """
+    Split numeric hashes into uint64 arrays, or lists where they won't fit
+    """
+    if isinstance(numeric_hashes, np.ndarray):
+        numeric_hashes = numeric_hashes.astype(np.uint64, copy=False).ravel()
+        for start in range(0, len(numeric_hashes), chunk_size):
+            yield (numeric_hashes[start:start + chunk_size],)
+        return
+
+    iterator = iter(numeric_hashes)
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        try:
+            yield (np.array(chunk, dtype=np.uint64),)
+        except OverflowError:
+            yield (chunk,)
+        chunk = list(islice(iterator, chunk_size))
+
+
+def encode_many(encoder: Encoder, numeric_hashes, precision: int,
+                chunk_size=65536, max_workers=None, executor=None):
+    """
+    Parallel version of ``Encoder.encode_many``
+
+    The hashes are shared with the workers, but the encoded strings have to be
+    pickled on their way back.
+
+    Parameters
+    ----------
+    encoder : geogrids.encoders.Encoder
+    numeric_hashes : iterable of int or numpy.ndarray
+    precision : int
+    chunk_size : int
+        Number of hashes encoded per task
+    max_workers : int
+    executor : concurrent.futures.Executor
+
+    Returns
+    -------
+    encoded : list of str
+        The hashes encoded to strings, in the same order
+    """
+    encoded = []
+    for _, (strings,) in map_chunks(
+            _encode_chunk,
+            _hash_chunks(numeric_hashes, chunk_size),
+            args=(precision, _encoder_key(encoder)),
+            max_workers=max_workers,
+            executor=executor):
+        encoded.extend(strings)
+
+    return encoded
+
+
+def decode_many(encoder: Encoder, encoded_strings, chunk_size=65536,
+                max_workers=None, executor=None):
+    """
+    Parallel version of ``Encoder.decode_many``
+
+    The strings are pickled to the workers, while the hashes and precisions
+    come back through shared memory.
+
+    Parameters
+    ----------
+    encoder : geogrids.encoders.Encoder
+    encoded_strings : iterable of str
+    chunk_size : int
+        Number of strings decoded per task
+    max_workers : int
+    executor : concurrent.futures.Executor
+
+    Returns
+    -------
+    numeric_hashes : numpy.ndarray
+    precisions : numpy.ndarray
+    errors : list
+        As returned by ``Encoder.decode_many``
+    """
+    numeric_hashes = []
+    precisions = []
+    errors = []
+
+    iterator = iter(encoded_strings)
+    chunks = iter(lambda: (list(islice(iterator, chunk_size)),), ([],))
+
+    for (hashes, chunk_precisions), (chunk_errors,) in map_chunks(
+            _decode_chunk,
+            chunks,
+            outputs=[(np.uint64, ()), (np.int64, ())],
+            args=(_encoder_key(encoder),),
+            max_workers=max_workers,
+            executor=executor):
+        numeric_hashes.append(hashes)
+        precisions.append(chunk_precisions)
+        errors.extend(chunk_errors)
+
+    return (
+        _concatenate(numeric_hashes, (), np.uint64),
+        _concatenate(precisions, (), np.int64),
+        errors
+    )
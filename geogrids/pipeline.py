@@ -0,0 +1,402 @@
+"""
+Streaming bulk hashing of CSV and newline-delimited files
+
+Rows are read and written a chunk at a time, with each chunk going through
+the vectorised hashing functions, so memory use is bounded by the chunk size
+rather than the size of the file. This backs the ``geogrids`` command line
+tool::
+
+    geogrids encode --precision 25 --format words --encoder cheeses \\
+        points.csv hashed.csv
+    geogrids decode --format words --encoder cheeses hashed.csv points.csv
+"""
+import argparse
+import csv
+from itertools import islice
+import sys
+import time
+
+import numpy as np
+
+from . import encoders
+from .gdgg import (
+    latitude_longitude_to_numeric_hash_array,
+    numeric_hash_to_latitude_longitude_array,
+    numeric_hash_to_readable_hash_array,
+    readable_hash_to_latitude_longitude,
+)
+from .gdgg.arrays import _level_count
+
+
+HASH_FORMATS = ('numeric', 'readable', 'words')
+ENCODERS = ('fucks', 'cheeses', 'goshdarnits', 'pokes', 'ducks')
+
+
+def read_chunks(rows, chunk_size=65536):
+    """
+    Split an iterable of rows into lists of at most chunk_size rows
+
+    Parameters
+    ----------
+    rows : iterable
+    chunk_size : int
+
+    Yields
+    ------
+    list
+
+    Raises
+    ------
+    ValueError
+        If chunk_size is less than 1
+    """
+    if chunk_size < 1:
+        raise ValueError(f'Chunk size must be at least 1, not {chunk_size}')
+
+    rows = iter(rows)
+    chunk = list(islice(rows, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, chunk_size))
+
+
+def _field(row, index):
+    """
+    Value of a column, or an empty string if the row is too short to have it
+    """
+    return row[index] if index < len(row) else ''
+
+
+def _parse_floats(values):
+    """
+    Parse strings to floats, with NaN for any that aren't numbers
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        parsed = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                parsed[i] = np.nan
+        return parsed
+
+
+def encode_hashes(latitudes, longitudes, precision=25, hash_format='numeric',
+                  encoder=None):
+    """
+    Hash coordinates and format the hashes as strings
+
+    Parameters
+    ----------
+    latitudes : array_like
+    longitudes : array_like
+    precision : int
+    hash_format : str
+        One of ``'numeric'``, ``'readable'`` or ``'words'``
+    encoder : geogrids.encoders.Encoder
+        Encoder for the ``'words'`` format
+
+    Returns
+    -------
+    hashes : list of str
+        The formatted hashes, with an empty string for any coordinates that
+        aren't finite
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+
+    numeric_hashes = latitude_longitude_to_numeric_hash_array(
+        latitudes[valid], longitudes[valid], precision)
+
+    if hash_format == 'numeric':
+        formatted = list(map(str, numeric_hashes.tolist()))
+    elif hash_format == 'readable':
+        formatted = numeric_hash_to_readable_hash_array(
+            numeric_hashes, precision).tolist()
+    elif hash_format == 'words':
+        formatted = (encoder or encoders.fucks).encode_many(
+            numeric_hashes, precision)
+    else:
+        raise ValueError(f'Unknown hash format {hash_format!r}')
+
+    if valid.all():
+        return formatted
+
+    hashes = [''] * len(valid)
+    for i, value in zip(np.flatnonzero(valid).tolist(), formatted):
+        hashes[i] = value
+    return hashes
+
+
+def decode_hashes(hashes, precision=25, hash_format='numeric', encoder=None):
+    """
+    Convert formatted hashes back to coordinates
+
+    Parameters
+    ----------
+    hashes : list of str
+    precision : int
+        Precision of numeric hashes. Readable hashes carry their own
+        precision, and words are decoded to this precision or the precision
+        of the words, whichever is lower (as words round the precision up to
+        a whole number of words).
+    hash_format : str
+        One of ``'numeric'``, ``'readable'`` or ``'words'``
+    encoder : geogrids.encoders.Encoder
+        Encoder for the ``'words'`` format
+
+    Returns
+    -------
+    coordinates : numpy.ndarray
+        Array of shape (N, 2) of latitudes and longitudes, NaN for any hashes
+        that couldn't be decoded
+    """
+    coordinates = np.full((len(hashes), 2), np.nan)
+
+    if hash_format == 'numeric':
+        numeric_hashes = np.zeros(len(hashes), dtype=np.uint64)
+        valid = np.zeros(len(hashes), dtype=bool)
+        for i, value in enumerate(hashes):
+            if value.isdecimal() and int(value) >> 64 == 0:
+                numeric_hashes[i] = int(value)
+                valid[i] = True
+        coordinates[valid] = numeric_hash_to_latitude_longitude_array(
+            numeric_hashes[valid], precision)
+
+    elif hash_format == 'readable':
+        for i, value in enumerate(hashes):
+            if value and value.isdecimal() and value[0] < '8' and \
+                    value[1:].strip('0123') == '':
+                coordinates[i] = readable_hash_to_latitude_longitude(value)
+
+    elif hash_format == 'words':
+        numeric_hashes, precisions, _ = (
+            encoder or encoders.fucks).decode_many(hashes)
+        for hash_precision in np.unique(precisions[precisions > 0]).tolist():
+            selected = precisions == hash_precision
+            coordinates[selected] = numeric_hash_to_latitude_longitude_array(
+                numeric_hashes[selected], min(precision, hash_precision))
+
+    else:
+        raise ValueError(f'Unknown hash format {hash_format!r}')
+
+    return coordinates
+
+
+def encode_rows(rows, columns=(0, 1), chunk_size=65536, **kwargs):
+    """
+    Append a hash to each row of latitude and longitude strings
+
+    Parameters
+    ----------
+    rows : iterable of list of str
+    columns : tuple of int
+        Indices of the latitude and longitude in each row. Rows without them
+        (such as blank lines) get an empty hash.
+    chunk_size : int
+    **kwargs
+        Passed to :func:`encode_hashes`
+
+    Yields
+    ------
+    list of list of str
+        Chunks of rows with the hash appended
+    """
+    latitude_column, longitude_column = columns
+
+    for chunk in read_chunks(rows, chunk_size):
+        hashes = encode_hashes(
+            _parse_floats([_field(row, latitude_column) for row in chunk]),
+            _parse_floats([_field(row, longitude_column) for row in chunk]),
+            **kwargs
+        )
+        for row, numeric_hash in zip(chunk, hashes):
+            row.append(numeric_hash)
+        yield chunk
+
+
+def decode_rows(rows, column=0, chunk_size=65536, **kwargs):
+    """
+    Append a latitude and longitude to each row with a hash
+
+    Parameters
+    ----------
+    rows : iterable of list of str
+    column : int
+        Index of the hash in each row. Rows without it (such as blank lines)
+        get empty coordinates.
+    chunk_size : int
+    **kwargs
+        Passed to :func:`decode_hashes`
+
+    Yields
+    ------
+    list of list
+        Chunks of rows with the latitude and longitude appended, or empty
+        strings where the hash couldn't be decoded
+    """
+    for chunk in read_chunks(rows, chunk_size):
+        coordinates = decode_hashes([_field(row, column) for row in chunk], **kwargs)
+        valid = np.isfinite(coordinates[:, 0]).tolist()
+        for row, (latitude, longitude), ok in zip(chunk, coordinates.tolist(), valid):
+            row.extend((latitude, longitude) if ok else ('', ''))
+        yield chunk
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog='geogrids',
+        description='Bulk hash coordinates, or decode hashes, in CSV or '
+                    'newline-delimited files')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    encode = commands.add_parser('encode', help='hash latitude and longitude columns')
+    encode.add_argument('--latitude-column', default='latitude')
+    encode.add_argument('--longitude-column', default='longitude')
+    encode.add_argument('--hash-column', default='hash',
+                        help='name of the column to add for the hash')
+
+    decode = commands.add_parser('decode', help='decode a hash column')
+    decode.add_argument('--hash-column', default='hash')
+    decode.add_argument('--latitude-column', default='latitude',
+                        help='name of the column to add for the latitude')
+    decode.add_argument('--longitude-column', default='longitude',
+                        help='name of the column to add for the longitude')
+
+    for command in (encode, decode):
+        command.add_argument('input', nargs='?', default='-',
+                             help='input file, - for stdin (default)')
+        command.add_argument('output', nargs='?', default='-',
+                             help='output file, - for stdout (default)')
+        command.add_argument('--precision', type=int, default=25)
+        command.add_argument('--format', dest='hash_format',
+                             choices=HASH_FORMATS, default='numeric')
+        command.add_argument('--encoder', choices=ENCODERS, default='fucks',
+                             help='encoder for the words format')
+        command.add_argument('--lines', action='store_true',
+                             help='input has no header row and only the '
+                                  'coordinates (or hash) on each line, and '
+                                  'only the results are written')
+        command.add_argument('--delimiter', default=',')
+        command.add_argument('--chunk-size', type=_positive_int, default=65536)
+        command.add_argument('--progress', action='store_true',
+                             help='report rows per second after every chunk')
+
+    return parser
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, not {number}')
+    return number
+
+
+def _column(header, name):
+    try:
+        return header.index(name)
+    except ValueError:
+        raise ValueError(f'Column {name!r} is not in the header') from None
+
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdin if 'r' in mode else sys.stdout
+    return open(path, mode, newline='', encoding='utf-8')
+
+
+def run(args, stderr=None):
+    """
+    Run the command line tool with parsed arguments
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+    stderr : file
+        Where to report progress, defaults to ``sys.stderr``
+
+    Returns
+    -------
+    rows : int
+        Number of rows processed
+    """
+    stderr = stderr or sys.stderr
+    _level_count(args.precision)
+    options = dict(
+        chunk_size=args.chunk_size,
+        precision=args.precision,
+        hash_format=args.hash_format,
+        encoder=getattr(encoders, args.encoder),
+    )
+
+    source = _open(args.input, 'r')
+    target = None
+    try:
+        reader = csv.reader(source, delimiter=args.delimiter)
+
+        # check the header before opening (and truncating) the output
+        if args.lines:
+            header = None
+        elif args.command == 'encode':
+            header = next(reader, [])
+            columns = (_column(header, args.latitude_column),
+                       _column(header, args.longitude_column))
+            added_columns = [args.hash_column]
+        else:
+            header = next(reader, [])
+            column = _column(header, args.hash_column)
+            added_columns = [args.latitude_column, args.longitude_column]
+
+        if header is not None:
+            # pad short rows so the added columns line up with the header
+            reader = (row + [''] * (len(header) - len(row)) for row in reader)
+
+        target = _open(args.output, 'w')
+        writer = csv.writer(target, delimiter=args.delimiter, lineterminator='\n')
+        if header is not None:
+            writer.writerow(header + added_columns)
+
+        if args.command == 'encode':
+            chunks = encode_rows(reader, columns if header else (0, 1), **options)
+            added = 1
+        else:
+            chunks = decode_rows(reader, column if header else 0, **options)
+            added = 2
+
+        rows = 0
+        start = time.perf_counter()
+        for chunk in chunks:
+            if header is None:
+                chunk = [row[-added:] for row in chunk]
+            writer.writerows(chunk)
+            rows += len(chunk)
+            if args.progress:
+                _report(rows, time.perf_counter() - start, stderr)
+    finally:
+        if target is not None and target is not sys.stdout:
+            target.close()
+        if source is not sys.stdin:
+            source.close()
+
+    _report(rows, time.perf_counter() - start, stderr)
+    return rows
+
+
+def _report(rows, seconds, stderr):
+    rate = rows / seconds if seconds else 0
+    print(f'{rows:,} rows in {seconds:.2f}s ({rate:,.0f} rows/s)', file=stderr)
+
+
+def main(argv=None):
+    """
+    Entry point for the ``geogrids`` command line tool
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    try:
+        run(args)
+    except ValueError as error:
+        parser.error(str(error))
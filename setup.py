@@ -32,14 +32,23 @@ setup(
 
     packages=find_packages(exclude=('tests',)),
 
+    python_requires='>=3.8',
     install_requires=get_requirements(),
 
+    entry_points={
+        'console_scripts': [
+            'geogrids = geogrids.pipeline:main',
+        ],
+    },
+
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
         'Topic :: Scientific/Engineering :: GIS'
     ],
 )
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids.aggregate import aggregate, aggregate_chunks, aggregate_hashes
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+values = strategies.floats(min_value=-1e6, max_value=1e6, allow_nan=False)
+
+
+@given(
+    points=strategies.lists(strategies.tuples(latitudes, longitudes, values), min_size=1, max_size=50),
+    precision=strategies.sampled_from(HASH_PRECISIONS),
+)
+def test_pyramid_matches_hashing_each_precision(points, precision):
+    point_latitudes, point_longitudes, point_values = zip(*points)
+    pyramid = aggregate(point_latitudes, point_longitudes, point_values, precision)
+
+    assert list(pyramid) == [p for p in reversed(HASH_PRECISIONS) if p <= precision]
+    for level, cells in pyramid.items():
+        expected = defaultdict(list)
+        for latitude, longitude, value in points:
+            expected[geogrids.gdgg.latitude_longitude_to_numeric_hash(
+                latitude, longitude, level)].append(value)
+
+        assert cells.numeric_hashes.tolist() == sorted(expected)
+        assert cells.counts.tolist() == [len(expected[h]) for h in sorted(expected)]
+        assert cells.sums.tolist() == pytest.approx(
+            [sum(expected[h]) for h in sorted(expected)], abs=1e-3)
+        assert cells.means == pytest.approx(cells.sums / cells.counts)
+
+
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 25 - 1), max_size=60),
+    chunk_size=strategies.integers(min_value=1, max_value=16),
+    with_values=strategies.booleans(),
+)
+def test_chunks_match_whole(numeric_hashes, chunk_size, with_values):
+    point_values = np.arange(len(numeric_hashes), dtype=np.float64) if with_values else None
+    chunks = [
+        (numeric_hashes[start:start + chunk_size],
+         None if point_values is None else point_values[start:start + chunk_size])
+        for start in range(0, len(numeric_hashes), chunk_size)
+    ]
+
+    pyramid = aggregate_chunks(chunks, 25, min_precision=21)
+    expected = aggregate_hashes(numeric_hashes, point_values, 25, min_precision=21)
+
+    assert list(pyramid) == list(expected)
+    for precision, cells in pyramid.items():
+        assert cells.numeric_hashes.tolist() == expected[precision].numeric_hashes.tolist()
+        assert cells.counts.tolist() == expected[precision].counts.tolist()
+        if with_values and numeric_hashes:
+            assert cells.sums.tolist() == expected[precision].sums.tolist()
+
+
+def test_counts_only():
+    numeric_hashes = [12108871, 12108871, 29817833]
+    pyramid = aggregate_hashes(numeric_hashes, precision=25, min_precision=23)
+
+    assert list(pyramid) == [25, 23]
+    assert pyramid[25].numeric_hashes.tolist() == [12108871, 29817833]
+    assert pyramid[25].counts.tolist() == [2, 1]
+    assert pyramid[25].sums is None and pyramid[25].means is None
+    assert pyramid[23].counts.sum() == 3
+
+
+def test_values_length():
+    with pytest.raises(ValueError):
+        aggregate_hashes(np.array([12108871], dtype=np.uint64), [1.0, 2.0])
@@ -0,0 +1,150 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import warnings
+
+from hypothesis import given
+from hypothesis import strategies
+import pytest
+
+from geogrids.aio import BatchingGeocoder
+from geogrids.encoders.encoder import DecodingError, DecodingWarning
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+points = strategies.lists(
+    strategies.tuples(latitudes, longitudes, strategies.sampled_from(HASH_PRECISIONS)),
+    min_size=1, max_size=20
+)
+
+
+async def _round_trip(geocoder, latitude, longitude, precision):
+    numeric_hash = await geocoder.latitude_longitude_to_numeric_hash(latitude, longitude, precision)
+    encoded = await geocoder.hash_to_string(numeric_hash, precision)
+    decoded = await geocoder.string_to_hash(encoded)
+    coordinates = await geocoder.numeric_hash_to_latitude_longitude(numeric_hash, precision)
+    return numeric_hash, encoded, decoded, coordinates
+
+
+def _expected(latitude, longitude, precision):
+    encoder = geogrids.encoders.ducks
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(latitude, longitude, precision)
+    encoded = encoder.hash_to_string(numeric_hash, precision)
+    return (
+        numeric_hash, encoded, encoder.string_to_hash(encoded),
+        geogrids.gdgg.numeric_hash_to_latitude_longitude(numeric_hash, precision)
+    )
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+@given(points=points, max_batch=strategies.integers(min_value=1, max_value=8))
+def test_matches_scalar_functions(threaded, points, max_batch):
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            async with BatchingGeocoder(
+                    geogrids.encoders.ducks, max_batch=max_batch,
+                    executor=executor if threaded else None) as geocoder:
+                return await asyncio.gather(*(
+                    _round_trip(geocoder, *point) for point in points))
+
+    assert asyncio.run(main()) == [_expected(*point) for point in points]
+
+
+def test_batches():
+    calls = []
+
+    class CountingEncoder(geogrids.encoders.Encoder):
+        def encode_many(self, numeric_hashes, precision, chunk_size=65536):
+            calls.append(len(numeric_hashes))
+            return super().encode_many(numeric_hashes, precision, chunk_size)
+
+    async def main():
+        geocoder = BatchingGeocoder(CountingEncoder(), max_batch=4, max_delay=0.01)
+        first = await asyncio.gather(*(
+            geocoder.hash_to_string(numeric_hash, 25) for numeric_hash in range(10)))
+        # a lone request waits for the delay
+        second = await geocoder.hash_to_string(12108871, 25)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert calls == [4, 4, 2, 1]
+    assert first == [geogrids.encoders.fucks.hash_to_string(h, 25) for h in range(10)]
+    assert second == geogrids.encoders.fucks.hash_to_string(12108871, 25)
+
+
+def test_errors_and_warnings():
+    encoder = geogrids.encoders.ducks
+    encoded = encoder.hash_to_string(12108871, 25)
+
+    async def main():
+        geocoder = BatchingGeocoder(encoder)
+        return await asyncio.gather(
+            geocoder.string_to_hash('not a duck'),
+            geocoder.string_to_hash(encoded + ' not-a-duck'),
+            geocoder.numeric_hash_to_latitude_longitude(12108871, 67),
+            geocoder.numeric_hash_to_latitude_longitude(12108871, 25),
+            return_exceptions=True
+        )
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        bad, partial, too_precise, good = asyncio.run(main())
+
+    assert isinstance(bad, DecodingError)
+    assert partial == encoder.string_to_hash(encoded)
+    assert [warning.category for warning in caught] == [DecodingWarning]
+    assert too_precise == geogrids.gdgg.numeric_hash_to_latitude_longitude(12108871, 67)
+    assert good == geogrids.gdgg.numeric_hash_to_latitude_longitude(12108871, 25)
+
+
+def _scalar_outcome(func, *args):
+    try:
+        return func(*args)
+    except Exception as error:
+        return type(error)
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+def test_bad_requests_fail_alone(threaded):
+    encoder = geogrids.encoders.ducks
+    hashes = [(12108871, 25), (-1, 25), (2 ** 70, 25), (12108871, 67), (None, 25),
+              (1.5, 25), (12108871, None), (29817833, 25)]
+    coordinates = [(-35.6498, 150.2935, 25), (None, 0, 25), ('1', 2, 25), (float('nan'), 0, 25),
+                   (10 ** 400, 0, 25), (1, 2, 67), (True, 2, 25), (51.5007, -0.1246, 25)]
+    strings = [encoder.hash_to_string(12108871, 25), None, 'not-a-duck', 42,
+               b'bytes', encoder.hash_to_string(29817833, 25)]
+
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            async with BatchingGeocoder(
+                    encoder, executor=executor if threaded else None) as geocoder:
+                return await asyncio.gather(
+                    asyncio.gather(*(
+                        geocoder.numeric_hash_to_latitude_longitude(*args) for args in hashes),
+                        return_exceptions=True),
+                    asyncio.gather(*(
+                        geocoder.hash_to_string(*args) for args in hashes),
+                        return_exceptions=True),
+                    asyncio.gather(*(
+                        geocoder.latitude_longitude_to_numeric_hash(*args) for args in coordinates),
+                        return_exceptions=True),
+                    asyncio.gather(*(
+                        geocoder.string_to_hash(string) for string in strings),
+                        return_exceptions=True),
+                )
+
+    def outcomes(results):
+        return [type(result) if isinstance(result, Exception) else result for result in results]
+
+    decoded, encoded, numeric_hashes, strings_decoded = asyncio.run(main())
+    assert outcomes(decoded) == [
+        _scalar_outcome(geogrids.gdgg.numeric_hash_to_latitude_longitude, *args) for args in hashes]
+    assert outcomes(encoded) == [
+        _scalar_outcome(encoder.hash_to_string, *args) for args in hashes]
+    assert outcomes(numeric_hashes) == [
+        _scalar_outcome(geogrids.gdgg.latitude_longitude_to_numeric_hash, *args)
+        for args in coordinates]
+    assert outcomes(strings_decoded) == [
+        _scalar_outcome(encoder.string_to_hash, string) for string in strings]
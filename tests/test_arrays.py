@@ -0,0 +1,110 @@
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@given(
+    coordinates=strategies.lists(
+        strategies.tuples(latitudes, longitudes),
+        min_size=1,
+        max_size=50
+    ),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_latitude_longitude_to_numeric_hash_array(coordinates, precision):
+    lats, lons = zip(*coordinates)
+
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        lats, lons, precision
+    )
+
+    assert numeric_hashes.dtype == np.uint64
+    assert [int(h) for h in numeric_hashes] == [
+        geogrids.gdgg.latitude_longitude_to_numeric_hash(lat, lon, precision)
+        for lat, lon in coordinates
+    ], 'Vectorised hashes do not match the scalar hashes'
+
+
+def test_latitude_longitude_to_numeric_hash_array_broadcasts():
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        -35.6498, [150.2935, -150.2935]
+    )
+
+    assert numeric_hashes.shape == (2, )
+    assert numeric_hashes[0] == 12108871
+
+
+def test_latitude_longitude_to_numeric_hash_array_precision_too_high():
+    with pytest.raises(ValueError):
+        geogrids.gdgg.latitude_longitude_to_numeric_hash_array(0, 0, 65)
+
+
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+        min_size=1,
+        max_size=50
+    ),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_numeric_hash_to_latitude_longitude_array(numeric_hashes, precision):
+    coordinates = geogrids.gdgg.numeric_hash_to_latitude_longitude_array(
+        numeric_hashes, precision
+    )
+
+    assert coordinates.shape == (len(numeric_hashes), 2)
+    assert coordinates.tolist() == [
+        list(geogrids.gdgg.numeric_hash_to_latitude_longitude(h, precision))
+        for h in numeric_hashes
+    ], 'Vectorised coordinates do not match the scalar coordinates'
+
+
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+        min_size=1,
+        max_size=50
+    ),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_numeric_hash_to_area_array(numeric_hashes, precision):
+    vertices, poles = geogrids.gdgg.numeric_hash_to_area_array(
+        numeric_hashes, precision
+    )
+
+    assert vertices.shape == (len(numeric_hashes), 3, 2)
+    for numeric_hash, triangle, pole in zip(numeric_hashes, vertices, poles):
+        locations = geogrids.gdgg.numeric_hash_to_area(numeric_hash, precision)
+
+        assert len(locations) == (4 if pole else 3), 'Pole mask does not match'
+        assert [locations[0].latitude, locations[0].longitude] == triangle[0].tolist()
+        assert [locations[-1].latitude, locations[-1].longitude] == triangle[2].tolist()
+        assert locations[1].latitude == triangle[1][0]
+
+
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+        min_size=1,
+        max_size=50
+    ),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_numeric_hash_to_readable_hash_array(numeric_hashes, precision):
+    readable_hashes = geogrids.gdgg.numeric_hash_to_readable_hash_array(
+        numeric_hashes, precision
+    )
+
+    assert readable_hashes.tolist() == [
+        geogrids.gdgg.Location.numeric_hash_to_location(
+            h, precision).location_to_readable_hash()
+        for h in numeric_hashes
+    ]
@@ -0,0 +1,44 @@
+from hypothesis import given
+from hypothesis import strategies
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+@given(
+    numeric_hash=strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_cached_area_matches(numeric_hash, precision):
+    cache = geogrids.gdgg.AreaCache(8)
+    expected = tuple(
+        (location.latitude, location.longitude)
+        for location in geogrids.gdgg.numeric_hash_to_area(numeric_hash, precision)
+    )
+    readable_hash = geogrids.gdgg.Location.numeric_hash_to_location(
+        numeric_hash, precision).location_to_readable_hash()
+
+    assert cache.numeric_hash_to_area(numeric_hash, precision) == expected
+    assert cache.readable_hash_to_area(readable_hash) == expected
+    assert cache.cache_info().hits == 1
+
+
+def test_cache_info():
+    cache = geogrids.gdgg.AreaCache(2)
+
+    cache.numeric_hash_to_area(12108871, 25)
+    cache.numeric_hash_to_area(12108871 | 1 << 40, 25)  # same cell
+    cache.readable_hash_to_area('702020210311')
+    assert cache.cache_info() == (2, 1, 2, 1, 0)
+
+    cache.numeric_hash_to_area(1, 25)
+    cache.numeric_hash_to_area(2, 25)
+    assert cache.cache_info() == (2, 3, 2, 2, 1)
+
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0, 0)
+
+    cache.resize(None)
+    for numeric_hash in range(10):
+        cache.numeric_hash_to_area(numeric_hash, 25)
+    assert cache.cache_info() == (0, 10, None, 10, 0)
@@ -0,0 +1,93 @@
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids.gdgg import CompressedCellSet
+from geogrids.gdgg.cellset import _decode_varints, _encode_varints
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+points = strategies.lists(strategies.tuples(latitudes, longitudes), max_size=60)
+precisions = strategies.sampled_from(HASH_PRECISIONS)
+block_sizes = strategies.integers(min_value=1, max_value=10)
+
+
+def _hashes(coordinates, precision):
+    return [
+        geogrids.gdgg.Location.lat_lng_to_precise_location(
+            latitude, longitude, precision).location_to_numeric_hash()
+        for latitude, longitude in coordinates
+    ]
+
+
+@given(values=strategies.lists(strategies.integers(min_value=0, max_value=2 ** 64 - 1)))
+def test_varints_round_trip(values):
+    data, lengths = _encode_varints(np.array(values, dtype=np.uint64))
+    assert lengths.sum() == len(data)
+    assert _decode_varints(data.tobytes()).tolist() == values
+
+
+@given(coordinates=points, precision=precisions, block_size=block_sizes)
+def test_round_trip(coordinates, precision, block_size):
+    numeric_hashes = _hashes(coordinates, precision)
+    cells = CompressedCellSet(numeric_hashes, precision, block_size)
+
+    assert len(cells) == len(set(numeric_hashes))
+    assert sorted(cells) == sorted(set(numeric_hashes))
+    assert list(cells) == cells.numeric_hashes().tolist()
+    assert cells.keys().tolist() == sorted(
+        geogrids.gdgg.numeric_hash_to_prefix_key(numeric_hash, precision)
+        for numeric_hash in set(numeric_hashes))
+
+
+@given(coordinates=points, others=points, precision=precisions, block_size=block_sizes)
+def test_membership(coordinates, others, precision, block_size):
+    numeric_hashes = set(_hashes(coordinates, precision))
+    other_hashes = _hashes(others, precision)
+    cells = CompressedCellSet(list(numeric_hashes), precision, block_size)
+
+    for numeric_hash in numeric_hashes:
+        assert numeric_hash in cells
+    assert [numeric_hash in cells for numeric_hash in other_hashes] == \
+        [numeric_hash in numeric_hashes for numeric_hash in other_hashes]
+    assert cells.contains_array(np.array(other_hashes, dtype=np.uint64)).tolist() == \
+        [numeric_hash in numeric_hashes for numeric_hash in other_hashes]
+
+
+@given(first=points, second=points, precision=precisions, block_size=block_sizes)
+def test_union_and_intersection(first, second, precision, block_size):
+    first_hashes = set(_hashes(first, precision))
+    second_hashes = set(_hashes(second, precision))
+    first_cells = CompressedCellSet(list(first_hashes), precision, block_size)
+    second_cells = CompressedCellSet(list(second_hashes), precision)
+
+    assert sorted(first_cells | second_cells) == sorted(first_hashes | second_hashes)
+    assert sorted(first_cells & second_cells) == sorted(first_hashes & second_hashes)
+    assert first_cells | second_cells == CompressedCellSet(
+        list(first_hashes | second_hashes), precision)
+
+
+def test_clustered_cells_compress():
+    rng = np.random.default_rng(0)
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        rng.uniform(-36, -35, 10000), rng.uniform(150, 151, 10000), 33)
+    cells = CompressedCellSet(numeric_hashes, 33)
+
+    assert cells.nbytes < np.unique(numeric_hashes).nbytes / 3
+
+
+@pytest.mark.parametrize('block_size', [0, -1])
+def test_bad_block_size(block_size):
+    with pytest.raises(ValueError):
+        CompressedCellSet([1], 25, block_size=block_size)
+
+
+def test_mixed_precisions():
+    with pytest.raises(ValueError):
+        CompressedCellSet([1], 25) | CompressedCellSet([1], 27)
+    with pytest.raises(TypeError):
+        CompressedCellSet([1], 25) | {1}
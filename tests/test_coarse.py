@@ -0,0 +1,77 @@
+import math
+
+from hypothesis import given
+from hypothesis import strategies
+import pytest
+
+from geogrids.gdgg import oqtm
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@pytest.fixture(scope='module')
+def table():
+    return geogrids.gdgg.CoarseTable(levels=4, grid_bits=3)
+
+
+def _hash_without_table(latitude, longitude, precision):
+    octant, x, y = oqtm._lat_lng_to_octant(latitude, longitude)
+    return oqtm._subdivide(octant, x, y, precision)
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    precision=strategies.sampled_from(HASH_PRECISIONS + [10, 11, 12, 32])
+)
+def test_table_matches_subdivision(table, latitude, longitude, precision):
+    expected = _hash_without_table(latitude, longitude, precision)
+
+    oqtm._coarse_table = table
+    try:
+        assert oqtm._lat_lng_to_hash(latitude, longitude, precision) == expected
+        location = geogrids.gdgg.Location.lat_lng_to_precise_location(
+            latitude, longitude, precision)
+    finally:
+        geogrids.gdgg.disable_coarse_table()
+
+    assert (location.location_to_numeric_hash(), location.x, location.y) == expected
+
+
+@given(
+    x=strategies.floats(min_value=0, max_value=1),
+    y=strategies.floats(min_value=0, max_value=1),
+)
+def test_lookup_matches_subdivision(table, x, y):
+    found = table.lookup(x, y)
+    if found is not None:
+        assert found == oqtm._subdivide(0, x, y, table.start, 3)
+
+
+def test_lookup_fallback(table):
+    assert table.lookup(math.nan, 0.2) is None
+    assert table.lookup(1.0, 0.0) is None
+    # on the edge of a grid square
+    assert table.lookup(0.25, 0.1) is None
+    assert table.lookup(0.3, 0.1) is not None
+
+
+def test_enable_coarse_table():
+    expected = geogrids.gdgg.latitude_longitude_to_readable_hash(-35.6498, 150.2935, 25)
+
+    table = geogrids.gdgg.enable_coarse_table(levels=3)
+    try:
+        assert oqtm._coarse_table is table
+        assert table.nbytes == 2 * 4 ** 7
+        assert geogrids.gdgg.latitude_longitude_to_readable_hash(
+            -35.6498, 150.2935, 25) == expected
+    finally:
+        geogrids.gdgg.disable_coarse_table()
+    assert oqtm._coarse_table is None
+
+    with pytest.raises(ValueError):
+        geogrids.gdgg.CoarseTable(levels=8)
@@ -0,0 +1,116 @@
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+import geogrids
+
+
+# micro-degrees, as tiny longitudes round onto the far side of their octant
+# when hashed
+latitudes = strategies.integers(min_value=-89000000, max_value=89000000).map(lambda v: v / 1e6)
+longitudes = strategies.integers(min_value=-179000000, max_value=179000000).map(lambda v: v / 1e6)
+
+
+class Shape:
+
+    def __init__(self, coordinates):
+        self.coordinates = coordinates
+
+    @property
+    def __geo_interface__(self):
+        return {'type': 'Polygon', 'coordinates': self.coordinates}
+
+
+def _covered(cells, latitude, longitude):
+    for numeric_hash, precision in cells:
+        found = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+            latitude, longitude, precision)
+        if found == numeric_hash:
+            return True
+    return False
+
+
+def test_cover_octants():
+    assert geogrids.gdgg.cover((-180, -90, 180, 90)) == [
+        (octant, 3) for octant in range(8)]
+    assert geogrids.gdgg.cover((0, 0, 90, 90)) == [(2, 3)]
+
+
+def test_cover_mixes_precisions():
+    cells = geogrids.gdgg.cover((140, -40, 150, -30), 19)
+
+    precisions = {precision for _, precision in cells}
+    assert max(precisions) == 19
+    assert min(precisions) < 19
+    assert len(set(cells)) == len(cells)
+
+
+def test_cover_max_cells():
+    unlimited = geogrids.gdgg.cover((140, -40, 150, -30), 25)
+    limited = geogrids.gdgg.cover((140, -40, 150, -30), 25, max_cells=50)
+
+    assert len(limited) <= 50 < len(unlimited)
+
+
+def test_cover_hole():
+    outer = [(0, 0), (60, 10), (30, 70), (0, 0)]
+    hole = [(20, 20), (30, 20), (30, 30), (20, 20)]
+    cells = geogrids.gdgg.cover(Shape([outer, hole]), 21)
+
+    assert _covered(cells, 15, 20)
+    assert not _covered(cells, 23, 27)
+
+
+def test_cover_geometry_types():
+    ring = [(140, -40), (150, -40), (150, -30), (140, -30), (140, -40)]
+    expected = geogrids.gdgg.cover((140, -40, 150, -30), 15)
+
+    assert geogrids.gdgg.cover(Shape([ring]), 15) == expected
+    assert geogrids.gdgg.cover({
+        'type': 'Feature',
+        'properties': {},
+        'geometry': {'type': 'MultiPolygon', 'coordinates': [[ring]]}
+    }, 15) == expected
+
+    with pytest.raises(ValueError):
+        geogrids.gdgg.cover({'type': 'Point', 'coordinates': (0, 0)})
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    size=strategies.floats(min_value=0.01, max_value=1),
+    precision=strategies.sampled_from(range(11, 22, 2)),
+)
+def test_cover_contains_points(latitude, longitude, size, precision):
+    bounds = (longitude - size, latitude - size, longitude + size, latitude + size)
+    cells = geogrids.gdgg.cover(bounds, precision)
+
+    assert _covered(cells, latitude, longitude)
+    assert len(cells) == len(set(cells))
+
+
+@pytest.mark.parametrize('ring', [
+    [(-33.87, -61.15), (-5.08, -53.95), (-15.16, -36.68)],
+    [(100.5, 10.25), (170.75, 30.5), (120.25, 80.75)],
+])
+def test_cover_points_just_inside(ring):
+    cells = set(geogrids.gdgg.cover(Shape([ring]), 25))
+
+    # points a hair inside each edge, toward the middle of the triangle
+    centre = np.mean(ring, axis=0)
+    steps = np.linspace(0, 1, 400)[1:-1, None]
+    points = np.concatenate([
+        start + (end - start) * steps for start, end in
+        zip(np.array(ring), np.roll(ring, -1, axis=0))
+    ])
+    points += (centre - points) * 1e-6
+
+    found = np.zeros(len(points), dtype=bool)
+    for precision in {precision for _, precision in cells}:
+        numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+            points[:, 1], points[:, 0], precision)
+        found |= [(int(h), precision) in cells for h in numeric_hashes]
+
+    assert found.all(), points[~found].tolist()
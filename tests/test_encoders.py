@@ -1,8 +1,10 @@
 import os.path
 import string
 
+from hypothesis import assume
 from hypothesis import given
 from hypothesis import strategies
+import numpy as np
 import pytest
 
 from geogrids.encoders import wordlists
@@ -170,3 +172,105 @@ def test_second_word_broken(first_word, second_word):
         numeric_hash, precision = geogrids.encoders.cheeses.string_to_hash(encoded)
 
     assert precision > 0
+
+
+@given(
+    words=strategies.lists(
+        strategies.sampled_from(wordlists.cheeses),
+        min_size=1,
+        max_size=6
+    )
+)
+def test_positions_match_wordlist_index(words):
+    encoder = geogrids.encoders.cheeses
+
+    numeric_hash, precision = encoder.string_to_hash(' '.join(words))
+
+    expected = 0
+    for i, word in enumerate(words):
+        expected += wordlists.cheeses.index(word) * len(wordlists.cheeses) ** i
+    assert numeric_hash == expected
+    assert precision == len(words) * encoder.precision_per_word
+
+
+def test_positions_are_read_only():
+    encoder = geogrids.encoders.Encoder(wordlist=['a', 'b', 'a', 'c'])
+
+    assert encoder.positions['a'] == 0, 'Duplicated words use their first position'
+    with pytest.raises(TypeError):
+        encoder.positions['d'] = 3
+
+
+@pytest.mark.parametrize('name', ['fucks', 'cheeses', 'goshdarnits', 'pokes', 'ducks'])
+@given(data=strategies.data())
+def test_hash_to_string_round_trip(name, data):
+    encoder = getattr(geogrids.encoders, name)
+    precision = data.draw(strategies.sampled_from(encoder.precisions))
+    numeric_hash = data.draw(
+        strategies.integers(min_value=0, max_value=2 ** precision - 1))
+
+    encoded = encoder.hash_to_string(numeric_hash, precision)
+    words = encoded.split(encoder.separator)
+    # duplicated words in a wordlist always decode to their first position
+    assume(all(encoder.wordlist.count(word) == 1 for word in words))
+
+    assert len(words) == precision // encoder.precision_per_word
+    assert encoder.string_to_hash(encoded) == (numeric_hash, precision), \
+        'Hash did not survive the round trip'
+
+
+def test_hash_to_string_above_float_precision():
+    numeric_hash = 28888842190117118  # float division loses the low bits
+
+    encoded = geogrids.encoders.cheeses.hash_to_string(numeric_hash, 56)
+
+    assert geogrids.encoders.cheeses.string_to_hash(encoded) == (numeric_hash, 56)
+    assert encoded.split(' ')[0] == wordlists.cheeses[numeric_hash % 256]
+
+
+@pytest.mark.parametrize('name', ['fucks', 'cheeses', 'goshdarnits', 'pokes', 'ducks'])
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+        max_size=20
+    ),
+    precision=strategies.integers(min_value=1, max_value=59)
+)
+def test_encode_many(name, numeric_hashes, precision):
+    encoder = getattr(geogrids.encoders, name)
+
+    expected = [encoder.hash_to_string(h, precision) for h in numeric_hashes]
+
+    assert encoder.encode_many(numeric_hashes, precision) == expected
+    assert encoder.encode_many(
+        np.array(numeric_hashes, dtype=np.uint64), precision) == expected
+
+
+def test_encode_many_beyond_64_bits():
+    numeric_hashes = [2 ** 70 + 5, 3]
+
+    encoded = geogrids.encoders.cheeses.encode_many(numeric_hashes, 80)
+
+    assert encoded == [
+        geogrids.encoders.cheeses.hash_to_string(h, 80) for h in numeric_hashes
+    ]
+
+
+def test_decode_many():
+    encoder = geogrids.encoders.cheeses
+    encoded = [
+        encoder.hash_to_string(12108871, 32),
+        wordlists.goshdarnits[0],
+        ' '.join([wordlists.cheeses[0], wordlists.goshdarnits[0]]),
+        ' '.join([wordlists.cheeses[255]] * 9),
+    ]
+
+    numeric_hashes, precisions, errors = encoder.decode_many(iter(encoded))
+
+    assert numeric_hashes.dtype == np.uint64
+    assert numeric_hashes.tolist() == [12108871, 0, 0, 0]
+    assert precisions.tolist() == [32, 0, 8, 0]
+    assert errors[0] is None
+    assert isinstance(errors[1], DecodingError)
+    assert isinstance(errors[2], DecodingWarning)
+    assert isinstance(errors[3], OverflowError)
@@ -0,0 +1,82 @@
+import io
+import json
+
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+cells = strategies.lists(strategies.tuples(latitudes, longitudes), min_size=1, max_size=10)
+
+
+def _hashes(coordinates, precision):
+    latitudes, longitudes = zip(*coordinates)
+    return geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        latitudes, longitudes, precision)
+
+
+def _twice_area(ring):
+    return sum(
+        x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:]))
+
+
+@given(coordinates=cells, precision=strategies.sampled_from(HASH_PRECISIONS[:12]))
+def test_geojson_matches_area(coordinates, precision):
+    numeric_hashes = _hashes(coordinates, precision)
+    collection = json.loads(geogrids.gdgg.cells_to_geojson(
+        iter(numeric_hashes.tolist()), precision, batch_size=3))
+
+    assert collection['type'] == 'FeatureCollection'
+    assert len(collection['features']) == len(numeric_hashes)
+    for numeric_hash, feature in zip(numeric_hashes.tolist(), collection['features']):
+        assert feature['id'] == numeric_hash
+        assert feature['properties']['readable_hash'] == geogrids.gdgg.oqtm._hash_to_readable(
+            numeric_hash, precision)
+
+        ring = feature['geometry']['coordinates'][0]
+        area = geogrids.gdgg.numeric_hash_to_area(numeric_hash, precision)
+        assert ring[0] == ring[-1]
+        assert len(ring) == len(area) + 1
+        assert _twice_area(ring) >= 0
+        assert sorted(map(tuple, ring[:-1])) == pytest.approx(sorted(
+            (location.longitude, location.latitude) for location in area))
+
+
+@given(coordinates=cells, precision=strategies.sampled_from(HASH_PRECISIONS[:12]))
+def test_geoarrow_matches_geojson(coordinates, precision):
+    numeric_hashes = _hashes(coordinates, precision)
+    stream = io.StringIO()
+    geogrids.gdgg.cells_to_geojson(numeric_hashes, precision, stream)
+    features = json.loads(stream.getvalue())['features']
+
+    coordinates, ring_offsets, geometry_offsets = geogrids.gdgg.cells_to_geoarrow(
+        numeric_hashes, precision)
+    pairs = coordinates.reshape(-1, 2)
+
+    assert geometry_offsets.tolist() == list(range(len(features) + 1))
+    assert ring_offsets[-1] == len(pairs)
+    for feature, start, end in zip(features, ring_offsets[:-1], ring_offsets[1:]):
+        assert pairs[start:end].tolist() == feature['geometry']['coordinates'][0]
+
+
+def test_poles_are_squares():
+    # the top triangle of every level runs up to the pole
+    numeric_hashes = [0b10101100, 0b10101101]
+    coordinates, ring_offsets, _ = geogrids.gdgg.cells_to_geoarrow(numeric_hashes, 9)
+
+    assert np.diff(ring_offsets).tolist() == [5, 5]
+    assert coordinates.reshape(-1, 2)[1:3, 1] == pytest.approx([-90, -90])
+
+
+def test_empty():
+    assert json.loads(geogrids.gdgg.cells_to_geojson([], 25)) == {
+        'type': 'FeatureCollection', 'features': []}
+    coordinates, ring_offsets, geometry_offsets = geogrids.gdgg.cells_to_geoarrow([], 25)
+    assert len(coordinates) == 0
+    assert ring_offsets.tolist() == geometry_offsets.tolist() == [0]
@@ -0,0 +1,89 @@
+from fractions import Fraction
+
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids.gdgg import oqtm
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+precisions = strategies.sampled_from(HASH_PRECISIONS)
+
+
+def _subdivide_exact(x, y, precision):
+    """
+    ``oqtm._subdivide`` with fractions in place of floats
+    """
+    acc, half = 0, Fraction(1, 2)
+    for shift in range(3, precision, 2):
+        if y > half:
+            acc |= 1 << shift
+            x, y = x * 2, (y - half) * 2
+        elif y < half - x:
+            acc |= 2 << shift
+            x, y = x * 2, y * 2
+        elif x >= half:
+            acc |= 3 << shift
+            x, y = (x - half) * 2, y * 2
+        else:
+            x, y = 1 - x * 2, 1 - y * 2
+    return acc, x, y
+
+
+@given(
+    x=strategies.integers(min_value=0, max_value=oqtm._FIXED_ONE),
+    y=strategies.integers(min_value=0, max_value=oqtm._FIXED_ONE),
+    precision=precisions
+)
+def test_fixed_matches_exact_subdivision(x, y, precision):
+    acc, exact_x, exact_y = _subdivide_exact(
+        Fraction(x, oqtm._FIXED_ONE), Fraction(y, oqtm._FIXED_ONE), precision)
+
+    assert oqtm._subdivide_fixed(0, x, y, precision) == (
+        acc, exact_x * oqtm._FIXED_ONE, exact_y * oqtm._FIXED_ONE)
+
+
+@given(latitude=latitudes, longitude=longitudes, precision=precisions)
+def test_fixed_point_location(latitude, longitude, precision):
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision, fixed_point=True)
+
+    location = geogrids.gdgg.Location(latitude, longitude, fixed_point=True)
+    for _ in range(len(range(3, precision, 2))):
+        location.compute_level()
+    precise = geogrids.gdgg.Location.lat_lng_to_precise_location(
+        latitude, longitude, precision, fixed_point=True)
+
+    assert location.location_to_numeric_hash() == numeric_hash
+    assert precise.location_to_numeric_hash() == numeric_hash
+    assert (precise.x, precise.y) == (location.x, location.y)
+    assert geogrids.gdgg.latitude_longitude_to_readable_hash(
+        latitude, longitude, precision, fixed_point=True
+    ) == precise.location_to_readable_hash()
+
+
+@given(
+    coordinates=strategies.lists(strategies.tuples(latitudes, longitudes), min_size=1, max_size=20),
+    precision=precisions
+)
+def test_fixed_point_array(coordinates, precision):
+    latitudes, longitudes = zip(*coordinates)
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        latitudes, longitudes, precision, fixed_point=True)
+
+    assert numeric_hashes.tolist() == [
+        geogrids.gdgg.latitude_longitude_to_numeric_hash(
+            latitude, longitude, precision, fixed_point=True)
+        for latitude, longitude in coordinates
+    ]
+
+
+def test_fixed_point_array_not_finite():
+    with pytest.raises(ValueError):
+        geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+            [np.nan], [0.0], fixed_point=True)
@@ -354,3 +354,111 @@ def test_readable_hash_to_area(octant, levels):
     for location in locations:
         assert location.latitude is not None and location.longitude is not None, "Location failed to generate latitdue and longitude"
         assert -90 <= location.latitude <= 90 and -180 <= location.longitude <= 180, 'Latitude and longitude out of range'
+
+
+@given(
+    latitude=strategies.floats(min_value=-90, max_value=90, allow_nan=False,
+                               allow_infinity=False),
+    longitude=strategies.floats(min_value=-180, max_value=180, allow_nan=False,
+                                allow_infinity=False),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_hashes_match_compute_level(latitude, longitude, precision):
+    location = geogrids.gdgg.Location(latitude=latitude, longitude=longitude)
+    for current_precision in range(3, precision, 2):
+        location.compute_level()
+
+    assert geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision
+    ) == location.location_to_numeric_hash(), 'Numeric hash does not match the levels'
+    assert geogrids.gdgg.latitude_longitude_to_readable_hash(
+        latitude, longitude, precision
+    ) == location.location_to_readable_hash(), 'Readable hash does not match the levels'
+
+    precise = geogrids.gdgg.Location.lat_lng_to_precise_location(
+        latitude, longitude, precision
+    )
+    assert (precise.x, precise.y) == (location.x, location.y), 'Remainder does not match'
+
+
+# hashes from the original Location.compute_level implementation
+GOLDEN_HASHES = [
+    (51.5074, -0.1278, 24050665, 344987467185129, '113313313132'),
+    (-33.8688, 151.2093, 4029511, 6359352994528327, '702023322310'),
+    (40.7128, -74.006, 26712545, 35823001271769569, '103303033203'),
+    (0.0, 0.0, 22369622, 24019198012642646, '622222222222'),
+    (-90.0, 0.0, 11184814, 12009599006321326, '611111111111'),
+    (89.9, 179.9, 15379115, 161743014374059, '311111111131'),
+    (35.6762, 139.6503, 23070339, 2485172052166275, '300130000032'),
+    (-22.9068, -43.1729, 15766917, 22725942215480709, '500322010231'),
+]
+
+
+@pytest.mark.parametrize('latitude,longitude,hash_25,hash_55,readable_25', GOLDEN_HASHES)
+def test_golden_hashes(latitude, longitude, hash_25, hash_55, readable_25):
+    assert geogrids.gdgg.latitude_longitude_to_numeric_hash(latitude, longitude, 25) == hash_25
+    assert geogrids.gdgg.latitude_longitude_to_numeric_hash(latitude, longitude, 55) == hash_55
+    assert geogrids.gdgg.latitude_longitude_to_readable_hash(latitude, longitude, 25) == readable_25
+
+
+@pytest.mark.parametrize('numeric_hash,latitude,longitude', [
+    (12108871, -35.65283203125, 150.2789682218808),
+    (29817833, 51.49072265625, -0.1643272851762987),
+])
+def test_golden_coordinates(numeric_hash, latitude, longitude):
+    assert geogrids.gdgg.numeric_hash_to_latitude_longitude(numeric_hash, 25) == \
+        pytest.approx((latitude, longitude), abs=1e-12)
+
+
+@given(
+    octant=strategies.integers(min_value=0, max_value=7),
+    levels=strategies.lists(
+        strategies.integers(min_value=0, max_value=3),
+        min_size=0,
+        max_size=28
+    ),
+)
+def test_readable_and_numeric_hashes_agree(octant, levels):
+    readable_hash = str(octant) + ''.join(str(i) for i in levels)
+    precision = 3 + 2 * len(levels)
+
+    location = geogrids.gdgg.Location.levels_to_location(octant, levels)
+    numeric_hash = location.location_to_numeric_hash()
+
+    assert geogrids.gdgg.readable_hash_to_latitude_longitude(readable_hash) == \
+        geogrids.gdgg.numeric_hash_to_latitude_longitude(numeric_hash, precision) == \
+        (location.latitude, location.longitude), 'Back-computed locations differ'
+    assert repr(geogrids.gdgg.readable_hash_to_area(readable_hash)) == \
+        repr(geogrids.gdgg.numeric_hash_to_area(numeric_hash, precision))
+
+
+def test_location_has_no_instance_dict():
+    location = geogrids.gdgg.Location(latitude=-35.6498, longitude=150.2935)
+
+    assert not hasattr(location, '__dict__'), 'Location should use slots'
+    with pytest.raises(AttributeError):
+        location.elevation = 10
+
+
+@given(
+    octant=strategies.integers(min_value=0, max_value=7),
+    levels=strategies.lists(
+        strategies.integers(min_value=0, max_value=3),
+        min_size=0,
+        max_size=28
+    ),
+)
+def test_levels_view(octant, levels):
+    location = geogrids.gdgg.Location.levels_to_location(octant, levels)
+
+    assert location.levels == levels
+    assert len(location.levels) == len(levels)
+    assert list(reversed(location.levels)) == levels[::-1]
+    assert location.levels[1:-1] == levels[1:-1]
+    if levels:
+        assert location.levels[-1] == levels[-1]
+        with pytest.raises(TypeError):
+            location.levels[0] = 1
+    with pytest.raises(IndexError):
+        location.levels[len(levels)]
+    assert repr(location) == f'<Location [{octant}{"".join(str(i) for i in levels)}]>'
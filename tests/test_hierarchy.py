@@ -0,0 +1,82 @@
+from hypothesis import given
+from hypothesis import strategies
+import pytest
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    precisions=strategies.lists(
+        strategies.sampled_from(HASH_PRECISIONS), min_size=2, max_size=2, unique=True)
+)
+def test_parent_matches_hashing(latitude, longitude, precisions):
+    to_precision, precision = sorted(precisions)
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision)
+    expected = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, to_precision)
+
+    assert geogrids.gdgg.parent(numeric_hash, precision, to_precision) == expected
+    assert geogrids.gdgg.to_precision(numeric_hash, precision, to_precision) == expected
+    assert geogrids.gdgg.parent_array(
+        [numeric_hash], precision, to_precision).tolist() == [expected]
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    precision=strategies.sampled_from(HASH_PRECISIONS[:-1])
+)
+def test_children_match_hashing(latitude, longitude, precision):
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision)
+    children = geogrids.gdgg.children(numeric_hash, precision)
+
+    assert geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision + 2) in children
+    assert [geogrids.gdgg.parent(child, precision + 2) for child in children] == \
+        [numeric_hash] * 4
+    assert geogrids.gdgg.children_array([numeric_hash], precision).tolist() == [children]
+
+
+@given(
+    numeric_hash=strategies.integers(min_value=0, max_value=2 ** 25 - 1),
+    to_precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_to_precision_finer(numeric_hash, to_precision):
+    extended = geogrids.gdgg.to_precision(numeric_hash, 25, to_precision)
+
+    assert geogrids.gdgg.to_precision(extended, to_precision, 25) == \
+        geogrids.gdgg.to_precision(numeric_hash, 25, to_precision)
+    assert geogrids.gdgg.to_precision_array(
+        [numeric_hash], 25, to_precision).tolist() == [extended]
+    if to_precision >= 25:
+        latitude, longitude = geogrids.gdgg.numeric_hash_to_latitude_longitude(
+            extended, to_precision)
+        assert geogrids.gdgg.latitude_longitude_to_numeric_hash(
+            latitude, longitude, 25) == numeric_hash, 'The finer cell should be inside the original'
+
+
+def test_children_must_fit_64_bits():
+    with pytest.raises(ValueError):
+        geogrids.gdgg.children(12108871, 63)
+    with pytest.raises(ValueError):
+        geogrids.gdgg.children_array([12108871], 63)
+    assert geogrids.gdgg.children(12108871, 61) == \
+        geogrids.gdgg.children_array([12108871], 61).tolist()[0]
+
+
+def test_parent_must_be_coarser():
+    with pytest.raises(ValueError):
+        geogrids.gdgg.parent(12108871, 25, 27)
+    with pytest.raises(ValueError):
+        geogrids.gdgg.parent(3, 3)
+    with pytest.raises(ValueError):
+        geogrids.gdgg.children_array([12108871], 63)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from geogrids.index import OQTMIndex, _distances
+
+
+@pytest.fixture(scope='module')
+def points():
+    rng = np.random.default_rng(7)
+    latitudes = rng.uniform(-90, 90, 2000)
+    longitudes = rng.uniform(-180, 180, 2000)
+    return list(range(2000)), latitudes, longitudes
+
+
+@pytest.fixture
+def index(points):
+    index = OQTMIndex(precision=9)
+    index.load(*points)
+    return index
+
+
+@pytest.mark.parametrize('latitude, longitude', [
+    (-35.6498, 150.2935), (89.9, 10), (0, -180), (-0.5, 0.5)])
+@pytest.mark.parametrize('distance', [1e5, 1e6, 5e6])
+def test_radius(index, points, latitude, longitude, distance):
+    items, latitudes, longitudes = points
+    distances = _distances(latitude, longitude, latitudes, longitudes)
+    expected = sorted(np.flatnonzero(distances <= distance).tolist(), key=distances.__getitem__)
+
+    found = index.radius(latitude, longitude, distance)
+
+    assert [item for item, _ in found] == expected
+    assert [d for _, d in found] == pytest.approx(distances[expected].tolist())
+
+
+@pytest.mark.parametrize('latitude, longitude', [
+    (-35.6498, 150.2935), (-89.9, 10), (45, 179.9)])
+@pytest.mark.parametrize('k', [1, 10, 100])
+def test_nearest(index, points, latitude, longitude, k):
+    items, latitudes, longitudes = points
+    distances = _distances(latitude, longitude, latitudes, longitudes)
+
+    found = index.nearest(latitude, longitude, k)
+
+    assert [d for _, d in found] == pytest.approx(np.sort(distances)[:k].tolist())
+
+
+def test_nearest_none(index):
+    assert index.nearest(-35.6498, 150.2935, 0) == []
+
+    with pytest.raises(ValueError):
+        index.nearest(-35.6498, 150.2935, -1)
+
+
+def test_insert_delete():
+    index = OQTMIndex()
+    index.insert('a', -35.6498, 150.2935)
+    index.insert('b', -35.65, 150.29)
+    index.insert('a', 51.5007, -0.1246)
+
+    assert len(index) == 2
+    assert index.location('a') == (51.5007, -0.1246)
+    assert [item for item, _ in index.nearest(-35.6498, 150.2935, 2)] == ['b', 'a']
+
+    index.delete('b')
+    assert 'b' not in index
+    assert index.radius(-35.6498, 150.2935, 1000) == []
+    assert index.nearest(-35.6498, 150.2935, 5)[0][0] == 'a'
+
+    with pytest.raises(KeyError):
+        index.delete('b')
+
+    index.insert('c', 0, 0)
+    assert sorted(index) == ['a', 'c']
+
+
+def test_memory_usage(index):
+    usage = index.memory_usage()
+
+    assert usage['coordinates'] >= 2000 * 24
+    assert usage['total'] == usage['coordinates'] + usage['slots'] + usage['buckets']
@@ -0,0 +1,62 @@
+from hypothesis import given
+from hypothesis import strategies
+
+from geogrids import instrumentation
+from geogrids.gdgg import oqtm
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@given(latitude=latitudes, longitude=longitudes)
+def test_instrumented_results_unchanged(latitude, longitude):
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(latitude, longitude)
+    area = geogrids.gdgg.numeric_hash_to_area(numeric_hash)
+    encoded = geogrids.encoders.ducks.hash_to_string(numeric_hash, 25)
+    decoded = geogrids.encoders.ducks.string_to_hash(encoded)
+
+    with instrumentation.instrumented():
+        assert geogrids.gdgg.latitude_longitude_to_numeric_hash(latitude, longitude) == numeric_hash
+        assert [
+            (location.latitude, location.longitude)
+            for location in geogrids.gdgg.numeric_hash_to_area(numeric_hash)
+        ] == [(location.latitude, location.longitude) for location in area]
+        assert geogrids.encoders.ducks.hash_to_string(numeric_hash, 25) == encoded
+        assert geogrids.encoders.ducks.string_to_hash(encoded) == decoded
+
+
+def test_counts():
+    original = oqtm._subdivide
+
+    with instrumentation.instrumented():
+        assert instrumentation.is_enabled()
+        with instrumentation.instrumented():
+            geogrids.gdgg.latitude_longitude_to_numeric_hash(-35.6498, 150.2935)
+        assert instrumentation.is_enabled()
+        location = geogrids.gdgg.Location(-35.6498, 150.2935)
+        location.compute_level()
+        location.compute_level()
+        geogrids.encoders.ducks.string_to_hash(
+            geogrids.encoders.ducks.hash_to_string(12108871, 25))
+
+    assert not instrumentation.is_enabled()
+    assert oqtm._subdivide is original
+
+    stats = instrumentation.snapshot()
+    assert stats['_subdivide']['calls'] == 3
+    assert stats['Location._compute_octant']['calls'] == 1
+    assert stats['Location.compute_level']['calls'] == 2
+    assert stats['Encoder.hash_to_string']['calls'] == 1
+    assert stats['Encoder._decode']['calls'] == 1
+    assert stats['Encoder.decode_many']['calls'] == 0
+    assert stats['Encoder.decode_many']['mean_ns'] == 0
+    assert stats['_subdivide']['total_ns'] > 0
+
+    # nothing is counted once disabled
+    geogrids.gdgg.latitude_longitude_to_numeric_hash(-35.6498, 150.2935)
+    assert instrumentation.snapshot() == stats
+
+    instrumentation.reset()
+    assert all(stage['calls'] == 0 for stage in instrumentation.snapshot().values())
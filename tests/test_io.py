@@ -0,0 +1,91 @@
+import struct
+
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids import io
+from geogrids.aggregate import aggregate_hashes
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+hashes = strategies.lists(strategies.integers(min_value=0, max_value=2 ** 64 - 1), max_size=50)
+
+
+@given(numeric_hashes=hashes, precision=strategies.sampled_from(HASH_PRECISIONS),
+       chunk_size=strategies.integers(min_value=1, max_value=8))
+def test_round_trip(tmp_path_factory, numeric_hashes, precision, chunk_size):
+    path = tmp_path_factory.mktemp('io') / 'hashes.oqtm'
+
+    # from a generator, a chunk at a time
+    assert io.write_hashes(path, iter(numeric_hashes), precision, chunk_size) == len(numeric_hashes)
+    assert path.stat().st_size == 32 + 8 * len(numeric_hashes)
+
+    with io.HashFile(path) as hash_file:
+        assert (hash_file.version, hash_file.precision) == (io.VERSION, precision)
+        assert len(hash_file) == len(numeric_hashes)
+        assert hash_file[:].tolist() == numeric_hashes
+        assert [
+            numeric_hash for chunk in hash_file.chunks(chunk_size)
+            for numeric_hash in chunk.tolist()
+        ] == numeric_hashes
+
+
+def test_decode_and_aggregate(tmp_path):
+    path = tmp_path / 'points.oqtm'
+    latitudes = np.linspace(-89, 89, 101)
+    longitudes = np.linspace(-179, 179, 101)
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        latitudes, longitudes, 25)
+    io.write_hashes(path, numeric_hashes, 25)
+
+    with io.HashFile(path) as hash_file:
+        assert isinstance(hash_file.hashes, np.memmap)
+        coordinates = np.concatenate(list(hash_file.latitude_longitude(chunk_size=10)))
+        pyramid = hash_file.aggregate(latitudes, min_precision=21, chunk_size=7)
+        with pytest.raises(ValueError):
+            hash_file.aggregate(latitudes[1:])
+
+    assert coordinates.tolist() == geogrids.gdgg.numeric_hash_to_latitude_longitude_array(
+        numeric_hashes, 25).tolist()
+    expected = aggregate_hashes(numeric_hashes, latitudes, 25, 21)
+    assert list(pyramid) == list(expected)
+    for precision, cells in pyramid.items():
+        assert cells.numeric_hashes.tolist() == expected[precision].numeric_hashes.tolist()
+        assert cells.counts.tolist() == expected[precision].counts.tolist()
+        assert np.allclose(cells.sums, expected[precision].sums)
+
+
+def test_create_in_place(tmp_path):
+    path = tmp_path / 'filled.oqtm'
+    with io.create_hashes(path, 4, precision=9) as hash_file:
+        hash_file[:] = [1, 2, 3, 4]
+        hash_file[3] = 12
+
+    with io.HashFile(path) as hash_file:
+        assert hash_file.precision == 9
+        assert hash_file[:].tolist() == [1, 2, 3, 12]
+
+    with io.create_hashes(tmp_path / 'empty.oqtm', 0) as hash_file:
+        assert len(hash_file) == 0
+
+
+def test_bad_files(tmp_path):
+    path = tmp_path / 'bad.oqtm'
+
+    path.write_bytes(b'not a hash file')
+    with pytest.raises(ValueError):
+        io.HashFile(path)
+
+    path.write_bytes(struct.pack('<8sHHIQ8x', b'OQTMHASH', 99, 25, 0, 0))
+    with pytest.raises(ValueError):
+        io.HashFile(path)
+
+    path.write_bytes(struct.pack('<8sHHIQ8x', b'OQTMHASH', 1, 25, 0, 3) + bytes(8))
+    with pytest.raises(ValueError):
+        io.HashFile(path)
+
+    with pytest.raises(ValueError):
+        io.write_hashes(path, [1], precision=67)
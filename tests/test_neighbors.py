@@ -0,0 +1,73 @@
+from hypothesis import given
+from hypothesis import strategies
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+def _vertices(numeric_hash, precision):
+    vertices, _ = geogrids.gdgg.numeric_hash_to_area_array([numeric_hash], precision)
+    return vertices[0]
+
+
+def _same_vertex(a, b):
+    if abs(abs(a[0]) - 90) < 1e-6:  # any longitude at the poles
+        return abs(a[0] - b[0]) < 1e-6
+    return abs(a[0] - b[0]) < 1e-6 and abs((a[1] - b[1] + 180) % 360 - 180) < 1e-6
+
+
+def test_octant_neighbors():
+    assert geogrids.gdgg.edge_neighbors(0, 3) == [3, 4, 1]
+    assert geogrids.gdgg.neighbors(0, 3) == [3, 4, 1, 7, 5, 2]
+
+
+@given(
+    numeric_hash=strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_neighbors_are_symmetric(numeric_hash, precision):
+    numeric_hash &= (1 << precision) - 1
+    neighbors = geogrids.gdgg.neighbors(numeric_hash, precision)
+
+    assert numeric_hash not in neighbors
+    assert len(set(neighbors)) == len(neighbors)
+    assert len(neighbors) in ((6, ) if precision == 3 else (10, 12))
+    for neighbor in neighbors[:3]:
+        assert numeric_hash in geogrids.gdgg.edge_neighbors(neighbor, precision)
+    for neighbor in neighbors:
+        assert numeric_hash in geogrids.gdgg.neighbors(neighbor, precision)
+
+
+@given(
+    numeric_hash=strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+    precision=strategies.sampled_from(HASH_PRECISIONS[:15])
+)
+def test_neighbors_share_vertices(numeric_hash, precision):
+    vertices = _vertices(numeric_hash, precision)
+
+    for i, neighbor in enumerate(geogrids.gdgg.neighbors(numeric_hash, precision)):
+        shared = sum(
+            any(_same_vertex(a, b) for b in _vertices(neighbor, precision))
+            for a in vertices
+        )
+        assert shared == (2 if i < 3 else 1)
+
+
+@given(
+    numeric_hashes=strategies.lists(
+        strategies.integers(min_value=0, max_value=2 ** 59 - 1),
+        min_size=1,
+        max_size=50
+    ),
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_neighbors_array(numeric_hashes, precision):
+    edges, vertices, mask = geogrids.gdgg.neighbors_array(numeric_hashes, precision)
+
+    assert edges.shape == (len(numeric_hashes), 3)
+    assert vertices.shape == mask.shape == (len(numeric_hashes), 9)
+    assert not vertices[~mask].any()
+    for i, numeric_hash in enumerate(numeric_hashes):
+        neighbors = geogrids.gdgg.neighbors(numeric_hash, precision)
+        assert edges[i].tolist() == neighbors[:3]
+        assert vertices[i][mask[i]].tolist() == neighbors[3:]
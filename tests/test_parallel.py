@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from geogrids import parallel
+from geogrids.encoders.encoder import DecodingError
+import geogrids
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with ProcessPoolExecutor(2) as pool:
+        yield pool
+
+
+@pytest.fixture(scope='module')
+def coordinates():
+    rng = np.random.default_rng(42)
+    return rng.uniform(-90, 90, 1000), rng.uniform(-180, 180, 1000)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000, 5000])
+def test_latitude_longitude_to_numeric_hash(executor, coordinates, chunk_size):
+    latitudes, longitudes = coordinates
+
+    numeric_hashes = parallel.latitude_longitude_to_numeric_hash(
+        latitudes, longitudes, 33, chunk_size=chunk_size, executor=executor)
+
+    assert numeric_hashes.dtype == np.uint64
+    np.testing.assert_array_equal(
+        numeric_hashes,
+        geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+            latitudes, longitudes, 33)
+    )
+
+
+def test_latitude_longitude_to_numeric_hash_iterators(executor, coordinates):
+    latitudes, longitudes = coordinates
+
+    numeric_hashes = parallel.latitude_longitude_to_numeric_hash(
+        iter(latitudes.tolist()), iter(longitudes.tolist()), 25,
+        chunk_size=64, executor=executor)
+
+    np.testing.assert_array_equal(
+        numeric_hashes,
+        geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+            latitudes, longitudes, 25)
+    )
+
+
+def test_numeric_hash_to_latitude_longitude(executor, coordinates):
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        *coordinates, 41)
+
+    np.testing.assert_array_equal(
+        parallel.numeric_hash_to_latitude_longitude(
+            numeric_hashes, 41, chunk_size=100, executor=executor),
+        geogrids.gdgg.numeric_hash_to_latitude_longitude_array(
+            numeric_hashes, 41)
+    )
+
+
+def test_empty(executor):
+    assert parallel.latitude_longitude_to_numeric_hash(
+        [], [], executor=executor).shape == (0,)
+    assert parallel.numeric_hash_to_latitude_longitude(
+        iter([]), executor=executor).shape == (0, 2)
+    assert parallel.encode_many(
+        geogrids.encoders.fucks, [], 25, executor=executor) == []
+
+
+def test_own_pool(coordinates):
+    latitudes, longitudes = coordinates
+
+    np.testing.assert_array_equal(
+        parallel.latitude_longitude_to_numeric_hash(
+            latitudes, longitudes, chunk_size=300, max_workers=2),
+        geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+            latitudes, longitudes)
+    )
+
+
+@pytest.mark.parametrize('encoder', [
+    geogrids.encoders.cheeses,
+    geogrids.encoders.Encoder(geogrids.encoders.wordlists.ducks, '-'),
+    geogrids.encoders.Encoder([f'w{i}' for i in range(64)], '.'),
+])
+def test_encode_decode_many(executor, coordinates, encoder):
+    rebuilt = parallel._encoder(*parallel._encoder_key(encoder))
+    assert (type(rebuilt), rebuilt.wordlist, rebuilt.separator) == \
+        (type(encoder), encoder.wordlist, encoder.separator), \
+        'Workers should rebuild the same encoder'
+
+    numeric_hashes = geogrids.gdgg.latitude_longitude_to_numeric_hash_array(
+        *coordinates, 49)
+
+    encoded = parallel.encode_many(
+        encoder, numeric_hashes, 49, chunk_size=99, executor=executor)
+    assert encoded == encoder.encode_many(numeric_hashes, 49)
+
+    encoded[3] = 'nonsense'
+    decoded, precisions, errors = parallel.decode_many(
+        encoder, encoded, chunk_size=99, executor=executor)
+    expected = encoder.decode_many(encoded)
+
+    np.testing.assert_array_equal(decoded, expected[0])
+    np.testing.assert_array_equal(precisions, expected[1])
+    assert isinstance(errors[3], DecodingError)
+    assert errors[3].word == 'nonsense'
+    assert errors[:3] + errors[4:] == [None] * (len(encoded) - 1)
+
+
+def test_encode_many_beyond_64_bits(executor):
+    encoder = geogrids.encoders.cheeses
+    numeric_hashes = [1 << 70, 5]
+
+    assert parallel.encode_many(
+        encoder, numeric_hashes, 72, executor=executor
+    ) == [encoder.hash_to_string(h, 72) for h in numeric_hashes]
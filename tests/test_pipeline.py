@@ -0,0 +1,167 @@
+import csv
+
+from hypothesis import given
+from hypothesis import strategies
+import numpy as np
+import pytest
+
+from geogrids import pipeline
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@given(
+    coordinates=strategies.lists(
+        strategies.tuples(latitudes, longitudes),
+        min_size=1,
+        max_size=20
+    ),
+    hash_format=strategies.sampled_from(pipeline.HASH_FORMATS)
+)
+def test_encode_hashes(coordinates, hash_format):
+    lats, lons = zip(*coordinates)
+
+    hashes = pipeline.encode_hashes(
+        lats, lons, precision=33, hash_format=hash_format,
+        encoder=geogrids.encoders.cheeses
+    )
+
+    numeric_hashes = [
+        geogrids.gdgg.latitude_longitude_to_numeric_hash(lat, lon, 33)
+        for lat, lon in coordinates
+    ]
+    if hash_format == 'numeric':
+        assert hashes == [str(h) for h in numeric_hashes]
+    elif hash_format == 'readable':
+        assert hashes == [
+            geogrids.gdgg.latitude_longitude_to_readable_hash(lat, lon, 33)
+            for lat, lon in coordinates
+        ]
+    else:
+        assert hashes == [
+            geogrids.encoders.cheeses.hash_to_string(h, 33) for h in numeric_hashes
+        ]
+
+
+@pytest.mark.parametrize('hash_format', pipeline.HASH_FORMATS)
+def test_decode_hashes(hash_format):
+    hashes = pipeline.encode_hashes([-35.6498, 51.5007], [150.2935, -0.1246],
+                                    precision=25, hash_format=hash_format)
+
+    coordinates = pipeline.decode_hashes(
+        hashes + ['not a hash'], precision=25, hash_format=hash_format)
+
+    expected = [
+        geogrids.gdgg.numeric_hash_to_latitude_longitude(
+            geogrids.gdgg.latitude_longitude_to_numeric_hash(lat, lon, 25), 25)
+        for lat, lon in [(-35.6498, 150.2935), (51.5007, -0.1246)]
+    ]
+    assert np.allclose(coordinates[:2], expected, rtol=0, atol=1e-9), \
+        'Every format should decode to the same point at the same precision'
+    assert np.isnan(coordinates[2]).all(), 'Bad hashes should decode to NaN'
+
+
+def test_decode_words_at_word_precision():
+    # 3 cheeses words carry 24 bits, less than the precision asked for
+    hashes = pipeline.encode_hashes([-35.6498], [150.2935], precision=23,
+                                    hash_format='words')
+    coordinates = pipeline.decode_hashes(hashes, precision=25, hash_format='words')
+
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(-35.6498, 150.2935, 23)
+    assert coordinates.tolist() == [
+        list(geogrids.gdgg.numeric_hash_to_latitude_longitude_array([numeric_hash], 24)[0])]
+
+
+def test_rows_with_missing_fields():
+    rows = [['-35.6498', '150.2935'], [], ['51.5007']]
+
+    encoded = [row for chunk in pipeline.encode_rows(rows, chunk_size=2) for row in chunk]
+    assert encoded == [['-35.6498', '150.2935', '12108871'], [''], ['51.5007', '']]
+
+    decoded = [row for chunk in pipeline.decode_rows([['12108871'], []]) for row in chunk]
+    assert decoded[0][1:] == list(geogrids.gdgg.numeric_hash_to_latitude_longitude(12108871, 25))
+    assert decoded[1] == ['', '']
+
+
+def test_decode_non_ascii_digits():
+    for hash_format in ('numeric', 'readable'):
+        coordinates = pipeline.decode_hashes(['12108871', '\u00b2', '1\u00b2'],
+                                             hash_format=hash_format)
+        assert np.isnan(coordinates[1:]).all(), 'Superscript digits are not hashes'
+
+
+def test_chunk_size_must_be_positive():
+    for chunk_size in (0, -1):
+        with pytest.raises(ValueError):
+            list(pipeline.encode_rows([['1', '2']], chunk_size=chunk_size))
+        with pytest.raises(ValueError):
+            list(pipeline.decode_rows([['12108871']], chunk_size=chunk_size))
+
+
+def test_encode_hashes_skips_invalid_coordinates():
+    hashes = pipeline.encode_hashes([-35.6498, np.nan], [150.2935, 0])
+
+    assert hashes == ['12108871', '']
+
+
+def test_command_line_round_trip(tmp_path, capsys):
+    points = tmp_path / 'points.csv'
+    hashed = tmp_path / 'hashed.csv'
+    decoded = tmp_path / 'decoded.csv'
+    points.write_text('id,latitude,longitude\n1,-35.6498,150.2935\n2,oops,0\n')
+
+    pipeline.main(['encode', '--format', 'words', '--encoder', 'cheeses',
+                   '--precision', '33', '--chunk-size', '1',
+                   str(points), str(hashed)])
+    pipeline.main(['decode', '--format', 'words', '--encoder', 'cheeses',
+                   '--latitude-column', 'lat', '--longitude-column', 'lng',
+                   str(hashed), str(decoded)])
+
+    rows = list(csv.DictReader(decoded.open()))
+    assert rows[0]['hash'] == geogrids.encoders.cheeses.hash_to_string(
+        geogrids.gdgg.latitude_longitude_to_numeric_hash(-35.6498, 150.2935, 33), 33)
+    assert abs(float(rows[0]['lat']) + 35.6498) < 0.01
+    assert rows[1]['hash'] == rows[1]['lat'] == ''
+    assert 'rows/s' in capsys.readouterr().err
+
+
+def test_command_line_blank_and_short_rows(tmp_path):
+    points = tmp_path / 'points.csv'
+    hashed = tmp_path / 'hashed.csv'
+    points.write_text('id,latitude,longitude\n1,-35.6498,150.2935\n\n2,51.5007\n')
+
+    assert pipeline.main(['encode', str(points), str(hashed)]) is None
+
+    rows = list(csv.reader(hashed.open()))
+    assert rows == [
+        ['id', 'latitude', 'longitude', 'hash'],
+        ['1', '-35.6498', '150.2935', '12108871'],
+        ['', '', '', ''],
+        ['2', '51.5007', '', ''],
+    ]
+
+
+@pytest.mark.parametrize('option', [['--chunk-size', '0'], ['--precision', '65']])
+def test_command_line_bad_options(tmp_path, option):
+    points = tmp_path / 'points.csv'
+    output = tmp_path / 'out.csv'
+    points.write_text('latitude,longitude\n1,2\n')
+    output.write_text('keep me')
+
+    with pytest.raises(SystemExit):
+        pipeline.main(['encode'] + option + [str(points), str(output)])
+    assert output.read_text() == 'keep me', 'Output should not be opened with bad options'
+
+
+def test_command_line_missing_column(tmp_path):
+    points = tmp_path / 'points.csv'
+    output = tmp_path / 'out.csv'
+    points.write_text('lat,lon\n1,2\n')
+    output.write_text('keep me')
+
+    with pytest.raises(SystemExit):
+        pipeline.main(['encode', str(points), str(output)])
+    assert output.read_text() == 'keep me', 'Output should not be opened on a bad header'
@@ -0,0 +1,72 @@
+import bisect
+
+from hypothesis import given
+from hypothesis import strategies
+import pytest
+
+from geogrids.gdgg.oqtm import HASH_PRECISIONS
+import geogrids
+
+
+latitudes = strategies.floats(min_value=-90, max_value=90, allow_nan=False, allow_infinity=False)
+longitudes = strategies.floats(min_value=-180, max_value=180, allow_nan=False, allow_infinity=False)
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    precision=strategies.sampled_from(HASH_PRECISIONS)
+)
+def test_prefix_key_round_trip(latitude, longitude, precision):
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision)
+    key = geogrids.gdgg.numeric_hash_to_prefix_key(numeric_hash, precision)
+
+    assert key < 2 ** precision
+    assert geogrids.gdgg.prefix_key_to_numeric_hash(key, precision) == numeric_hash
+    assert geogrids.gdgg.numeric_hash_to_prefix_key_array(
+        [numeric_hash], precision).tolist() == [key]
+    assert geogrids.gdgg.prefix_key_to_numeric_hash_array(
+        [key], precision).tolist() == [numeric_hash]
+
+
+@given(
+    latitude=latitudes,
+    longitude=longitudes,
+    precisions=strategies.lists(
+        strategies.sampled_from(HASH_PRECISIONS), min_size=2, max_size=2, unique=True)
+)
+def test_prefix_keys_sort_like_readable_hashes(latitude, longitude, precisions):
+    cell_precision, precision = sorted(precisions)
+    cell = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, cell_precision)
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(
+        latitude, longitude, precision)
+    key = geogrids.gdgg.numeric_hash_to_prefix_key(numeric_hash, precision)
+
+    [(lo, hi)] = geogrids.gdgg.cells_to_ranges([(cell, cell_precision)], precision)
+    assert lo <= key < hi
+    assert hi - lo == 4 ** ((precision - cell_precision) // 2)
+
+
+def test_cells_to_ranges_merges():
+    assert geogrids.gdgg.cells_to_ranges([], 25) == []
+    assert geogrids.gdgg.cells_to_ranges([(1, 3), (0, 3), (8, 5)], 7) == [(0, 32)]
+    assert geogrids.gdgg.cells_to_ranges([(3, 3), (5, 3)], 5) == [(12, 16), (20, 24)]
+
+    with pytest.raises(ValueError):
+        geogrids.gdgg.cells_to_ranges([(0, 7)], 5)
+
+
+def test_cover_ranges():
+    cells = geogrids.gdgg.cover((140, -40, 150, -30), 21)
+    ranges = geogrids.gdgg.cells_to_ranges(cells, 55)
+    starts = [lo for lo, _ in ranges]
+
+    assert ranges == sorted(ranges)
+    assert all(hi < lo for (_, hi), (lo, _) in zip(ranges, ranges[1:]))
+
+    numeric_hash = geogrids.gdgg.latitude_longitude_to_numeric_hash(-35, 145, 55)
+    key = geogrids.gdgg.numeric_hash_to_prefix_key(numeric_hash, 55)
+    lo, hi = ranges[bisect.bisect(starts, key) - 1]
+    assert lo <= key < hi